@@ -0,0 +1,159 @@
+"""Boot faster by remembering what's on the I2C bus; and say where the boot time went.
+
+Every boot used to scan the whole bus - twice, just to print it - and go looking for the 'B' ToF
+sensor at its new address by trying to start a VL53L0X there, and catching the exception when it
+wasn't (which it isn't, after a power cycle). A BootCache keeps the last boot's device map - name:
+address, for everything that came up - in the microcontroller's non-volatile memory, and uses it instead:
+
+    - probe() asks just those addresses if they're there (one tiny transfer each, not a scan),
+      so the ToF array knows where to find its sensors without trial and error;
+    - once everything's up, check() compares what came up with the map. If it's all there, that's
+      it: no scan at all. If anything's missing - or there's no map yet - then it's time for a scan,
+      to show what *is* on the bus, and the new map is saved.
+
+Why NVM, not a file: CircuitPython code can only write to the CIRCUITPY drive if boot.py has
+remounted it, and we don't have a boot.py; microcontroller.nvm can always be written. The map lives
+at NVM_OFFSET: NVM_MAGIC, a 2-byte length, then the map as JSON. (In the simulator, NVM lasts only
+as long as the process.)
+
+A BootTimer marks the end of each step of the boot, and report()s the milliseconds each took.
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+import json
+import time
+
+import microcontroller
+
+NVM_OFFSET = 0
+NVM_MAGIC = b"I2CM"
+NVM_SIZE = 256  # all we'll use - plenty for a few names and addresses
+
+
+def _loadMap():
+    '''The map saved in NVM; {} if there isn't one (or it's garbage).'''
+    nvm = microcontroller.nvm
+    header = NVM_OFFSET + len(NVM_MAGIC)
+    if nvm[NVM_OFFSET:header] != NVM_MAGIC:
+        return {}
+    length = nvm[header] << 8 | nvm[header + 1]
+    if length > NVM_SIZE - len(NVM_MAGIC) - 2:
+        return {}
+    try:
+        return json.loads(bytes(nvm[header + 2:header + 2 + length]).decode())
+    except ValueError:
+        return {}
+
+
+def _saveMap(deviceMap) -> bool:
+    '''Write the map to NVM. False if it won't fit.'''
+    data = json.dumps(deviceMap).encode()
+    if len(data) > NVM_SIZE - len(NVM_MAGIC) - 2:
+        print(f"*** Boot cache: device map too big for NVM ({len(data)} bytes)")
+        return False
+    microcontroller.nvm[NVM_OFFSET:NVM_OFFSET + len(NVM_MAGIC) + 2 + len(data)] = \
+        NVM_MAGIC + bytes((len(data) >> 8, len(data) & 0xFF)) + data
+    return True
+
+
+def probe(i2c, address) -> bool:
+    '''Does anything answer at 'address'? (An empty write - what a scan does, for one address.)'''
+    while not i2c.try_lock():
+        pass
+    try:
+        i2c.writeto(address, b"")
+        return True
+    except OSError:
+        return False
+    finally:
+        i2c.unlock()
+
+
+def scan(i2c):
+    '''Every address on the bus, printed and returned.'''
+    while not i2c.try_lock():
+        pass
+    try:
+        found = i2c.scan()
+    finally:
+        i2c.unlock()
+    print(f"I2C addresses found: {[hex(x) for x in found]}")
+    return found
+
+
+class BootCache:
+    '''The last boot's I2C device map, and the checks against it.'''
+    def __init__(self):
+        self._map = _loadMap()
+        self._probes = 0
+        self._scans = 0
+        self._fast = False
+
+    def probe(self, i2c):
+        '''The addresses in the map that answer right now. None if there's no map: we don't know.'''
+        if not self._map:
+            return None
+        present = set()
+        for address in set(self._map.values()):
+            self._probes += 1
+            if probe(i2c, address):
+                present.add(address)
+        return present
+
+    def check(self, i2c, found) -> bool:
+        '''
+            found: name: address, for every device that came up this boot.
+            True if that's everything the map said there'd be - the fast path; otherwise
+            scan the bus, and save what we found for next time.
+        '''
+        self._fast = bool(self._map) and all(found.get(name) == address for name, address in self._map.items())
+        if self._fast:
+            return True
+
+        if self._map:
+            missing = [name for name, address in self._map.items() if found.get(name) != address]
+            print(f"Boot cache: {missing} not where they were last time")
+        self._scans += 1
+        scan(i2c)
+        if found != self._map:
+            self._map = dict(found)
+            _saveMap(self._map)
+        return False
+
+    def getStats(self):
+        return {"fastPath": self._fast, "probes": self._probes, "scans": self._scans,
+                "devices": {name: hex(address) for name, address in self._map.items()}}
+
+
+class BootTimer:
+    '''How long each step of the boot took. mark() the end of each one.'''
+    def __init__(self):
+        self._startNS = time.monotonic_ns()
+        self._lastNS = self._startNS
+        self._steps = [] # (name, ms, detail)
+
+    def mark(self, name, detail=None) -> None:
+        '''The step 'name' is done. detail: {part: ms} within it, if we know.'''
+        now = time.monotonic_ns()
+        self._steps.append((name, (now - self._lastNS) / 1000000, detail))
+        self._lastNS = now
+
+    def totalMS(self):
+        return (self._lastNS - self._startNS) / 1000000
+
+    def report(self) -> None:
+        print("Boot time:")
+        for name, ms, detail in self._steps:
+            print(f"  {name:>14}: {ms:8.1f} ms")
+            if detail:
+                for part, partMS in detail.items():
+                    print(f"  {'':>14}  {part:>12}: {partMS:8.1f} ms")
+        print(f"  {'total':>14}: {self.totalMS():8.1f} ms")
+
+    def getStats(self):
+        stats = {"totalMS": round(self.totalMS(), 1),
+                 "stepsMS": {name: round(ms, 1) for name, ms, detail in self._steps}}
+        for name, ms, detail in self._steps:
+            for part, partMS in (detail or {}).items():
+                stats["stepsMS"][f"{name} {part}"] = round(partMS, 1)
+        return stats
@@ -0,0 +1,169 @@
+"""Where do boot time and heap go? Time every import, and the big constructors.
+
+Startup pulls in the display, sensor and font libraries, ulab, and our own modules, and then builds
+the display, the synth and the gesture menu - and we didn't know which of those were the slow ones,
+or the big ones. A BootProfiler, once install()ed, times each module the first time it's imported,
+and wrapConstructors() does the same for the classes in CONSTRUCTORS; each record has the wall time
+and the heap it took (the drop in gc.mem_free(), after a gc.collect()).
+
+Imports and constructors inside others are nested: a record's "self" numbers leave out what its
+children took, so they add up; the gc.collect()s we do to measure the heap are left out of everything.
+
+finish() stops, prints a table, and saves the records as JSON (or prints the JSON, if the file can't
+be written - on the Feather, the filesystem is read-only unless boot.py says otherwise).
+
+    import bootProfiler
+    profiler = bootProfiler.BootProfiler()
+    profiler.install()
+    import feathereminMain
+    profiler.wrapConstructors()
+    feathereminMain.main(profiler=profiler)   # calls profiler.finish() once we're up
+
+main.py does that with PROFILE_BOOT = True; on a desktop, "python feathereminSim.py --profile".
+On CircuitPython, replacing builtins.__import__ only works if the firmware lets builtins be
+overridden (MICROPY_CAN_OVERRIDE_BUILTINS); if not, there are no import records, but the
+constructors are still timed. In the simulator, the stand-ins for the Adafruit libraries are
+loaded by sim.install(), before anything's timed: they show up as "already loaded".
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+import builtins
+import gc
+import json
+import sys
+import time
+
+PROFILE_PATH = "bootProfile.json"
+
+# The classes whose constructors we time: (module, class).
+CONSTRUCTORS = (
+    ("feathereminHardware", "FeatereminHardware"),
+    ("feathereminDisplay3", "FeathereminDisplay"),
+    ("featherSynth6", "FeatherSynth"),
+    ("waveforms", "WaveBank"),      # made when its shape is first picked - at boot, only the starting one
+    ("gestureMenu", "GestureMenu"),
+    ("feathereminMain", "Featheremin"),
+    )
+
+# The libraries we want to hear about, even if they were loaded before we started.
+LIBRARIES = ("adafruit_display_text", "adafruit_ili9341", "adafruit_apds9960", "adafruit_vl53l0x",
+             "ulab", "adafruit_bitmap_font", "adafruit_imageload", "synthio", "displayio")
+
+
+class BootProfiler:
+    '''Wall time and heap for each first-time import and each CONSTRUCTORS constructor.'''
+    def __init__(self):
+        self._records = []  # [kind, name, depth, ms, bytes, childMS, childBytes]
+        self._stack = []    # the records still going, innermost last
+        self._overheadNS = 0
+        self._realImport = None
+        self._wrapped = []  # (class, its own __init__)
+        self._preloaded = [name for name in LIBRARIES if name in sys.modules]
+        self._startNS = time.monotonic_ns()
+        self._startFree = gc.mem_free()
+
+    def measure(self, kind, name, fn, *args, **kwargs):
+        '''fn(*args, **kwargs), recorded as 'name'; returns what it does.'''
+        t0 = time.monotonic_ns()
+        gc.collect()
+        free0 = gc.mem_free()
+        overhead0 = self._overheadNS + time.monotonic_ns() - t0
+        self._overheadNS = overhead0
+
+        record = [kind, name, len(self._stack), 0.0, 0, 0.0, 0]
+        self._records.append(record)
+        self._stack.append(record)
+        start = time.monotonic_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            end = time.monotonic_ns()
+            self._stack.pop()
+            gc.collect()
+            record[4] = free0 - gc.mem_free()
+            record[3] = (end - start - (self._overheadNS - overhead0)) / 1000000
+            self._overheadNS += time.monotonic_ns() - end
+            if self._stack:
+                parent = self._stack[-1]
+                parent[5] += record[3]
+                parent[6] += record[4]
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if name in sys.modules or level:
+            return self._realImport(name, globals, locals, fromlist, level)
+        return self.measure("import", name, self._realImport, name, globals, locals, fromlist, level)
+
+    def install(self) -> None:
+        '''Time imports from now on.'''
+        self._realImport = builtins.__import__
+        builtins.__import__ = self._import
+
+    def wrapConstructors(self, constructors=CONSTRUCTORS) -> None:
+        '''Time the constructors of the classes in 'constructors', from now on. (Their modules must be loaded.)'''
+        for moduleName, className in constructors:
+            module = sys.modules.get(moduleName)
+            cls = getattr(module, className, None)
+            if cls is None:
+                print(f"bootProfiler: no {moduleName}.{className} to time")
+                continue
+            self._wrapConstructor(cls, f"{moduleName}.{className}")
+
+    def _wrapConstructor(self, cls, name):
+        init = cls.__init__
+        profiler = self
+        def timedInit(obj, *args, **kwargs):
+            profiler.measure("new", name, init, obj, *args, **kwargs)
+        cls.__init__ = timedInit
+        self._wrapped.append((cls, init))
+
+    def uninstall(self) -> None:
+        '''Stop timing anything; put back what we replaced.'''
+        if self._realImport is not None:
+            builtins.__import__ = self._realImport
+            self._realImport = None
+        for cls, init in self._wrapped:
+            cls.__init__ = init
+        self._wrapped = []
+
+    def getStats(self):
+        '''Everything we recorded, in the order it started; ms and bytes include the children, "self" doesn't.'''
+        return {"totalMS": round((time.monotonic_ns() - self._startNS - self._overheadNS) / 1000000, 1),
+                "totalBytes": self._startFree - gc.mem_free(),
+                "alreadyLoaded": self._preloaded,
+                "records": [{"kind": kind, "name": name, "depth": depth,
+                             "ms": round(ms, 2), "selfMS": round(ms - childMS, 2),
+                             "bytes": nbytes, "selfBytes": nbytes - childBytes}
+                            for kind, name, depth, ms, nbytes, childMS, childBytes in self._records]}
+
+    def report(self, stats=None) -> None:
+        '''The table: one line per import or constructor, indented under whatever it's inside of.'''
+        if stats is None:
+            stats = self.getStats()
+        print(f"{'':48} {'ms':>8} {'self ms':>8} {'bytes':>8} {'self':>8}")
+        for r in stats["records"]:
+            label = "  " * r["depth"] + ("new " if r["kind"] == "new" else "") + r["name"]
+            print(f"{label:48.48} {r['ms']:8.1f} {r['selfMS']:8.1f} {r['bytes']:8d} {r['selfBytes']:8d}")
+        print(f"{'total':48} {stats['totalMS']:8.1f} {'':8} {stats['totalBytes']:8d}")
+        if stats["alreadyLoaded"]:
+            print(f"(already loaded: {', '.join(stats['alreadyLoaded'])})")
+
+        # and the top five by themselves, for the impatient
+        top = sorted(stats["records"], key=lambda r: r["selfMS"], reverse=True)[:5]
+        print(f"Slowest: {', '.join(r['name'] + ' ' + str(round(r['selfMS'])) + 'ms' for r in top)}")
+        top = sorted(stats["records"], key=lambda r: r["selfBytes"], reverse=True)[:5]
+        print(f"Biggest: {', '.join(r['name'] + ' ' + str(r['selfBytes']) for r in top)}")
+
+    def finish(self, path=PROFILE_PATH):
+        '''Stop, print the table, and save the JSON to 'path' (or print it, if we can't). Returns the stats.'''
+        self.uninstall()
+        stats = self.getStats()
+        print("\nBoot profile:")
+        self.report(stats)
+        try:
+            with open(path, "w") as f:
+                json.dump(stats, f)
+            print(f"Boot profile saved to {path}")
+        except OSError as e:
+            print(f"*** Can't save {path} ({e}); here it is:")
+            print(json.dumps(stats))
+        return stats
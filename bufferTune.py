@@ -0,0 +1,70 @@
+"""Find the smallest mixer buffer that doesn't glitch, under the real load.
+
+The mixer's buffers are audio that's been worked out but not played yet - so they're also how far
+behind the hand the sound is. FeatherSynth's BUFFER_SIZE (16K, and the mixer has two of those: at
+22050 Hz stereo, over a third of a second) was picked by ear, to stop the glitches. calibrate() tries
+sizes from small up, running the Featheremin for a while at each, and keeps the first that gets
+through with no underruns (the output running dry), twice. It's saved as a setting (see settings.py).
+
+This is for the simulator only. It needs the audio output to count underruns: the simulator's does
+(see sim/audiobusio.py), but CircuitPython's I2SOut doesn't, so on the Feather calibrate() says so and
+does nothing, and the synth always uses BUFFER_SIZE. What the simulator's underruns say is about the
+desktop's NumPy and threads, not the RP2040, so savedSize() ignores the setting on the Feather, even
+if settings.json gets copied over with the code.
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+import featherBackend
+import settings
+
+# Buffer sizes to try, in bytes, smallest first.
+CANDIDATE_SIZES = (1024, 2048, 4096, 8192, 12288, 16384)
+TRIAL_SECONDS = 5
+
+# The setting. Only the simulator's is ever calibrated.
+SETTING = "bufferSize.sim"
+
+
+def savedSize(default):
+    '''The calibrated buffer size, in the simulator. On the Feather - or if there isn't one - 'default'.'''
+    if featherBackend.NAME != "sim":
+        return default
+    return settings.get(SETTING, default)
+
+
+def calibrate(synth, runFor, sizes=CANDIDATE_SIZES, seconds=TRIAL_SECONDS, save=True):
+    '''
+        runFor(seconds) runs the Featheremin - the real loop - for that long.
+        Returns the size chosen (and saves it, if 'save'), or None if we can't tell.
+    '''
+    if synth.getUnderruns() is None:
+        print("*** Can't calibrate the buffer: this audio output doesn't count underruns (calibrating is for the simulator).")
+        return None
+
+    chosen = None
+    for size in sizes:
+        synth.setBufferSize(size)
+        clean = True
+        for trial in (1, 2):
+            before = synth.getUnderruns()
+            runFor(seconds)
+            underruns = synth.getUnderruns() - before
+            print(f"Buffer {size:6d} bytes ({synth.getOutputLatency()*1000:5.1f} ms), trial {trial}: {underruns} underruns")
+            if underruns:
+                clean = False
+                break
+        if clean:
+            chosen = size
+            break
+
+    if chosen is None:
+        chosen = sizes[-1]
+        print(f"Nothing was glitch-free; using the biggest, {chosen}")
+        synth.setBufferSize(chosen)
+    else:
+        print(f"Buffer size: {chosen} bytes, {synth.getOutputLatency()*1000:.1f} ms")
+
+    if save:
+        settings.set(SETTING, chosen)
+        settings.save()
+    return chosen
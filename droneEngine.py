@@ -0,0 +1,123 @@
+"""Drone mode for FeatherSynth: N voices, tuned to an interval preset, retuned in place.
+
+The old drone made two new Notes when it started, then set their frequencies to f1 and f2 on every
+update - and printed a complaint for every out-of-range pair, which is slow in the loop that makes
+the sound. A DroneEngine makes all its Notes once; a preset just says how to tune the ones it uses:
+
+    each voice plays   f * ratio + beat * beatWeight
+
+where f is the main drone frequency (from the pitch hand) and beat is a beat rate in Hz (from the
+other hand). "Beating" is the old drone: f, and f - beat.
+
+Frequencies outside what synthio will take are clamped to it, quietly; getStats() says how often.
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+import synthio
+
+MAX_VOICES = 4
+MIN_HZ = 1
+MAX_HZ = 32767  # synthio won't take a Note frequency over this
+
+# name: ((ratio, beatWeight), ...) - one pair per voice
+PRESETS = {
+    "Beating":  ((1, 0), (1, -1)),
+    "Fifth":    ((1, 0), (1.5, 0), (1, -0.5)),
+    "Octaves":  ((0.5, 0), (1, 0), (2, 0), (1, -0.5)),
+    "Pairs":    ((1, 0), (1, -1), (1.5, 0), (1.5, 1)),
+    }
+PRESET_NAMES = ["Beating", "Fifth", "Octaves", "Pairs"]
+
+
+class DroneEngine:
+    '''
+        Up to maxVoices drone Notes on 'synth', made once, here.
+
+        setPreset() picks the tuning (and how many voices); start() presses them,
+        update() retunes them, stop() releases them.
+    '''
+    def __init__(self, synth, waveform=None, bend=1.0, maxVoices=MAX_VOICES):
+        self._synth = synth
+        self._notes = []
+        for i in range(maxVoices):
+            self._notes.append(synthio.Note(frequency=440, waveform=waveform, amplitude=1, bend=bend))
+        self._active = ()
+        self._ratios = []
+        self._weights = []
+        self._presetName = None
+        self._running = False
+        self._frequency = 0
+
+        self._updates = 0
+        self._clamped = 0
+
+        self.setPreset(PRESET_NAMES[0])
+
+    def setPreset(self, name) -> None:
+        '''One of PRESET_NAMES. If we're droning, voices that come or go are pressed or released.'''
+        preset = PRESETS[name]
+        n = min(len(preset), len(self._notes))
+        old = self._active
+        self._presetName = name
+        self._ratios = [preset[i][0] for i in range(n)]
+        self._weights = [preset[i][1] for i in range(n)]
+        self._active = tuple(self._notes[:n])
+
+        # keep the mix at about the old two-voice drone's loudness
+        amplitude = min(1.0, 2 / n)
+        for note in self._active:
+            note.amplitude = amplitude
+
+        if self._running:
+            if n > len(old):
+                self._synth.press(self._active[len(old):])
+            elif n < len(old):
+                self._synth.release(old[n:])
+
+    def getPreset(self):
+        return self._presetName
+
+    def getVoiceCount(self):
+        return len(self._active)
+
+    def setWaveform(self, waveform) -> None:
+        for note in self._notes:
+            note.waveform = waveform
+
+    def start(self, f, beat=0) -> None:
+        '''Tune the voices, then sound them (instead of whatever was playing).'''
+        self.update(f, beat)
+        self._synth.release_all_then_press(self._active)
+        self._running = True
+
+    def update(self, f, beat=0) -> None:
+        '''Retune the voices for main frequency f and beat rate 'beat' (both Hz).'''
+        self._updates += 1
+        self._frequency = f
+        ratios, weights, notes = self._ratios, self._weights, self._active
+        for i in range(len(notes)):
+            fv = f * ratios[i] + beat * weights[i]
+            if fv < MIN_HZ:
+                fv = MIN_HZ
+                self._clamped += 1
+            elif fv > MAX_HZ:
+                fv = MAX_HZ
+                self._clamped += 1
+            notes[i].frequency = fv
+
+    def stop(self) -> None:
+        if self._running:
+            self._synth.release(self._active)
+            self._running = False
+
+    def isRunning(self):
+        return self._running
+
+    def getFrequency(self):
+        '''The main drone frequency we were last tuned to, in Hz (before any voice's ratio or beat).'''
+        return self._frequency
+
+    def getStats(self):
+        '''updates: update() calls; clamped: voice frequencies we had to pull into range.'''
+        return {"preset": self._presetName, "voices": len(self._active),
+                "updates": self._updates, "clamped": self._clamped}
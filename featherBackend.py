@@ -0,0 +1,16 @@
+"""Pick the backend the Featheremin runs on: the real Feather, or the host simulator.
+
+Import this before anything that needs 'board' and friends.
+On CircuitPython it does nothing. Anywhere else, it installs the simulator's stand-ins (see sim/),
+with the default scenario - unless something has already installed its own.
+"""
+import sys
+
+ON_DEVICE = sys.implementation.name == "circuitpython"
+
+if ON_DEVICE:
+    NAME = "device"
+else:
+    import sim
+    sim.install()
+    NAME = "sim"
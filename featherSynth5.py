@@ -13,7 +13,9 @@ import microcontroller
 import random
 import synthio
 import time
-import ulab.numpy as numpy
+
+import bufferTune
+import waveforms
 
 
 SYNTH_RATE    = 22050
@@ -44,7 +46,7 @@ class FeatherSynth:
         self._audio = audiobusio.I2SOut(i2s_bit_clock, i2s_word_select, i2s_data)
 
         # As per https://github.com/todbot/circuitpython-synthio-tricks use a mixer:
-        self._mixer = audiomixer.Mixer(channel_count=self._channels, sample_rate=SYNTH_RATE, buffer_size=BUFFER_SIZE)
+        self._mixer = audiomixer.Mixer(channel_count=self._channels, sample_rate=SYNTH_RATE, buffer_size=bufferTune.savedSize(BUFFER_SIZE))
         self._mixer.voice[0].level = 0.1  # 10% volume to start seems plenty
 
         # TODO: if envelope not given, "the default envelope, instantly turns notes on and off"
@@ -58,12 +60,8 @@ class FeatherSynth:
 
         # Build some waveforms
         #
-        self._WAVE_SINE = numpy.array(
-            numpy.sin(numpy.linspace(0, 2*numpy.pi, SAMPLE_SIZE, endpoint=False)) * SAMPLE_VOLUME, dtype=numpy.int16)
-
-        # this is a rising sawtooth, going from -SAMPLE_VOLUME down to +SAMPLE_VOLUME
-        # TODO: does a falling sawtooth sound different?
-        self._WAVE_SAW = numpy.linspace(SAMPLE_VOLUME, -SAMPLE_VOLUME, num=SAMPLE_SIZE, dtype=numpy.int16)
+        # (these come from the shared waveform tables; the saw is only built when first used)
+        self._WAVE_SINE = waveforms.sine(SAMPLE_SIZE, SAMPLE_VOLUME)
 
         # print(f"wave_sine: {self._WAVE_SINE}")
         # print(f"wave_saw: {self._WAVE_SAW}")
@@ -76,11 +74,11 @@ class FeatherSynth:
 
         # These two LFOs persist, but can be modified on the fly.
         #
-        # TODO: should/can we use a smaller wave for the LFO envelopes?
-        self._tremLFO = synthio.LFO(rate=10, waveform=self._WAVE_SINE)
+        # An LFO interpolates between its samples, so a small sine does.
+        self._tremLFO = synthio.LFO(rate=10, waveform=waveforms.lfoSine())
         self._tremCurrent = LFO_NONE
 
-        self._vibLFO = synthio.LFO(rate=5, waveform=self._WAVE_SINE)
+        self._vibLFO = synthio.LFO(rate=5, waveform=waveforms.lfoSine())
         self._vibCurrent = LFO_NONE
 
         self._drone1 = None
@@ -98,7 +96,7 @@ class FeatherSynth:
         self._waveform = self._WAVE_SINE
 
     def setWaveformSaw(self) -> None:
-        self._waveform = self._WAVE_SAW
+        self._waveform = waveforms.saw(SAMPLE_SIZE, SAMPLE_VOLUME)
 
     def setWaveformSquare(self) -> None:
         self._waveform = None
@@ -3,40 +3,89 @@
 #
 # version 6, in dev
 #
-# TODO: Use "detuning" to get a fatter sound?
-#
 # For the Featheremin project - https://github.com/RobCranfill/featheremin
 #
 import audiobusio
 import audiomixer
 import board
+import math
 import microcontroller
 import random
 import synthio
 import time
 import ulab.numpy as numpy
 
+import bufferTune
+import droneEngine
+import voiceFilter
+import waveforms
+import wavetable
+
 
 SYNTH_RATE    = 22050
 SAMPLE_RATE   = 28000
 SAMPLE_SIZE   =   512
 SAMPLE_VOLUME = 32000
-BUFFER_SIZE   =  1024 * 16 # up from 2K; necessary?
+BUFFER_SIZE   =  1024 * 16 # up from 2K; used until bufferTune.calibrate() finds what we really need
 
 LFO_NONE = 1.0  # A do-nothing 'BlockInput' for the LFOs
-FAT_DETUNE = 0.005  # how much to detune, 0.7% here
- 
+FAT_DETUNE = 0.005  # how much to detune neighbouring oscillators, 0.5% here
+MAX_OSCS = 7  # size of the persistent voice pool; setNumOscs() can't go higher than this
+
+# Where in its waveform each unison oscillator starts, as a fraction of a cycle - so they don't all
+# start in step (a click, and a loud, "phasey" start). Not evenly spaced: even spacing of identical
+# sines adds up to nothing.
+UNISON_PHASES = (0, 0.31, 0.72, 0.13, 0.55, 0.89, 0.42)
+
+
+def detuneRatios(numOscs, detune=FAT_DETUNE):
+    '''
+        Frequency ratios for numOscs unison oscillators, spread evenly (in pitch) above and below 1,
+        so the middle of the sound stays where the note is. (The old way only detuned upward,
+        so more oscillators meant sharper.)
+    '''
+    return tuple((1 + detune) ** (i - (numOscs - 1) / 2) for i in range(numOscs))
+
+
+# Saw and square come from banks of band-limited tables, one per octave, switched as the pitch moves,
+# so the high notes don't alias. False: the plain 512-sample saw, and synthio's default square.
+BAND_LIMITED = True
+
+# Glide (portamento): a "once" LFO ramping from 1 down to 0, used as the voices' bend.
+GLIDE_RAMP = numpy.array((32767, 0), dtype=numpy.int16)
+LN_2 = math.log(2)
+
+# Envelope presets: (attack_time, decay_time, release_time, attack_level, sustain_level).
+# "Default" is the one we've always had; "Instant" is synthio's own - straight on, straight off.
+ENVELOPES = {
+    "Default": (0.1,   0.05, 0.2, 1.0, 0.8),
+    "Instant": (0.0,   0.0,  0.0, 1.0, 1.0),
+    "Pluck":   (0.005, 0.4,  0.3, 1.0, 0.25),
+    "Pad":     (0.5,   0.3,  1.0, 1.0, 0.8),
+    "Swell":   (1.5,   0.0,  0.8, 1.0, 1.0),
+    }
+ENVELOPE_NAMES = ["Default", "Instant", "Pluck", "Pad", "Swell"]
+
+# The filter: how much its cutoff follows the pitch (1: exactly; 0: not at all), and from where.
+FILTER_KEY_TRACK = 0.5
+KEY_TRACK_REF = 440 # Hz; at this pitch, key tracking doesn't move the cutoff
+
+# A wavetable for setWaveformWavetable(); from http://waveeditonline.com/index-17.html (see test/fallingForeverObj.py)
+WAVETABLE_PATH   = "wav/BRAIDS02.WAV"
+WAVETABLE_FRAMES = 64  # morph steps, precomputed; 512 bytes each
+
 
 class FeatherSynth:
     '''
         Our new synthio-based synth.
 
-        TODO: FIXME: To change the pitch of a note, we create a new Note. That's probably unnecessary.
+        The Notes that make up the played pitch (one per detuned oscillator) are created once, here,
+        and then only their frequency/waveform/amplitude/bend are changed as we go.
+        They are pressed when a note starts, and released by stop().
 
-        TODO: change note envelope?
         TODO: Triangle wave? saw up vs saw down? (it is a rising sawtooth now.)
     '''
-    def __init__(self, stereo, i2s_bit_clock, i2s_word_select, i2s_data) -> None:
+    def __init__(self, stereo, i2s_bit_clock, i2s_word_select, i2s_data, bufferSize=None) -> None:
 
         if stereo:
             self._channels = 2
@@ -46,14 +95,23 @@ class FeatherSynth:
         self._audio = audiobusio.I2SOut(i2s_bit_clock, i2s_word_select, i2s_data)
 
         # As per https://github.com/todbot/circuitpython-synthio-tricks use a mixer:
-        self._mixer = audiomixer.Mixer(channel_count=self._channels, sample_rate=SYNTH_RATE, buffer_size=BUFFER_SIZE)
+        # its buffer size is the calibrated one, if there is one (see bufferTune.py).
+        if bufferSize is None:
+            bufferSize = bufferTune.savedSize(BUFFER_SIZE)
+        self._bufferSize = bufferSize
+        self._mixer = audiomixer.Mixer(channel_count=self._channels, sample_rate=SYNTH_RATE, buffer_size=bufferSize)
 
         self._mixer.voice[0].level = 1.0  
 
 
-        # TODO: if envelope not given, "the default envelope, instantly turns notes on and off"
-        # which may be what we want!
-        env = synthio.Envelope(attack_time=0.1, decay_time=0.05, release_time=0.2, attack_level=1.0, sustain_level=0.8)
+        # The envelope presets, all made now; setEnvelope() hands one to the voices.
+        # (The synth's own is the default one, for the drone.)
+        self._envelopes = {}
+        for name, (attack, decay, release, attackLevel, sustainLevel) in ENVELOPES.items():
+            self._envelopes[name] = synthio.Envelope(attack_time=attack, decay_time=decay, release_time=release,
+                                                     attack_level=attackLevel, sustain_level=sustainLevel)
+        self._envelopeName = ENVELOPE_NAMES[0]
+        env = self._envelopes[self._envelopeName]
         self._synth = synthio.Synthesizer(channel_count=self._channels, sample_rate=SYNTH_RATE, envelope=env)
 
         self._audio.play(self._mixer)
@@ -64,17 +122,27 @@ class FeatherSynth:
 
         # Build some waveforms
         #
-        self._WAVE_SINE = numpy.array(
-            numpy.sin(numpy.linspace(0, 2*numpy.pi, SAMPLE_SIZE, endpoint=False)) * SAMPLE_VOLUME, dtype=numpy.int16)
-
-        # this is a rising sawtooth, going from -SAMPLE_VOLUME down to +SAMPLE_VOLUME
-        # TODO: does a falling sawtooth sound different?
-        self._WAVE_SAW = numpy.linspace(SAMPLE_VOLUME, -SAMPLE_VOLUME, num=SAMPLE_SIZE, dtype=numpy.int16)
+        # (these come from the shared waveform tables; the saw is only built when first used)
+        self._WAVE_SINE = waveforms.sine(SAMPLE_SIZE, SAMPLE_VOLUME)
 
         # print(f"wave_sine: {self._WAVE_SINE}")
         # print(f"wave_saw: {self._WAVE_SAW}")
 
 
+        # The band-limited banks, {shape: WaveBank} - each made the first time its shape is picked
+        # (see _waveBank()), so a shape that's never played costs nothing.
+        # While one of them is in use, self._bank is it, and playFrequency() picks the table to play.
+        self._bank = None
+        self._waveBanks = {}
+
+        # The wavetable, if we have one - loaded, and all its morphs worked out, once, now.
+        self._wavetable = None
+        try:
+            self._wavetable = wavetable.Wavetable(WAVETABLE_PATH, frames=WAVETABLE_FRAMES)
+            print(f"Wavetable {WAVETABLE_PATH}: {self._wavetable.numWaves} waves, {self._wavetable.getMemoryUse()} bytes")
+        except (ImportError, OSError, ValueError) as e:
+            print(f"No wavetable ({WAVETABLE_PATH}: {e})")
+
         # TODO: Set the default waveform - sine?
         #
         # self._waveform = None # 'None' gets you a square wave.
@@ -82,15 +150,56 @@ class FeatherSynth:
 
         # These two LFOs persist, but can be modified on the fly.
         #
-        # TODO: should/can we use a smaller wave for the LFO envelopes?
-        self._trem_LFO = synthio.LFO(rate=10, waveform=self._WAVE_SINE)
+        # An LFO interpolates between its samples, so a small sine does.
+        self._trem_LFO = synthio.LFO(rate=10, waveform=waveforms.lfoSine())
         self._trem_current = LFO_NONE
 
-        self._vib_LFO = synthio.LFO(rate=5, waveform=self._WAVE_SINE)
+        # Each voice's level, so a unison of many isn't many times as loud - see setNumOscs().
+        self._unisonLevel = 1.0
+
+        self._vib_LFO = synthio.LFO(rate=5, waveform=waveforms.lfoSine())
         self._vib_current = LFO_NONE
 
-        self._drone1 = None
-        self._drone2 = None
+        # Glide: the voices' bend is this ramp, on top of the vibrato (its offset).
+        # A new pitch sets the ramp to start from where we were - in octaves from the new pitch -
+        # and synthio slides the bend to 0 over the glide time, with no more help from us.
+        # With scale 0 (glide off, or done) it's just the vibrato.
+        self._glideTime = 0
+        self._glideScale = 0.0
+        self._glide = synthio.LFO(waveform=GLIDE_RAMP, once=True, rate=1, scale=0, offset=self._vib_current)
+
+        # Drone mode's voices, separate from the played ones; made now, retuned in place.
+        self._drone = droneEngine.DroneEngine(self._synth, self._waveform, bend=LFO_NONE)
+
+        # The persistent voice pool.
+        # play() only changes these Notes in place - it doesn't make new ones.
+        self._voices = []
+        for i in range(MAX_OSCS):
+            self._voices.append(synthio.Note(frequency=440, waveform=self._waveform, envelope=env,
+                                             amplitude=self._trem_current, bend=self._glide))
+
+        # The filter section: off to start with. Its Biquads, for each type and resonance used,
+        # are made the first time that's picked (voiceFilter.CutoffTable); after that, moving the
+        # cutoff just hands the voices a different one - and only when it's a different step.
+        self._filterTables = {}
+        self._filterTable = None
+        self._filterResonance = float(voiceFilter.RESONANCES[1])
+        self._filterSweep = 0.5     # where the cutoff is, 0 to 1 of the table
+        self._filterKeyTrack = FILTER_KEY_TRACK
+        self._filterKeyOffset = 0   # steps
+        self._filterStep = -1
+
+        # The detune ratios for every number of oscillators, worked out now;
+        # self._detune is the set for the current number.
+        self._detuneTables = [()] + [detuneRatios(n) for n in range(1, MAX_OSCS+1)]
+        self._detune = ()
+
+        # Each oscillator but the first plays its own copy of the waveform, rotated to its UNISON_PHASES
+        # start. The copies are made once; a new waveform is copied into them, in place.
+        self._rotated = [None] + [numpy.zeros(SAMPLE_SIZE, dtype=numpy.int16) for i in range(1, MAX_OSCS)]
+        self._playing = False
+        self._frequency = 440
+        self._numOscs = 0
 
         self.setNumOscs(1)
 
@@ -103,79 +212,306 @@ class FeatherSynth:
 
     # setters for waveform
     def setWaveformSine(self) -> None:
-        self._waveform = self._WAVE_SINE
+        self._setWaveform(self._WAVE_SINE)
 
     def setWaveformSaw(self) -> None:
-        self._waveform = self._WAVE_SAW
+        if BAND_LIMITED:
+            bank = self._waveBank("saw")
+            self._setWaveform(bank.table(self._frequency), bank)
+        else:
+            self._setWaveform(waveforms.saw(SAMPLE_SIZE, SAMPLE_VOLUME))
 
     def setWaveformSquare(self) -> None:
-        self._waveform = None
+        if BAND_LIMITED:
+            bank = self._waveBank("square")
+            self._setWaveform(bank.table(self._frequency), bank)
+        else:
+            self._setWaveform(None)
+
+    def _waveBank(self, shape):
+        '''
+            The band-limited bank for 'shape', made now if this is the first time it's been asked for.
+            That's a few KB, and the sums take a while on the Feather, so we say how long.
+            (In a boot profile, the bank's constructor is timed too - see bootProfiler.CONSTRUCTORS.)
+        '''
+        bank = self._waveBanks.get(shape)
+        if bank is None:
+            t0 = time.monotonic_ns()
+            bank = waveforms.WaveBank(shape, SYNTH_RATE, SAMPLE_SIZE, SAMPLE_VOLUME)
+            self._waveBanks[shape] = bank
+            print(f"Band-limited {shape} bank: {(time.monotonic_ns() - t0) / 1000000:.0f} ms, {bank.getMemoryUse()} bytes")
+        return bank
+
+    def setWaveformWavetable(self) -> None:
+        '''The wavetable's buffer - so moving its position changes the sound. Saw, if there's no wavetable.'''
+        if self._wavetable is None:
+            print("*** No wavetable loaded; using saw")
+            self.setWaveformSaw()
+            return
+        self._setWaveform(self._wavetable.waveform)
+
+    def setWavetablePosition(self, pos) -> None:
+        '''Scan the wavetable, 0 to 1. Just copies a precomputed frame into the playing buffer.'''
+        if self._wavetable is not None:
+            self._wavetable.setPosition(pos)
+
+    def hasWavetable(self) -> bool:
+        return self._wavetable is not None
+
+    def _setWaveform(self, waveform, bank=None) -> None:
+        self._waveform = waveform
+        self._bank = bank
+        self._setVoiceWaveforms(1, MAX_OSCS)
+        self._voices[0].waveform = waveform
+        self._drone.setWaveform(waveform)
+
+    def _setVoiceWaveforms(self, first, last) -> None:
+        '''
+            Voices first..last-1 (not 0) get the waveform rotated to their start phases - or just
+            the waveform itself, if it's one we can't rotate: synthio's square (None), or the
+            wavetable's, which changes under us.
+        '''
+        waveform = self._waveform
+        rotate = waveform is not None and len(waveform) == SAMPLE_SIZE and (
+            self._wavetable is None or waveform is not self._wavetable.waveform)
+        for i in range(max(1, first), min(last, self._numOscs)):
+            if rotate:
+                buf = self._rotated[i]
+                r = int(UNISON_PHASES[i] * SAMPLE_SIZE)
+                buf[:SAMPLE_SIZE-r] = waveform[r:]
+                buf[SAMPLE_SIZE-r:] = waveform[:r]
+                self._voices[i].waveform = buf
+            else:
+                self._voices[i].waveform = waveform
 
     # setters for tremolo and vibrato
     def setTremolo(self, tremFreq) -> None:
         self._trem_LFO.rate = tremFreq
-        self._trem_current = self._trem_LFO
+        self._setTremCurrent(self._trem_LFO)
 
     def clearTremolo(self) -> None:
-        self._trem_current = LFO_NONE
+        self._setTremCurrent(LFO_NONE)
 
     def setVibrato(self, vibFreq) -> None:
         self._vib_LFO.rate = vibFreq
-        self._vib_current = self._vib_LFO
+        self._setVibCurrent(self._vib_LFO)
 
     def clearVibrato(self) -> None:
-        self._vib_current = LFO_NONE
+        self._setVibCurrent(LFO_NONE)
+
+    # Only touch the voices if the LFO actually changed; 
+    # setTremolo/setVibrato get called every loop with just a new rate.
+    def _setTremCurrent(self, trem) -> None:
+        if trem is self._trem_current:
+            return
+        self._trem_current = trem
+        self._setVoiceAmplitudes()
+
+    def _setVoiceAmplitudes(self) -> None:
+        '''The voices' amplitude: the tremolo LFO (scaled to the unison level), or just the unison level.'''
+        if self._trem_current is LFO_NONE:
+            amplitude = self._unisonLevel
+        else:
+            self._trem_current.scale = self._unisonLevel
+            amplitude = self._trem_current
+        for v in self._voices:
+            v.amplitude = amplitude
+
+    def _setVibCurrent(self, vib) -> None:
+        if vib is self._vib_current:
+            return
+        self._vib_current = vib
+        self._glide.offset = vib
 
 
     '''
         Play a note.
         Uses the current values set for vibrato and tremolo.
+
+        The first call after stop() presses the voices; after that we just re-tune them,
+        so no new objects, and no envelope re-trigger.
     '''
     def play(self, midi_note_value):
 
         # print(f"note {midi_note_value}")
 
-        notes = []
+        self.playFrequency(synthio.midi_to_hz(midi_note_value))
+
+    '''
+        Like play(), but in Hz rather than a MIDI note number.
+    '''
+    def playFrequency(self, f):
+        if self._glideTime > 0 and self._playing and f != self._frequency:
+            # Where we are now, in octaves from the new pitch: what's left of the last glide,
+            # plus the jump. Ramp from there.
+            left = self._glideScale * (1 - self._glide.phase)
+            self._glideScale = left + math.log(self._frequency / f) / LN_2
+            self._glide.scale = self._glideScale
+            self._glide.retrigger()
+        self._frequency = f
+
+        # New octave? Then a different band-limited table (the bank has them all made already).
+        if self._bank is not None:
+            w = self._bank.table(f)
+            if w is not self._waveform:
+                self._setWaveform(w, self._bank)
+
+        detune, voices = self._detune, self._voices
         for i in range(self._numOscs):
-            f = synthio.midi_to_hz(midi_note_value) * (1 + i*FAT_DETUNE)
-            notes.append(synthio.Note(frequency=f,
-                         waveform=self._waveform, amplitude=self._trem_current, bend=self._vib_current))
-        self._synth.release_all_then_press(notes)
+            voices[i].frequency = f * detune[i]
+
+        if self._filterTable is not None and self._filterKeyTrack:
+            self._filterKeyOffset = round(self._filterKeyTrack * math.log(f / KEY_TRACK_REF) / LN_2
+                                          * voiceFilter.STEPS_PER_OCTAVE)
+            self._updateFilter()
 
-        # note = synthio.Note(synthio.midi_to_hz(midi_note_value), 
-                            # waveform=self._waveform, amplitude=self._trem_current, bend=self._vib_current)
-        # self._synth.release_all_then_press((note))
+        if not self._playing:
+            # a new note starts right where it is
+            self._glideScale = 0.0
+            self._glide.scale = 0
+            self._synth.press(self._activeVoices)
+            self._playing = True
 
 
-    # we'd rather create the notes once, then change their frequency. or does it matter?
-    # probably does!
+    # The drone's Notes are made once (see droneEngine), and just retuned.
     #
-    # takes frequencies (in Hz) not MIDI notes.
+    # takes frequencies (in Hz) not MIDI notes: f, the main drone pitch, and 'beat',
+    # the beat rate for the preset's beating voices.
     #
-    def startDrone(self, f1, f2):
-        self._drone1 = synthio.Note(f1, waveform=self._waveform, amplitude=1, bend=1)
-        self._drone2 = synthio.Note(f2, waveform=self._waveform, amplitude=1, bend=1)
-        self._synth.release_all_then_press((self._drone1, self._drone2))
-
-    def drone(self, f1, f2):
-        if self._drone1 == None or self._drone2 == None:
-            print("must start drone!")
-            return
-        # print(f"drone {f1}, {f2}")
-        if f1 < 0 or f1 > 32767 or f2 < 0 or f2 > 32767:
-            print(f"*** drone freq OOB: {f1}, {f2}")
-            return
+    def startDrone(self, f, beat=0):
+        self._drone.start(f, beat)
+        self._playing = False
 
-        self._drone1.frequency = f1
-        self._drone2.frequency = f2
+    def drone(self, f, beat=0):
+        '''Retune the drone; does nothing if it isn't running. Out-of-range pitches are clamped.'''
+        if self._drone.isRunning():
+            self._drone.update(f, beat)
 
     def stopDrone(self):
+        self._drone.stop()
         self._synth.release_all()
-        self._drone1 = None
-        self._drone2 = None
+        self._playing = False
+
+    def setDronePreset(self, name):
+        '''One of droneEngine.PRESET_NAMES.'''
+        self._drone.setPreset(name)
+
+    def getDroneFrequency(self):
+        '''The drone's main frequency, in Hz; None if it isn't running.'''
+        if not self._drone.isRunning():
+            return None
+        return self._drone.getFrequency()
+
+    def getDroneStats(self):
+        return self._drone.getStats()
 
     def stop(self):
+        '''Silence everything - the drone too; it takes a startDrone() to bring it back.'''
+        self._drone.stop()
         self._synth.release_all()
+        self._playing = False
+
+    def setGlide(self, seconds) -> None:
+        '''How long to slide from one pitch to the next; 0 for no glide.'''
+        self._glideTime = seconds
+        if seconds > 0:
+            self._glide.rate = 1 / seconds
+        else:
+            self._glideScale = 0.0
+            self._glide.scale = 0
+
+    def setEnvelope(self, name) -> None:
+        '''One of ENVELOPE_NAMES. The voices get it in place; a note that's sounding carries on with it.'''
+        env = self._envelopes[name]
+        self._envelopeName = name
+        for v in self._voices:
+            v.envelope = env
+
+    def getEnvelope(self):
+        return self._envelopeName
+
+    # The filter section.
+    def setFilter(self, kind, resonance=None) -> None:
+        '''kind is one of voiceFilter.FILTER_TYPES ("Off" for none); resonance is Q (None: leave it).'''
+        if resonance is not None:
+            self._filterResonance = resonance
+        if kind == "Off":
+            self._filterTable = None
+            for v in self._voices:
+                v.filter = None
+            return
+        key = (kind, self._filterResonance)
+        table = self._filterTables.get(key)
+        if table is None:
+            table = voiceFilter.CutoffTable(self._synth, kind, self._filterResonance, SYNTH_RATE)
+            self._filterTables[key] = table
+        self._filterTable = table
+        self._filterStep = -1
+        self._updateFilter()
+
+    def setFilterResonance(self, resonance) -> None:
+        '''Q. Takes effect now, if a filter's on.'''
+        if self._filterTable is None:
+            self._filterResonance = resonance
+        else:
+            self.setFilter(self._filterTable.kind, resonance)
+
+    def getFilter(self):
+        return "Off" if self._filterTable is None else self._filterTable.kind
+
+    def setFilterSweep(self, pos) -> None:
+        '''Where the cutoff is, from 0 (the lowest step) to 1 (the highest) - before key tracking.'''
+        self._filterSweep = pos
+        if self._filterTable is not None:
+            self._updateFilter()
+
+    def setFilterKeyTracking(self, amount) -> None:
+        '''How far the cutoff follows the pitch: 1 an octave per octave, 0 not at all.'''
+        self._filterKeyTrack = amount
+        self._filterKeyOffset = 0
+        if self._filterTable is not None:
+            self._updateFilter()
+
+    def getFilterCutoff(self):
+        '''The cutoff the voices have now, in Hz (0 if the filter's off).'''
+        if self._filterTable is None:
+            return 0
+        return self._filterTable.cutoffAt(self._filterStep)
+
+    def _updateFilter(self) -> None:
+        table = self._filterTable
+        i = table.clamp(int(self._filterSweep * (len(table) - 1) + 0.5) + self._filterKeyOffset)
+        if i == self._filterStep:
+            return
+        self._filterStep = i
+        biquad = table.filterAt(i)
+        for v in self._voices:
+            v.filter = biquad
+
+    def getOutputLatency(self):
+        '''
+            Seconds of audio the mixer buffers - how long before a change is heard.
+            The mixer has two buffers of _bufferSize bytes (one playing, one being filled), 16-bit samples.
+        '''
+        return 2 * self._bufferSize / (self._channels * 2) / SYNTH_RATE
+
+    def setBufferSize(self, bufferSize) -> None:
+        '''A new mixer, with a buffer of bufferSize bytes. (For calibrating: there's a gap in the sound.)'''
+        level = self._mixer.voice[0].level
+        self._audio.stop()
+        self._mixer.voice[0].stop()
+        self._bufferSize = bufferSize
+        self._mixer = audiomixer.Mixer(channel_count=self._channels, sample_rate=SYNTH_RATE, buffer_size=bufferSize)
+        self._mixer.voice[0].level = level
+        self._audio.play(self._mixer)
+        self._mixer.voice[0].play(self._synth)
+
+    def getBufferSize(self):
+        return self._bufferSize
+
+    def getUnderruns(self):
+        '''How many times the audio output has run dry - or None, if it can't tell us (CircuitPython can't).'''
+        return getattr(self._audio, "underruns", None)
 
     '''
         Can/should we do this automatically?
@@ -185,7 +521,35 @@ class FeatherSynth:
         self._audio.deinit()
 
     def setNumOscs(self, numOscs):
+        if numOscs < 1 or numOscs > MAX_OSCS:
+            print(f"*** setNumOscs: {numOscs} is not 1 to {MAX_OSCS}")
+            return
+
+        # The spread changes with the count, so all the voices get retuned.
+        oldNumOscs = self._numOscs
         self._numOscs = numOscs
+        self._detune = self._detuneTables[numOscs]
+        for i in range(numOscs):
+            self._voices[i].frequency = self._frequency * self._detune[i]
+        if numOscs > oldNumOscs:
+            self._setVoiceWaveforms(oldNumOscs, numOscs)
+        self._activeVoices = tuple(self._voices[:numOscs])
+
+        # Keep the unison at about the loudness of two voices - the way DroneEngine does - so it doesn't clip.
+        level = min(1.0, 2 / numOscs)
+        if level != self._unisonLevel:
+            self._unisonLevel = level
+            self._setVoiceAmplitudes()
+
+        # If we're sounding, press or release just the voices that came or went.
+        if self._playing:
+            if numOscs > oldNumOscs:
+                self._synth.press(self._voices[oldNumOscs:numOscs])
+            elif numOscs < oldNumOscs:
+                self._synth.release(self._voices[numOscs:oldNumOscs])
+
+    def getNumOscs(self):
+        return self._numOscs
 
 
 # ---------------- class test methods
@@ -201,12 +565,12 @@ class FeatherSynth:
             print(f" {i}%....")
             f1 = 300
             self.setVolume(v)
-            self.startDrone(f1, f1)
+            self.startDrone(f1)
             for delta in range(-100, 100):
-                self.drone(f1, f1+delta)
+                self.drone(f1, -delta)
                 time.sleep(0.02)
             for delta in range(100, -100, -1):
-                self.drone(f1, f1+delta)
+                self.drone(f1, -delta)
                 time.sleep(0.02)
             self.stopDrone()
 
@@ -339,7 +703,7 @@ class FeatherSynth:
         start_note = 65
         delay = 1
 
-        for numOscs in (1, 2, 3, 4):
+        for numOscs in (1, 3, 5, 7):
             print(f"  fatness {numOscs}....")
             self.setNumOscs(numOscs)
             for n in song_notes:
@@ -10,6 +10,12 @@
 
     Version 3: for new gesture menu scheme. Variable number of display areas.
         TODO: a more general way to indicated selected item.
+
+    Writes are coalesced: we keep a copy of what every text area says, and setting one to
+    what it already says does nothing. Changed areas are only marked dirty; update() pushes
+    them to the screen (auto_refresh is off) no more than 'fps' times a second, so the main
+    loop doesn't spend its time on SPI refreshes nobody can see. getWriteStats() says how many
+    writes went through and how many were skipped.
 """
 import board
 import terminalio
@@ -19,6 +25,12 @@ import adafruit_ili9341
 
 import time
 import sys
+
+try:
+    from typing import NoReturn
+except ImportError:
+    pass
+
 from digitalio import DigitalInOut, Direction
 from adafruit_vl53l0x import VL53L0X
 
@@ -28,10 +40,29 @@ class FeathereminDisplay:
     New version supporting an arbitrary number of text areas (only tested up to 4, so far.)
     '''
 
-    def __init__(self, p_rotation, boardPinCS, boardPinDC, boardPinReset, nTextAreas=3) -> None:
+    def __init__(self, p_rotation, boardPinCS, boardPinDC, boardPinReset, nTextAreas=3, fps=15) -> None:
 
         self._textAreas = []
         self._nTextAreas = nTextAreas
+        self._display = None
+
+        # Shadow copy of each text area - the menu ones, then L and R - and which ones
+        # have changed since the last refresh.
+        self._indexL = nTextAreas
+        self._indexR = nTextAreas + 1
+        self._labels = [None] * (nTextAreas + 2)
+        self._shadow = [""] * (nTextAreas + 2)
+        self._dirty = [False] * (nTextAreas + 2)
+        self._anyDirty = False
+
+        self._frameNS = 1000000000 // fps
+        self._lastFlushNS = 0
+
+        # counters, for getWriteStats()
+        self._requested = 0
+        self._suppressed = 0
+        self._issued = 0
+        self._frames = 0
 
         # Release any resources currently in use for the displays
         displayio.release_displays()
@@ -40,6 +71,7 @@ class FeathereminDisplay:
         try:
             display_bus = displayio.FourWire(spi, command=boardPinDC, chip_select=boardPinCS, reset=boardPinReset)
             display = adafruit_ili9341.ILI9341(display_bus, width=320, height=240, rotation=p_rotation)
+            display.auto_refresh = False # we refresh, in update()
         except:
             print("No ILI9341 display found?")
             # FIXME: what to do if construction fails?
@@ -91,6 +123,8 @@ class FeathereminDisplay:
             ta = label.Label(terminalio.FONT, text=f"_textAreas[{i}]", color=acolor, x=lx, y=ly)
             text_group.append(ta)  # Subgroup for text scaling
             self._textAreas.append(ta)
+            self._labels[i] = ta
+            self._shadow[i] = ta.text
             ly += yInc
 
         self.text_area_l_ = label.Label(terminalio.FONT, text="Control L", color=0x000000, x=10, y=60)
@@ -99,8 +133,17 @@ class FeathereminDisplay:
         self.text_area_r_ = label.Label(terminalio.FONT, text="Control R", color=0x000000, x=90, y=60)
         text_group.append(self.text_area_r_)
 
+        self._labels[self._indexL] = self.text_area_l_
+        self._shadow[self._indexL] = self.text_area_l_.text
+        self._labels[self._indexR] = self.text_area_r_
+        self._shadow[self._indexR] = self.text_area_r_.text
+
         splash.append(text_group)
 
+        # nothing's been drawn yet
+        self._display = display
+        self._anyDirty = True
+
     # end __init__
 
     # "setters" for the text areas
@@ -113,22 +156,69 @@ class FeathereminDisplay:
         if n >= self._nTextAreas:
             print("Bad call to setTextAreaN!")
             return
-        self._textAreas[n].text = pText
+        self._setText(n, pText)
 
     def setTextArea1(self, pText):
-        self._textAreas[0].text = pText
+        self._setText(0, pText)
 
     def setTextArea2(self, pText):
-        self._textAreas[1].text = pText
+        self._setText(1, pText)
 
     def setTextArea3(self, pText):
-        self._textAreas[2].text = pText
+        self._setText(2, pText)
 
     def setTextAreaL(self, pText):
-        self.text_area_l_.text = pText
+        self._setText(self._indexL, pText)
 
     def setTextAreaR(self, pText):
-        self.text_area_r_.text = pText
+        self._setText(self._indexR, pText)
+
+    def _setText(self, index, pText):
+        '''Remember the new text, if it is new; update() will show it.'''
+        self._requested += 1
+        if pText == self._shadow[index]:
+            self._suppressed += 1
+            return
+        self._shadow[index] = pText
+        self._dirty[index] = True
+        self._anyDirty = True
+
+    def update(self) -> bool:
+        '''
+            Call this every time round the main loop. If anything has changed, and it's been
+            at least a frame since the last refresh, show the changes. Returns True if it did.
+        '''
+        if not self._anyDirty:
+            return False
+        now = time.monotonic_ns()
+        if now - self._lastFlushNS < self._frameNS:
+            return False
+        self._lastFlushNS = now
+        self.flush()
+        return True
+
+    def flush(self) -> None:
+        '''Show all the changes now, frame rate or no.'''
+        if self._display is None:
+            return
+        for i in range(len(self._labels)):
+            if self._dirty[i]:
+                self._labels[i].text = self._shadow[i] # a label only redraws when its text changes
+                self._dirty[i] = False
+                self._issued += 1
+        self._anyDirty = False
+        self._display.refresh()
+        self._frames += 1
+
+    def getWriteStats(self):
+        '''
+            How many text writes we were asked for; how many of those were the same as what was
+            already there ("suppressed"); how many label updates actually went to the display
+            ("issued" - fewer than the rest, when an area changes more than once in a frame);
+            and how many refreshes that took.
+        '''
+        return {"requested": self._requested, "suppressed": self._suppressed,
+                "issued": self._issued, "frames": self._frames}
 
     '''
     This does not return!
@@ -137,6 +227,7 @@ class FeathereminDisplay:
         self.setTextArea1(" You are")
         self.setTextArea2(" hideous")
         self.setTextArea3("orangutan!")
+        self.flush()
         print("Display test waiting, so display doesn't get erased.")
         while True:
             pass
\ No newline at end of file
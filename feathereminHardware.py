@@ -4,12 +4,25 @@ The constructor of this object does the work,
 then returns nothing (as constructors are constrained to do).
 To get a tuple of the various devices, call the getHardwareItems() instance method.
 """
+import featherBackend
+
 import board
+import busio
 import gc
 
 import digitalio as feather_digitalio
 
-import featherSynth5 as fSynth
+try:
+    from typing import Tuple
+except ImportError:
+    pass
+
+import bootCache
+import featherSynth6 as fSynth
+import i2cScheduler
+import tofArray
+import tofBudget
+import tofReader
 
 
 #############################################################3
@@ -23,9 +36,19 @@ import featherSynth5 as fSynth
 import adafruit_vl53l0x
 from adafruit_apds9960.apds9960 import APDS9960
 
-# The L0X defaults to I2C 0x29; we have two, one of which we will re-assign to this address.
+# STEMMA_I2C() runs at 100 kHz; all our devices can do 400 kHz ("fast mode"), so we make our own.
+# (The Feather's STEMMA QT connector is on SCL/SDA.)
+I2C_FREQUENCY = 400000
+
+# The L0X defaults to I2C 0x29; we have two, one of which (the one without an XSHUT) goes here.
 L0X_B_ALTERNATE_I2C_ADDR = 0x30
 
+# Where the APDS9960 lives (it can't be moved).
+APDS_I2C_ADDR = 0x39
+
+# The APDS9960 pulls its INT pin low when something is closer than this (0-255, bigger is closer).
+APDS_PROXIMITY_THRESHOLD = 20
+
 
 # LCD display
 USE_SIMPLE_DISPLAY = True
@@ -35,12 +58,6 @@ else:
     import feathereminDisplay2 as fDisplay
 
 
-def showI2Cbus(i2c):
-    # i2c = board.I2C()
-    if i2c.try_lock():
-        print(f"I2C addresses found: {[hex(x) for x in i2c.scan()]}")
-        i2c.unlock()
-
 def showMem():
     gc.collect()
     print(f"Free memory: {gc.mem_free()}")
@@ -60,21 +77,28 @@ class FeatereminHardware:
     def __init__(self,
                 display_cs_pin, display_dc_pin, display_reset_pin,
                 audio_out_i2s_bit_pin, audio_out_i2s_word_pin, audio_out_i2s_data_pin,
-                l0x_a_reset_out_pin
+                l0x_a_reset_out_pin,
+                apds_int_pin=None
                 ):
 
         self._intOK = True
+        print(f"Hardware backend: {featherBackend.NAME}")
+        self._bootTimer = bootCache.BootTimer()
+        self._bootCache = bootCache.BootCache()
 
-        # Easist way to init I2C on a Feather
+        # The I2C bus, at fast-mode speed.
         self._i2c = None
         try:
-            self._i2c = board.STEMMA_I2C()
+            self._i2c = busio.I2C(board.SCL, board.SDA, frequency=I2C_FREQUENCY)
         except:
-            print("board.STEMMA_I2C failed! Is the Stemma bus connected? It would seem not.")
+            print("busio.I2C failed! Is the Stemma bus connected? It would seem not.")
             self._intOK = False
 
-        # For fun
-        showI2Cbus(self._i2c)
+        # Who was on the bus last time - and are they now? (No scan, unless something's missing; see below.)
+        present = None
+        if self._i2c is not None:
+            present = self._bootCache.probe(self._i2c)
+        self._bootTimer.mark("I2C bus")
 
         # ----------------- Our display object - do this early so we can show errors?
         if USE_SIMPLE_DISPLAY:
@@ -82,76 +106,39 @@ class FeatereminHardware:
         else:
             self._display = fDisplay.FeathereminDisplay(180, False, display_cs_pin, display_dc_pin, display_reset_pin)
         print("Display init OK")
+        self._bootTimer.mark("display")
 
 
-        # ----------------- 'A' VL53L0X time-of-flight sensor
-        # 'A' ToF - this has its XSHUT pin wired to GPIO {L0X_A_RESET_OUT}.
-        # We will finish setting this sensor up 
-        # *after* we turn it off and init the 'B' ToF sensor.
-        
-        # Turn off this ToF sensor - take XSHUT pin low.
+        # ----------------- The VL53L0X time-of-flight sensors
+        # 'A' has its XSHUT pin wired to GPIO {l0x_a_reset_out_pin}; 'B' hasn't, so it's always on.
+        # tofArray does the dance: 'A' off, 'B' found (at 0x30 if a previous run already moved it)
+        # and moved to 0x30, then 'A' back on, at the default address.
+        # (With the boot cache, 'B' is only looked for at 0x30 if something answered there.)
         #
-        print("Turning off 'A' VL53L0X...")
-
-        # We keep this as an instance var so we can de-init it later.
-        self._L0X_A_reset = feather_digitalio.DigitalInOut(l0x_a_reset_out_pin)
-        self._L0X_A_reset.direction = feather_digitalio.Direction.OUTPUT
-        self._L0X_A_reset.value = False
-
-        # 'A' VL53L0X sensor is now turned off
-        showI2Cbus(self._i2c)
-
-
-        # ----------------- 'B' VL53L0X time-of-flight sensor
-        # 'B' ToF - the one that *doesn't* have its XSHUT pin wired up, so is always 'on'.
-        # First, see if it's there already with the non-default address (left over from a previous run).
-        # If so, we don't need to re-assign it.
-        try:
-            self._L0X_B = adafruit_vl53l0x.VL53L0X(self._i2c, address=L0X_B_ALTERNATE_I2C_ADDR)
-            print(f"Found 'B' VL53L0X at {hex(L0X_B_ALTERNATE_I2C_ADDR)}; OK")
-        except:
-            print(f"Did not find 'B' VL53L0X at {hex(L0X_B_ALTERNATE_I2C_ADDR)}, trying default....")
-            try:
-                # Try at the default address
-                self._L0X_B = adafruit_vl53l0x.VL53L0X(self._i2c)  # also performs VL53L0X hardware check
-                print(f"Found 'B' VL53L0X at default address; setting to {hex(L0X_B_ALTERNATE_I2C_ADDR)}...")
-                self._L0X_B.set_address(L0X_B_ALTERNATE_I2C_ADDR)  # address assigned should NOT be already in use
-                print("VL53L0X 'B' set_address OK")
-
-                # Set params for the sensor
-                # The default timing budget is 33ms (measurement_timing_budget = 33000),
-                # a good compromise of speed and accuracy.
-                # For example, a higher speed but less accurate timing budget of 20ms (20000),
-                # or a slower but more accurate timing budget of 200ms (2000)
-                #
-                self._L0X_B.measurement_timing_budget = 33000
-
-                print("'B' VL53L0X init OK")
-            except Exception as e:
-                print(f"**** Caught exception: {e}")
-                print("**** No 'B' VL53L0X?")
-                self._L0X_B = None
-                self._intOK = False
-
-        # ----------------- VL53L0X time-of-flight sensor, part 2
-        # Turn L0X back on and instantiate its object
-        print("Turning 'A' VL53L0X back on...")
-        self._L0X_A_reset.value = True
-
-        self._L0X_A = None
-        try:
-            self._L0X_A = adafruit_vl53l0x.VL53L0X(self._i2c)  # also performs VL53L0X hardware check
-
-            # Set params for the sensor
-            self._L0X_A.measurement_timing_budget = 33000
-
-            print("'A' VL53L0X init OK")
-        except:
-            print("**** No 'A' VL53L0X? Continuing....")
+        # The default timing budget is 33ms (measurement_timing_budget = 33000),
+        # a good compromise of speed and accuracy; the readers (below) change it as they go.
+        self._tofArray = tofArray.ToFArray(self._i2c, (l0x_a_reset_out_pin, None), names=("A", "B"),
+                                           budget=33000, firstAddress=L0X_B_ALTERNATE_I2C_ADDR,
+                                           present=present)
+        self._L0X_A, self._L0X_B = self._tofArray.getSensors()
+        if not self._tofArray.allFound():
             self._intOK = False
+        self._bootTimer.mark("VL53L0X", self._tofArray.getBringUpMS())
 
-        # Show bus again?
-        showI2Cbus(self._i2c)
+        # Put both ToF sensors in continuous mode, so they measure at the same time,
+        # and the main loop can just pick up readings as they're ready.
+        #
+        # Each gets its own timing-budget policy: the pitch sensor goes fast (20ms)
+        # when the hand moves, and accurate when it's still; the secondary sensor, which only
+        # sets things like LFO rates, never needs to be that fast, and can be steadier.
+        self._tofReaderA = None
+        self._tofReaderB = None
+        if self._L0X_A is not None:
+            self._tofReaderA = tofReader.ToFReader(self._L0X_A, "A",
+                tofBudget.AdaptiveBudget(fastBudget=20000, slowBudget=50000, fastSpeed=300, slowSpeed=100))
+        if self._L0X_B is not None:
+            self._tofReaderB = tofReader.ToFReader(self._L0X_B, "B",
+                tofBudget.AdaptiveBudget(fastBudget=33000, slowBudget=100000, fastSpeed=500, slowSpeed=150))
 
 
         # ----------------- APDS9960 gesture/proximity/color sensor
@@ -166,6 +153,21 @@ class FeatereminHardware:
             print("**** No APDS9960? Continuing....")
             self._intOK = False
 
+        # If its INT pin is wired up, have the APDS9960 tell us when a hand comes near,
+        # so we needn't ask it for gestures all the time. (Any proximity, for 1 cycle, will do.)
+        self._apdsInterrupt = None
+        if self._apds is not None and apds_int_pin is not None:
+            self._apds.proximity_interrupt_threshold = (0, APDS_PROXIMITY_THRESHOLD, 1)
+            self._apds.enable_proximity_interrupt = True
+            self._apds.clear_interrupt()
+            self._apdsInterrupt = feather_digitalio.DigitalInOut(apds_int_pin)
+            self._apdsInterrupt.switch_to_input(pull=feather_digitalio.Pull.UP) # it's open-drain
+            print("APDS9960 interrupt enabled")
+        self._bootTimer.mark("APDS9960")
+
+        # Everything that reads a sensor from here on goes through this, so the pitch sensor comes first.
+        self._busScheduler = i2cScheduler.I2CScheduler(self._i2c, I2C_FREQUENCY)
+
         # My "synthezier" object that does the stuff that I need.
         #
         USE_STEREO = True
@@ -174,6 +176,19 @@ class FeatereminHardware:
                                     i2s_word_select = audio_out_i2s_word_pin, 
                                     i2s_data = audio_out_i2s_data_pin)
         self._synth.setVolume(0.75)
+        self._bootTimer.mark("synth")
+
+        # Everything where it was last time? Then we're done; if not, show what is there, and remember it.
+        found = {}
+        for name, address, device in (("ToF A", tofArray.DEFAULT_ADDRESS, self._L0X_A),
+                                      ("ToF B", L0X_B_ALTERNATE_I2C_ADDR, self._L0X_B),
+                                      ("APDS9960", APDS_I2C_ADDR, self._apds)):
+            if device is not None:
+                found[name] = address
+        if self._i2c is not None:
+            self._bootCache.check(self._i2c, found)
+        self._bootTimer.mark("bus check")
+        self._bootTimer.report()
 
 
         showMem()
@@ -198,6 +213,32 @@ class FeatereminHardware:
         '''
         return self._L0X_A, self._L0X_B, self._apds, self._display, self._synth
 
+    def getToFReaders(self) -> Tuple[tofReader.ToFReader, tofReader.ToFReader]:
+        '''
+        The non-blocking readers for the 'A' and 'B' ToF sensors (None for a missing sensor).
+        '''
+        return self._tofReaderA, self._tofReaderB
+
+    def getBusScheduler(self) -> i2cScheduler.I2CScheduler:
+        '''
+        The one way on to the I2C bus, once we're up and running.
+        '''
+        return self._busScheduler
+
+    def getBootStats(self):
+        '''
+        Where the boot time went (ms per step, and per ToF sensor), and whether the boot cache's fast path worked.
+        '''
+        stats = self._bootTimer.getStats()
+        stats.update(self._bootCache.getStats())
+        return stats
+
+    def getGestureInterrupt(self):
+        '''
+        The APDS9960's INT pin, as a DigitalInOut (low when a hand is near), or None if it's not wired up.
+        '''
+        return self._apdsInterrupt
+
 
     def __del__(self):
         ''' Destructor
@@ -210,8 +251,10 @@ class FeatereminHardware:
         # release the I2C bus
         self._i2c.deinit()
 
-        # release the hardware pin
-        self._L0X_A_reset.deinit()
+        # release the hardware pins
+        self._tofArray.deinit()
+        if self._apdsInterrupt is not None:
+            self._apdsInterrupt.deinit()
 
         self._L0X_A = None
         self._L0X_B = None
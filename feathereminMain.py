@@ -12,6 +12,9 @@ __maintainer__  = "Rob Cranfill"
 __email__       = "<robcranfill at gmail.com>"
 __status__      = "Development"
 
+# Must come first: on a desktop, this swaps in the simulator.
+import featherBackend
+
 # Standard libs
 import array
 import audiocore
@@ -25,12 +28,21 @@ import sys
 
 # 3rd party libs (Adafruit!)
 import digitalio as feather_digitalio
-import synthio
 
 # Our modules
+import bufferTune
+import droneEngine
 import feathereminHardware
-import featherSynth5 as fSynth
+import featherSynth6 as fSynth
 import gestureMenu
+import handPresence
+import loopStats
+import pitchMap
+import rangeFilter
+import sensorDemand
+import taskRunner
+import voiceFilter
+import waveforms
 
 
 #############################################################3
@@ -47,6 +59,11 @@ import gestureMenu
 #
 L0X_A_RESET_OUT = board.D4
 
+# The APDS9960 gesture sensor's INT output, so we only read gestures when there's a hand there.
+# None: it's not wired up (it isn't, on the standard build), so we ask the sensor every time.
+# If you wire INT to D5 (see README), make this board.D5.
+APDS_INT_IN = None
+
 # The TFT display, attached via the SPI ("four wire") interface
 TFT_DISPLAY_CS    = board.A2
 TFT_DISPLAY_DC    = board.A0
@@ -64,17 +81,35 @@ USE_STEREO = True
 
 # No 'enum' in circuitpython! :-(
 MENU_WAVE = "Waveform"
-WAVEFORM_TYPES = ["Sine", "Square", "Saw"]
+WAVEFORM_TYPES = ["Sine", "Square", "Saw", "Wavetable"]
 MENU_LFO = "LFO"
 LFO_MODES = ["Off", "Tremolo", "Vibrato", "Drone"]
+MENU_SCALE = "Scale"
+MENU_SMOOTHING = "Smoothing"
+SMOOTHING_TYPES = ["1-Euro", "Median", "Exp", "Off"]
+MENU_GLIDE = "Glide"
+GLIDE_TIMES = ["Off", "20 ms", "50 ms", "100 ms", "250 ms"]
+GLIDE_SECONDS = {"Off": 0, "20 ms": 0.02, "50 ms": 0.05, "100 ms": 0.1, "250 ms": 0.25}
+MENU_DRONE = "Drone"  # its options are droneEngine.PRESET_NAMES
+MENU_VOICES = "Voices"
+VOICE_COUNTS = ["1", "3", "5", "7"] # unison oscillators
+MENU_FILTER = "Filter"  # voiceFilter.FILTER_TYPES
+MENU_RESONANCE = "Resonance"  # voiceFilter.RESONANCES
+MENU_ENVELOPE = "Envelope"  # fSynth.ENVELOPE_NAMES
 
 
 menuData = [ # 'item', 'options', and TODO: index - or value? - of default 
             [MENU_WAVE,    WAVEFORM_TYPES, 0],
             [MENU_LFO,     LFO_MODES, 0],
-            ["Chromatic",   [True, False], 0],
+            [MENU_SCALE,    pitchMap.SCALE_NAMES, 0],
             ["Bogus 1",     ["A", "B", "C"], 0],
-            ["Bogus 2",     ["A", "B", "C"], 1],
+            [MENU_SMOOTHING, SMOOTHING_TYPES, 0],
+            [MENU_GLIDE,    GLIDE_TIMES, 0],
+            [MENU_DRONE,    droneEngine.PRESET_NAMES, 0],
+            [MENU_VOICES,   VOICE_COUNTS, 0],
+            [MENU_FILTER,   voiceFilter.FILTER_TYPES, 0],
+            [MENU_RESONANCE, voiceFilter.RESONANCES, 1],
+            [MENU_ENVELOPE, fSynth.ENVELOPE_NAMES, 0],
             # ["Delay",       [0, 1, 2, 3, 4, 5], 0],
             # ["Volume",      ["20", 40, 60, 80, 100], 4],
             ]
@@ -96,9 +131,6 @@ def displayLeftStatus(disp, wave, lfo):
 def displayLFOMode(disp, mode):
     disp.setTextAreaR(mode)
 
-def displayDroneMode(disp, freq1, freq2):
-    disp.setTextAreaR(f"{freq1:4.2f} / {freq2:4.2f}")
-
 def displayMainFreq(disp, fString):
     disp.setTextAreaR(fString)
 
@@ -109,15 +141,6 @@ def displayMainFreq(disp, fString):
 #     disp.setTextArea2(f"Sleep: {sleepMS} ms")
 
 
-def clamp(num, min_value, max_value):
-    '''Restrict the input number to the given range.'''
-    return max(min(num, max_value), min_value)
-
-def map_and_scale(inValue, lowIn, highIn, lowOut, highOut):
-    ''' Map the input number's position in the input range to the output range.'''
-    frac = (inValue-lowIn)/(highIn-lowIn)
-    return lowOut + frac*(highOut-lowOut)
-
 def showFatalErrorAndHalt(errorMessage: str) -> None:
     '''An error handler for major errors, like hardware init issues.
 
@@ -127,10 +150,345 @@ def showFatalErrorAndHalt(errorMessage: str) -> None:
         pass
 
 
+# --------------------------------------------------
+# ------------------- the app ----------------------
+# --------------------------------------------------
+class Featheremin:
+    '''
+        The running instrument: the hardware, what the menu says, and the latest readings.
+
+        Each *Step() method is one task's work, run at that task's rate by a TaskRunner
+        (see taskRunner.py and main(), below). They share state through this object;
+        the pitch task writes r1, the secondary task r2, and so on.
+
+        Sensor reads don't happen in the tasks themselves: they're queued on the I2C scheduler
+        (see i2cScheduler.py), which the pitch task runs, pitch first; the *Read() methods
+        get the results.
+    '''
+    def __init__(self, hw, stats):
+        self._stats = stats
+        self._tof_A, self._tof_B, self._gestureSensor, self._display, self._synth = hw.getHardwareItems()
+        self._tofReaderA, self._tofReaderB = hw.getToFReaders()
+        self._bus = hw.getBusScheduler()
+        self._bootStats = hw.getBootStats()
+
+        display, synth = self._display, self._synth
+
+        self._waveName = WAVEFORM_TYPES[0]
+        synth.setWaveformSquare()
+
+        self._lfoIndex = 0
+        self._lfoMode = LFO_MODES[self._lfoIndex]
+
+        self._filterOn = False
+
+        # What reads which sensor. Only the pitch and the menu are always on;
+        # the secondary ToF stands by unless something that uses r2 is.
+        self._demand = sensorDemand.SensorDemand()
+        self._demand.declare("pitch",     ("tofA",), active=True)
+        self._demand.declare("menu",      ("gesture",), active=True)
+        self._demand.declare("tremolo",   ("tofB",))
+        self._demand.declare("vibrato",   ("tofB",))
+        self._demand.declare("drone",     ("tofA", "tofB"))
+        self._demand.declare("wavetable", ("tofB",))
+        self._demand.declare("filter",    ("tofB",))
+        if SENSOR_DEMAND:
+            self._demand.onChange("tofB", self._tofBNeeded)
+            self._tofBNeeded(self._demand.needs("tofB"))
+
+        displayLeftStatus(display, self._waveName, self._lfoMode)
+
+        # Range to pitch, worked out once for every scale: Continuous (the most thereminy),
+        # Chromatic (only whole MIDI notes), or Major/Minor/Pentatonic.
+        # 5mm per semitone, up to MIDI note 120.
+        self._pitches = pitchMap.PitchMap(mmPerNote=5, maxNote=120, maxRange=1000)
+
+        # The other range mappings we use.
+        self._tremMap = pitchMap.LinearMap(50, 500, 8, 16)
+        self._droneMap = pitchMap.LinearMap(10, 200, 1000, 20000) # r1*100, from 1000 to 20000 Hz
+        self._scanMap = pitchMap.LinearMap(50, 500, 0, 1) # wavetable position
+        self._sweepMap = pitchMap.LinearMap(50, 500, 0, 1) # filter cutoff
+
+        # Filters for the pitch sensor's readings, one per SMOOTHING_TYPES entry.
+        # Made once, here; switching between them just picks a different one.
+        self._pitchFilters = {
+            "1-Euro": rangeFilter.RangeFilter((rangeFilter.MedianFilter(3), rangeFilter.OneEuroFilter())),
+            "Median": rangeFilter.RangeFilter((rangeFilter.MedianFilter(5),)),
+            "Exp":    rangeFilter.RangeFilter((rangeFilter.ExpSmoothing(0.75),)),
+            "Off":    rangeFilter.RangeFilter(),
+            }
+        self._pitchFilter = self._pitchFilters[SMOOTHING_TYPES[0]]
+
+        # The latest readings, and what we're playing.
+        # The hand's there (or not) when self._presence says so: ENTER and LEAVE events, with hysteresis.
+        self._presence = handPresence.HandPresence()
+        self._handPresent = False
+        self.r1 = 0
+        self.r2 = 0
+        self.freq = 0
+
+        # Instructions here?
+        display.setTextAreaR("Started!")
+
+        self._gmenu = gestureMenu.GestureMenu(self._gestureSensor, display, menuData, windowSize=4,
+                                              interruptPin=hw.getGestureInterrupt())
+
+        # How long after synth.play() before we actually hear it - the mixer's buffer.
+        self._outputLatencyMicros = int(synth.getOutputLatency() * 1000000)
+
+    def pitchStep(self):
+        '''Ask for the pitch reading, then run the bus: that, first, and whatever the others have asked for.'''
+        self._bus.submit("tofA", PITCH_TASK[1], self._tofReaderA.poll, self._pitchRead)
+        self._bus.service()
+
+    def _pitchRead(self, fresh):
+        '''
+            r1 is the main ToF detector, used for main frequency.
+
+            The sensor's in continuous mode; if there's no new reading yet, there's nothing new to play.
+        '''
+        if not fresh:
+            return
+        rangeDone = self._stats.now()
+        self.r1 = self._pitchFilter.filter(self._tofReaderA.range, time.monotonic_ns())
+
+        event = self._presence.update(self.r1, time.monotonic_ns())
+        if self._lfoIndex == 3 and (event == handPresence.ENTER or event == handPresence.MOVE):
+            # Drone mode: the drone plays instead of the pitch voices; lfoStep() retunes it.
+            self._handPresent = True
+            if event == handPresence.ENTER:
+                self._synth.startDrone(self._droneMap.map(self.r1), self.r2)
+
+        elif event == handPresence.ENTER or event == handPresence.MOVE:
+            self._handPresent = True
+            self.freq = self._pitches.hz(self.r1)
+            # print(f"{self.r1}mm -> {self.freq} Hz")
+            self._synth.playFrequency(self.freq)
+
+            # From the end of the pitch measurement to the new pitch coming out of the speaker.
+            self._stats.addSample("sensorToSound", (self._stats.now() - rangeDone) // 1000 + self._outputLatencyMicros)
+
+        elif event == handPresence.LEAVE:
+            self._handPresent = False
+            self._synth.stop()
+
+    def secondaryStep(self):
+        '''
+            r2 is the secondary ToF, used for LFO freq, and maybe other things.
+            Only read ToF2 if ToF1 is close - TODO: how close? - and something's using it.
+        '''
+        if self._handPresent and (self._demand.needs("tofB") or not SENSOR_DEMAND):
+            self._bus.submit("tofB", SECONDARY_TASK[1], self._tofReaderB.poll, self._secondaryRead)
+
+    def _secondaryRead(self, fresh):
+        if fresh:
+            self.r2 = self._tofReaderB.range
+
+    def _tofBNeeded(self, needed):
+        '''Start or stop the secondary ToF ranging. (Called on the bus's turn, from a menu change.)'''
+        if needed:
+            self._tofReaderB.resume()
+        else:
+            self._tofReaderB.standby()
+            self.r2 = 0
+
+    def lfoStep(self):
+        '''Tremolo, vibrato or drone, from the latest r2 (and r1, for the drone); and the wavetable scan.'''
+        if not self._handPresent:
+            return
+        r2 = self.r2
+        lfoIndex = self._lfoIndex
+
+        # The secondary hand scans through the wavetable, if that's what we're playing.
+        if self._waveName == "Wavetable":
+            self._synth.setWavetablePosition(self._scanMap.map(r2))
+
+        # ... and sweeps the filter, if there is one. (Same step as last time? Then that's all it costs.)
+        if self._filterOn:
+            self._synth.setFilterSweep(self._sweepMap.map(r2))
+
+        # The LFO values used to go on the right-hand display too, but the frequency
+        # overwrote them straight away; so now they don't.
+        if r2 > 50 and r2 < 500:
+            # TODO: REWORK THIS
+            # - We do get readings farther out, to like XXXX at 2 feet, but will use only the closer range?
+            # TODO: Use values XXXX for now; tailor for trem/vib?
+            # sometimes there seem to be false signals of 0, so toss them out.
+            r2a = max(5, r2)
+
+            # if mode was changed, the "other" mode has already been cleared, so we are good to go.
+            if lfoIndex == 1: # tremolo
+                self._synth.setTremolo(self._tremMap.map(r2))
+
+            elif lfoIndex == 2:
+                # map to 4-10?
+                self._synth.setVibrato(r2a)
+
+        # drone mode: r1 is the pitch, r2 how fast the voices beat (out-of-range pitches get clamped)
+        if lfoIndex == 3:
+            self._synth.drone(self._droneMap.map(self.r1), r2)
+
+    def gestureStep(self):
+        self._bus.submit("gesture", GESTURE_TASK[1], self._gmenu.getItemAndOption, self._gestureRead)
+
+    def choose(self, item, option):
+        '''Pick 'option' for menu 'item', as if by gesture.'''
+        self._gestureRead((item, option))
+
+    def _gestureRead(self, itemAndOption):
+        '''Handle a gesture?'''
+        item, option = itemAndOption
+        if item is None:
+            return
+
+        display, synth = self._display, self._synth
+
+        # print(f"Gesture event: '{item}' / '{option}'")
+        if item == MENU_WAVE:
+            self._waveName = option
+            waveIndex = WAVEFORM_TYPES.index(self._waveName)
+            # print(f" -> Wave #{waveIndex}: {self._waveName}")
+
+            displayLeftStatus(display, self._waveName, self._lfoMode)
+
+            # FIXME: find a better way to do this
+            if waveIndex == 0:
+                synth.setWaveformSquare()
+            elif waveIndex == 1:
+                synth.setWaveformSine()
+            elif waveIndex == 2:
+                synth.setWaveformSaw()
+            elif waveIndex == 3:
+                synth.setWaveformWavetable()
+            self._demand.setActive("wavetable", waveIndex == 3)
+
+        elif item == MENU_LFO:
+            if self._lfoIndex == 3:
+                # out of drone mode: the pitch voices take over again, with the next reading
+                synth.stopDrone()
+            self._lfoIndex = LFO_MODES.index(option)
+            self._lfoMode = LFO_MODES[self._lfoIndex]
+            # print(f" -> LFO #{self._lfoIndex}: {self._lfoMode}")
+
+            displayLeftStatus(display, self._waveName, self._lfoMode)
+
+            # FIXME: find a better way to do this
+            if self._lfoIndex == 0:
+                synth.clearTremolo()
+                synth.clearVibrato()
+                displayLFOMode(display, "")
+            elif self._lfoIndex == 1: # tremolo
+                synth.setTremolo(20)
+                synth.clearVibrato()
+            elif self._lfoIndex == 2: # vibrato
+                synth.setVibrato(20)
+                synth.clearTremolo()
+            elif self._lfoIndex == 3: # dual/drone
+                synth.clearVibrato()
+                synth.clearTremolo()
+                # it starts when a hand does - now, if there's one there already
+                if self._handPresent:
+                    synth.startDrone(self._droneMap.map(self.r1), self.r2)
+            self._demand.setActive("tremolo", self._lfoIndex == 1)
+            self._demand.setActive("vibrato", self._lfoIndex == 2)
+            self._demand.setActive("drone", self._lfoIndex == 3)
+
+        elif item == MENU_SCALE:
+            self._pitches.setScale(option)
+
+        elif item == MENU_SMOOTHING:
+            self._pitchFilter = self._pitchFilters[option]
+            self._pitchFilter.reset()
+
+        elif item == MENU_FILTER:
+            synth.setFilter(option)
+            self._filterOn = option != "Off"
+            self._demand.setActive("filter", self._filterOn)
+
+        elif item == MENU_RESONANCE:
+            synth.setFilterResonance(float(option))
+
+        elif item == MENU_ENVELOPE:
+            synth.setEnvelope(option)
+
+        elif item == MENU_VOICES:
+            synth.setNumOscs(int(option))
+
+        elif item == MENU_DRONE:
+            synth.setDronePreset(option)
+
+        elif item == MENU_GLIDE:
+            # With a glide about as long as the time between readings, the pitch slides from
+            # one to the next instead of stepping.
+            synth.setGlide(GLIDE_SECONDS[option])
+
+    def displayStep(self):
+        '''Show the frequency, and whatever else has changed (the display only redraws changed text).'''
+        if self._lfoIndex == 3:
+            # in Drone mode it's the drone that's playing; self.freq is whatever the voices played last
+            droneFreq = self._synth.getDroneFrequency()
+            displayMainFreq(self._display, "" if droneFreq is None else f"{droneFreq:4.2f} Hz")
+        elif self._handPresent:
+            displayMainFreq(self._display, f"{self.freq:4.2f} Hz")
+        else:
+            displayMainFreq(self._display, "")
+        self._display.update()
+
+    def addInfo(self):
+        self._stats.addInfo("tofA", self._tofReaderA.getStats())
+        self._stats.addInfo("tofB", self._tofReaderB.getStats())
+        self._stats.addInfo("display", self._display.getWriteStats())
+        self._stats.addInfo("gesture", self._gmenu.getGestureStats())
+        self._stats.addInfo("i2cBus", self._bus.getStats())
+        self._stats.addInfo("drone", self._synth.getDroneStats())
+        self._stats.addInfo("presence", self._presence.getStats())
+        self._stats.addInfo("sensorDemand", self._demand.getStats())
+        self._stats.addInfo("boot", self._bootStats)
+
+
+# Read (and keep ranging) only the sensors some feature that's on needs; the rest stand by.
+# False: read them all, always - the way it was, for comparing (see test/bench_mainLoop.py --modes).
+SENSOR_DEMAND = True
+
+# How often each task runs, in seconds, and how important it is (higher goes first).
+# The pitch task only polls - its sensor has a new reading every 20 to 50 ms - so
+# running it often keeps the pitch latency down, for not much work.
+# It also runs the I2C bus, so the sensor reads the other tasks ask for get done then, after
+# the pitch sensor's (the priorities are theirs on the bus, too). That used to be a task of its own,
+# at the same rate; but that was two wakeups every 2 ms instead of one, on the busiest path, and the
+# pitch read waited for the next bus run anyway.
+PITCH_TASK     = (0.002, 3)
+SECONDARY_TASK = (0.010, 2)
+LFO_TASK       = (0.020, 1)
+GESTURE_TASK   = (0.050, 1)
+DISPLAY_TASK   = (1/15,  0)
+
+
 # --------------------------------------------------
 # ------------------- begin main -------------------
 # --------------------------------------------------
-def main():
+def makeRunner(app, stats):
+    '''The Featheremin's tasks, ready to run.'''
+    runner = taskRunner.TaskRunner(stats)
+    runner.add("pitch",     PITCH_TASK[0],     app.pitchStep,     PITCH_TASK[1])
+    runner.add("secondary", SECONDARY_TASK[0], app.secondaryStep, SECONDARY_TASK[1])
+    runner.add("lfo",       LFO_TASK[0],       app.lfoStep,       LFO_TASK[1])
+    runner.add("gesture",   GESTURE_TASK[0],   app.gestureStep,   GESTURE_TASK[1])
+    runner.add("display",   DISPLAY_TASK[0],   app.displayStep,   DISPLAY_TASK[1])
+    return runner
+
+
+def main(seconds=None, stats=None, calibrate=False, menu=(), profiler=None):
+    '''Run the Featheremin. Forever, unless 'seconds' says how long.
+
+    stats: a loopStats.LoopStats to record how long each task takes, each time it runs.
+    calibrate: first find the smallest audio buffer that doesn't glitch, running the real thing,
+        and save it (see bufferTune.py).
+    menu: (item, option) pairs to start with, as if picked by gesture.
+    profiler: a bootProfiler.BootProfiler that's been timing the boot; we finish() it once we're up.
+    '''
+    if stats is None:
+        stats = loopStats.NullStats()
     print("\nHello, Featheremin!\n")
     showMem()
 
@@ -145,7 +503,7 @@ def main():
     hw = feathereminHardware.FeatereminHardware(
             TFT_DISPLAY_CS, TFT_DISPLAY_DC, TFT_DISPLAY_RESET,
             AUDIO_OUT_I2S_BIT, AUDIO_OUT_I2S_WORD, AUDIO_OUT_I2S_DATA,
-            L0X_A_RESET_OUT)
+            L0X_A_RESET_OUT, APDS_INT_IN)
     
     # could do this:
     # if not hw._intOK:
@@ -164,155 +522,32 @@ def main():
         # print(f" Amp: {amp}\n Wheel: {wheel}\n Butt: {wheelButton}\n LED: {wheelLED}")
         return
 
+    app = Featheremin(hw, stats)
+    for item, option in menu:
+        app.choose(item, option)
 
-    waveIndex = 0
-    waveName = WAVEFORM_TYPES[waveIndex]
-    synth.setWaveformSquare()
-
-    lfoIndex = 0
-    lfoMode = LFO_MODES[lfoIndex]
-    
-    displayLeftStatus(display, waveName, lfoMode)
-
-    dSleepMilliseconds = 0
-
-    # Play notes from a chromatic scale, as opposed to a continuous range of frequencies?
-    # That is, use only integer MIDI numbers .vs. fractional?
-    # False is more thereminy!
-    chromatic = False
-    # displayChromaticMode(display, chromatic)
-
-    # Instructions here?
-    display.setTextAreaR("Started!")
+    print("Waveform tables:")
+    waveforms.printReport()
+    showMem()
 
-    gmenu = gestureMenu.GestureMenu(gestureSensor, display, menuData, windowSize=4)
+    if profiler is not None:
+        profiler.finish()
 
-    showMem()
+    if calibrate:
+        bufferTune.calibrate(synth, lambda s: makeRunner(app, loopStats.NullStats()).run(s))
 
-    # ==== Main loop ===============================================================
+    # ==== The tasks ===============================================================
     #
-    while True:
+    runner = makeRunner(app, stats)
+    runner.run(seconds)
 
-        # Handle a gesture?
-        #
-        item, option = gmenu.getItemAndOption()
-        if item is not None:
-            # print(f"Gesture event: '{item}' / '{option}'")
-            if item == MENU_WAVE:
-                waveName = option
-                waveIndex = WAVEFORM_TYPES.index(waveName)
-                # print(f" -> Wave #{waveIndex}: {waveName}")
-
-                displayLeftStatus(display, waveName, lfoMode)
-
-                # FIXME: find a better way to do this
-                if waveIndex == 0:
-                    synth.setWaveformSquare()
-                elif waveIndex == 1:
-                    synth.setWaveformSine()
-                elif waveIndex == 2:
-                    synth.setWaveformSaw()
-
-            elif item == MENU_LFO:
-                lfoMode = option
-                lfoIndex = LFO_MODES.index(lfoMode)
-                lfoMode = LFO_MODES[lfoIndex]
-                # print(f" -> LFO #{lfoIndex}: {lfoMode}")
-
-                displayLeftStatus(display, waveName, lfoMode)
-
-                # FIXME: find a better way to do this
-                if lfoIndex == 0:
-                    synth.clearTremolo()
-                    synth.clearVibrato()
-                    displayLFOMode(display, "")
-                elif lfoIndex == 1: # tremolo
-                    synth.setTremolo(20)
-                    synth.clearVibrato()
-                elif lfoIndex == 2: # vibrato
-                    synth.setVibrato(20)
-                    synth.clearTremolo()
-                elif lfoIndex == 3: # dual/drone
-                    synth.clearVibrato()
-                    synth.clearTremolo()
-                    synth.startDrone(1000, 1100)
-
-
-        # C'mon - make some noise!
-
-# TODO: display frequency!
-
-        # Get the two ranges, as available. 
-        #
-        # r1 is the main ToF detector, used for main frequency.
-        # r2 is the secondary ToF, used for LFO freq, and maybe other things.
-        #
-        r1 = tof_A.range
-        # print(f"Range A: {r1}, range B: {r2}")
-
-        # Only read ToF2 if ToF1 is close - TODO: how close?
-        # TODO: if not in a mode that uses this ToF2, don't read it?
-        if r1 > 0 and r1 < 1000:
-
-            r2 = tof_B.range
-            if r2 > 50 and r2 < 500:
-                # TODO: REWORK THIS
-                # - We do get readings farther out, to like XXXX at 2 feet, but will use only the closer range?
-                # TODO: Use values XXXX for now; tailor for trem/vib?
-                # sometimes there seem to be false signals of 0, so toss them out.
-                r2a = max(5, r2)
-                # print(f"r2: {r2} -> r2a = {r2a}")
-
-                # TODO: only set if r2 has *changed*? especially if we force the value to be an int.
-                
-                # if mode was changed, the "other" mode has already been cleared, so we are good to go.
-                if lfoIndex == 1: # tremolo
-                     # map to 8-16?
-                    trem = map_and_scale(r2, 50, 500, 8, 16)
-                    # print(f"r2 {r2} -> trem {trem}")
-                    displayLFOMode(display, f"T @ {trem:.1f}")
-                    synth.setTremolo(trem)
-
-                elif lfoIndex == 2:
-                    # map to 4-10?
-                    vib = map_and_scale(r2, 50, 500, 4, 10)
-                    synth.setVibrato(r2a) 
-                    # print(f"r2 {r2} -> vib ?")
-                    displayLFOMode(display, f"V @ {vib:.1f}")
-
-            # drone mode
-            if lfoIndex == 3:
-                f1 = clamp(r1*100, 1000, 20000)
-                
-                # f2 = clamp(r2*100, 1000, 20000)
-                f2 = f1 - r2
-                
-                # print(f"drone: {f1} {f2}")
-                displayDroneMode(display, f1, f2)
-                synth.drone(f1, f2)
-                pass
-
-            midiNote = r1 / 5
-            if midiNote > 120:
-                midiNote = 120
-
-            if chromatic:
-                midiNote = int(midiNote)
-
-            # print(f"{r1}mm -> MIDI {midiNote} -> {synthio.midi_to_hz(midiNote)}")
-            # display.setTextAreaR(f"r1={r1}\nr2={r2}")
-
-            displayMainFreq(display, f"{synthio.midi_to_hz(midiNote):4.2f} Hz")
-
-            synth.play(midiNote)
-            time.sleep(dSleepMilliseconds/100)
-
-        else: # no proximity detected
-            synth.stop()
-            displayMainFreq(display, "")
+    app.addInfo()
+    return runner
 
 
 
 # OK, let's do it! :-)
+# (main.py imports us and calls main(); on a desktop, just run this file.)
 #
-main()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+""" Run the Featheremin on a desktop computer, against the host simulator (see sim/).
+
+    Examples:
+        python feathereminSim.py --seconds 5 --wav out.wav
+        python feathereminSim.py --pitch myHand.csv --gestures 2:4,5:1,6:4
+        python feathereminSim.py --calibrate --seconds 5
+        python feathereminSim.py --profile --seconds 1
+        python feathereminSim.py --profile --seconds 1 --menu Waveform:Saw
+
+    Range files have one "seconds,mm" pair per line, as printed by test/record_ranges.py.
+    Gestures are seconds:code pairs; codes are 1 down, 2 up, 3 left, 4 right.
+    Menu choices are item:option pairs, made at startup as if by gesture (so a boot profile includes them).
+"""
+import argparse
+
+import sim
+from sim import streams
+
+
+def makeScenario(args):
+    pitch = streams.RecordedRanges(args.pitch) if args.pitch else streams.HandSweep()
+    secondary = streams.RecordedRanges(args.secondary) if args.secondary else streams.Constant(200)
+    gestures = []
+    if args.gestures:
+        for pair in args.gestures.split(","):
+            t, code = pair.split(":")
+            gestures.append((float(t), int(code)))
+    return sim.Scenario(pitch=pitch, secondary=secondary, gestures=gestures, wavPath=args.wav)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Featheremin in the host simulator.")
+    parser.add_argument("--seconds", type=float, default=None, help="how long to run (default: forever)")
+    parser.add_argument("--wav", default=None, help="write the audio here")
+    parser.add_argument("--pitch", default=None, help="recorded ranges for the pitch ('A') sensor")
+    parser.add_argument("--secondary", default=None, help="recorded ranges for the 'B' sensor")
+    parser.add_argument("--gestures", default=None, help="timed gestures, like 2:4,5:1")
+    parser.add_argument("--calibrate", action="store_true", help="find the smallest glitch-free audio buffer first, and save it")
+    parser.add_argument("--profile", action="store_true", help="time each import and constructor at boot, and the heap each takes")
+    parser.add_argument("--menu", default=None, help="menu choices to start with, like Waveform:Saw,LFO:Drone")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="scale modelled hardware delays")
+    args = parser.parse_args()
+
+    sim.TIME_SCALE = args.time_scale
+    sim.install(makeScenario(args), trackMemory=args.profile)
+
+    profiler = None
+    if args.profile:
+        import bootProfiler
+        profiler = bootProfiler.BootProfiler()
+        profiler.install()
+    import feathereminMain
+    if profiler is not None:
+        profiler.wrapConstructors()
+    try:
+        menu = [tuple(pair.split(":")) for pair in args.menu.split(",")] if args.menu else ()
+        feathereminMain.main(seconds=args.seconds, calibrate=args.calibrate, menu=menu, profiler=profiler)
+    finally:
+        if sim.audioOut() is not None:
+            sim.audioOut().deinit()
+        if sim.screen() is not None:
+            print(f"Screen: {sim.screen().text()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -116,12 +116,20 @@ class GestureMenu:
     '''
     Display a menu and update it based on gestures from a APDS9960.
 
+    If interruptPin (a DigitalInOut wired to the APDS9960's INT pin) is given, we only read
+    gestures when it says there's a hand near the sensor; the rest of the time, looking for
+    a gesture costs one pin read, not three I2C transactions. See FeatereminHardware.
     '''
-    def __init__(self, gestureSensor, display, menuData, windowSize=3):
+    def __init__(self, gestureSensor, display, menuData, windowSize=3, interruptPin=None):
 
         self._apds = gestureSensor
         self._display = display
         self._windowSize = windowSize
+        self._interrupt = interruptPin
+
+        # how many times we looked for a gesture, and how many of those actually asked the sensor
+        self._checks = 0
+        self._reads = 0
 
         # FIXME: the calling code should do this?
         try:
@@ -194,7 +202,16 @@ class GestureMenu:
     # only return gestures that 
     def getGesture(self):
 
+        self._checks += 1
+
+        # INT is active low; high means nobody's there.
+        if self._interrupt is not None and self._interrupt.value:
+            return None
+
+        self._reads += 1
         g = self._apds.gesture()
+        if self._interrupt is not None:
+            self._apds.clear_interrupt() # re-arm; it comes right back if the hand is still there
         if g == 0:
             return None
         
@@ -212,6 +229,11 @@ class GestureMenu:
         return g
         # end getGesture
 
+    def getGestureStats(self):
+        '''How many times we looked for a gesture, and how many of those read the sensor.'''
+        return {"checks": self._checks, "reads": self._reads,
+                "interrupt": self._interrupt is not None}
+
 
     def test(self):
         print("Test/demo GestureMenu!")
@@ -0,0 +1,88 @@
+"""Is there a hand over the pitch sensor? Decided with hysteresis and dwell times, so it doesn't chatter.
+
+The main loop used to call it "there" for any reading under 1000 mm, and "gone" otherwise; a hand
+near that edge flipped between the two with every reading - a release, a press and a redraw each time.
+
+A HandPresence only says ENTER when a reading is under enterBelow (for at least enterDwellMS),
+and LEAVE when readings have been at or over leaveAbove - or no reading at all - for leaveDwellMS.
+In between, while the hand's there, every reading in range is a MOVE; anything else is NONE -
+nothing to do. The synth only needs pressing on ENTER, and releasing on LEAVE.
+
+getStats() counts the events, and the edge-crossings that weren't turned into events.
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+
+# Events
+NONE  = 0
+ENTER = 1
+MOVE  = 2
+LEAVE = 3
+
+ENTER_BELOW = 950      # mm
+LEAVE_ABOVE = 1000     # mm
+ENTER_DWELL_MS = 0     # come in at once - that's latency, and the range filters already drop the odd wild reading
+LEAVE_DWELL_MS = 120   # but don't go until we've been gone for a few readings
+
+
+class HandPresence:
+    '''Turn range readings (mm, 0 or less for nothing there) into ENTER/MOVE/LEAVE events.'''
+    def __init__(self, enterBelow=ENTER_BELOW, leaveAbove=LEAVE_ABOVE,
+                 enterDwellMS=ENTER_DWELL_MS, leaveDwellMS=LEAVE_DWELL_MS):
+        self._enterBelow = enterBelow
+        self._leaveAbove = leaveAbove
+        self._enterDwellNS = enterDwellMS * 1000000
+        self._leaveDwellNS = leaveDwellMS * 1000000
+
+        self.present = False
+        self._sinceNS = None # when the readings started saying we should change, or None
+
+        # what a plain "0 < r < leaveAbove" test would have done, for comparison
+        self._naivePresent = False
+        self._naiveFlips = 0
+        self._events = 0
+
+    def update(self, r, nowNS):
+        '''The event for reading r (mm), taken at nowNS.'''
+        inside = 0 < r < self._leaveAbove
+        if inside != self._naivePresent:
+            self._naivePresent = inside
+            self._naiveFlips += 1
+
+        if self.present:
+            if inside:
+                self._sinceNS = None
+                return MOVE
+            if self._sinceNS is None:
+                self._sinceNS = nowNS
+            if nowNS - self._sinceNS < self._leaveDwellNS:
+                return NONE # (keep playing the last good reading)
+            self.present = False
+            self._sinceNS = None
+            self._events += 1
+            return LEAVE
+
+        if not (0 < r < self._enterBelow):
+            self._sinceNS = None
+            return NONE
+        if self._sinceNS is None:
+            self._sinceNS = nowNS
+        if nowNS - self._sinceNS < self._enterDwellNS:
+            return NONE
+        self.present = True
+        self._sinceNS = None
+        self._events += 1
+        return ENTER
+
+    def reset(self) -> None:
+        self.present = False
+        self._sinceNS = None
+
+    def getStats(self):
+        '''
+            events: ENTERs and LEAVEs.
+            naive: how many there'd have been with the plain in-range test.
+            removed: the difference - redundant presses and releases we didn't do.
+        '''
+        return {"events": self._events, "naive": self._naiveFlips,
+                "removed": self._naiveFlips - self._events}
@@ -0,0 +1,126 @@
+"""One owner for the I2C bus: a queue of sensor reads, the most important first.
+
+Both VL53L0Xs and the APDS9960 share the one bus. Rather than have each task use its sensor
+whenever it likes, tasks submit() a request - a read function, and what to do with the result -
+and service() runs the waiting requests in priority order, so the pitch sensor always goes first.
+A request for a read that's already waiting is merged with it: the read is done once,
+and everybody who asked for it gets the result.
+
+The drivers still do their own register transfers; what we control is which device gets the bus,
+when, and how often.
+
+getStats() says how busy the bus was (utilization - so, how much headroom we have),
+how deep the queue got, and how many requests were merged away.
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+import time
+
+
+class _Request:
+    '''A read, by name. There's one of these per name, made the first time it's asked for, and reused.'''
+    def __init__(self, name, priority, read):
+        self.name = name
+        self.priority = priority
+        self.read = read
+        self.waiting = False
+        self.callbacks = []
+        self.spare = []     # swapped with 'callbacks' while they're being called
+        self.count = 0
+        self.busyNS = 0
+
+
+class I2CScheduler:
+    '''Queue and run reads on 'i2c', highest priority first. 'frequency' is just for the report.'''
+    def __init__(self, i2c, frequency=100000):
+        self._i2c = i2c
+        self._frequency = frequency
+        self._requests = {}
+        self._queue = []
+
+        self._startNS = time.monotonic_ns()
+        self._busyNS = 0
+        self._submitted = 0
+        self._merged = 0
+        self._services = 0
+        self._depthTotal = 0
+        self._maxDepth = 0
+
+    def getI2C(self):
+        return self._i2c
+
+    def submit(self, name, priority, read, done=None):
+        '''
+            Ask for read() to be run on the bus; done(result) gets called with what it returns.
+            If a read called 'name' is already waiting, this one just waits for that.
+        '''
+        self._submitted += 1
+        req = self._requests.get(name)
+        if req is None:
+            req = _Request(name, priority, read)
+            self._requests[name] = req
+
+        if done is not None and done not in req.callbacks:
+            req.callbacks.append(done)
+        if req.waiting:
+            self._merged += 1
+            return
+        req.waiting = True
+
+        # keep the queue sorted, most important first (it's never long)
+        q = self._queue
+        i = len(q)
+        while i > 0 and q[i-1].priority < req.priority:
+            i -= 1
+        q.insert(i, req)
+
+    def service(self) -> int:
+        '''Run everything that's waiting, in priority order. Returns how many reads that was.'''
+        q = self._queue
+        depth = len(q)
+        if depth == 0:
+            return 0
+        self._services += 1
+        self._depthTotal += depth
+        if depth > self._maxDepth:
+            self._maxDepth = depth
+
+        ran = 0
+        while q:
+            req = q.pop(0)
+            req.waiting = False
+            t0 = time.monotonic_ns()
+            result = req.read()
+            t = time.monotonic_ns() - t0
+            req.count += 1
+            req.busyNS += t
+            self._busyNS += t
+            ran += 1
+
+            # callbacks aren't bus time (and may well submit() again)
+            callbacks = req.callbacks
+            req.callbacks, req.spare = req.spare, callbacks
+            for done in callbacks:
+                done(result)
+            callbacks.clear()
+        return ran
+
+    def getQueueDepth(self):
+        return len(self._queue)
+
+    def getStats(self):
+        '''
+            utilization: percent of the time since we started that a read had the bus.
+            meanDepth/maxDepth: how many requests were waiting, each time service() found any.
+            perDevice: {name: [reads, percent of the time on the bus]}
+        '''
+        elapsed = max(1, time.monotonic_ns() - self._startNS)
+        perDevice = {}
+        for name, req in self._requests.items():
+            perDevice[name] = [req.count, round(100 * req.busyNS / elapsed, 1)]
+        return {"frequency": self._frequency,
+                "utilization": round(100 * self._busyNS / elapsed, 1),
+                "submitted": self._submitted, "merged": self._merged,
+                "meanDepth": round(self._depthTotal / max(1, self._services), 2),
+                "maxDepth": self._maxDepth,
+                "perDevice": perDevice}
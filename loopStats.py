@@ -0,0 +1,87 @@
+"""Timing statistics for the Featheremin's tasks.
+
+The task runner (see taskRunner.py) calls addSample(task, micros) each time a task runs;
+anything else worth timing - like sensorToSound, from a reading to the note it plays - uses
+now() for its start and addSample() at the end. At the end, summary() gives
+p50/p95/p99 (and friends) per name, in microseconds, and save() writes it all out as JSON,
+so runs from different commits can be compared.
+
+Works on the Feather and in the host simulator.
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+import json
+import time
+
+
+class NullStats:
+    '''What the tasks use when nobody is measuring: does nothing, quickly.'''
+    def now(self):
+        return 0
+
+    def addSample(self, name, micros):
+        pass
+
+    def addInfo(self, key, value):
+        pass
+
+
+class LoopStats(NullStats):
+    '''Collects per-task (and other named) times, in microseconds.'''
+    def __init__(self):
+        self._samples = {}
+        self._order = []
+        self._info = {}
+
+    def now(self):
+        '''A timestamp, in ns, for measuring things that span tasks.'''
+        return time.monotonic_ns()
+
+    def addSample(self, name, micros):
+        if name not in self._samples:
+            self._samples[name] = []
+            self._order.append(name)
+        self._samples[name].append(micros)
+
+    def addInfo(self, key, value):
+        '''Something else to report - like a sensor's stats - saved along with the timings.'''
+        self._info[key] = value
+
+    def getInfo(self):
+        return self._info
+
+    def summary(self):
+        '''{stage: {"n", "mean", "p50", "p95", "p99", "max"}}, in microseconds.'''
+        result = {}
+        for name in self._order:
+            s = sorted(self._samples[name])
+            result[name] = {
+                "n":    len(s),
+                "mean": sum(s) // len(s),
+                "p50":  percentile(s, 50),
+                "p95":  percentile(s, 95),
+                "p99":  percentile(s, 99),
+                "max":  s[-1],
+                }
+        return result
+
+    def count(self, stage):
+        '''How many samples 'stage' has.'''
+        return len(self._samples.get(stage, ()))
+
+    def printTable(self):
+        print(f"{'stage':>16} {'n':>6} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}   (us)")
+        for name, st in self.summary().items():
+            print(f"{name:>16} {st['n']:6d} {st['mean']:8d} {st['p50']:8d} {st['p95']:8d} {st['p99']:8d} {st['max']:8d}")
+
+    def save(self, path, info=None):
+        '''Write the summary (plus anything in 'info', like the commit or backend) as JSON.'''
+        with open(path, "w") as f:
+            json.dump({"info": info or {}, "extra": self._info, "stages": self.summary()}, f)
+
+
+def percentile(sortedValues, pct):
+    '''Nearest-rank percentile of an already-sorted list.'''
+    if not sortedValues:
+        return 0
+    i = (len(sortedValues) * pct + 99) // 100 - 1
+    return sortedValues[max(0, min(i, len(sortedValues)-1))]
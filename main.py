@@ -10,10 +10,21 @@ supervisor.runtime.autoreload = False  # CirPy 8 and above
 
 DO_MAIN_CODE = True
 
+# Time each import and constructor at boot, and the heap each takes (see bootProfiler.py).
+PROFILE_BOOT = False
+
 # ----------------------------------------------------
 # This runs the main project code:
 if DO_MAIN_CODE:
+    profiler = None
+    if PROFILE_BOOT:
+        import bootProfiler
+        profiler = bootProfiler.BootProfiler()
+        profiler.install()
     import feathereminMain
+    if profiler is not None:
+        profiler.wrapConstructors()
+    feathereminMain.main(profiler=profiler)
     print("Featheremin run done.")
     while True:
         pass
@@ -55,6 +66,14 @@ import test_gestures2
 # import test_display2
 
 # import test_feathereminSynth
+# import bench_synthAlloc
+# import bench_rangeFilter
+# import bench_pitchMap
+# import bench_wavetable
+# import bench_drone
+# import bench_unison
+# import bench_handPresence
+# import record_ranges
 # import test_2_L0X_testbed
 
 # import test_VL53L0X
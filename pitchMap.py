@@ -0,0 +1,101 @@
+"""Map ToF ranges to frequencies, with tables made once at startup.
+
+The old way did r1/5 -> MIDI note -> synthio.midi_to_hz() (an exponential) on every reading, and
+then rounded it for the chromatic scale. A PitchMap works out the quantized scales ahead of time,
+one entry per note, so a reading in one of those costs a table lookup.
+
+Continuous stays with synthio.midi_to_hz(): it's native code on the Feather, and the interpolated
+table we tried instead was slower even on a desktop (see test/bench_pitchMap.py).
+
+LinearMap does the same for the simple "this range of mm to that range of values" mappings,
+clamped, with the arithmetic done up front.
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+import array
+
+import synthio
+
+# Which notes (semitones above the root) are in each scale. None is "all of them, and
+# everything in between" - the thereminy one.
+SCALES = {
+    "Continuous": None,
+    "Chromatic":  (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11),
+    "Major":      (0, 2, 4, 5, 7, 9, 11),
+    "Minor":      (0, 2, 3, 5, 7, 8, 10),
+    "Pentatonic": (0, 2, 4, 7, 9),
+    }
+SCALE_NAMES = ["Continuous", "Chromatic", "Major", "Minor", "Pentatonic"]
+
+
+def midiToHz(midiNote):
+    return 440.0 * 2 ** ((midiNote - 69) / 12)
+
+
+class PitchMap:
+    '''
+        Range (mm) to frequency (Hz), for all the SCALES.
+
+        mmPerNote: how far the hand moves for one semitone.
+        maxNote: the highest MIDI note we'll play; farther than that, we stay there.
+        maxRange: the farthest range we'll be asked about.
+    '''
+    def __init__(self, mmPerNote=5, maxNote=120, maxRange=1000, root=0):
+        self._mmPerNote = mmPerNote
+        self._maxNote = maxNote
+        self._maxRange = maxRange
+
+        # The quantized scales: Hz for each whole note number, snapped down to the nearest note in the scale.
+        self._quantized = {}
+        nNotes = maxRange // mmPerNote + 1
+        for name, degrees in SCALES.items():
+            if degrees is None:
+                continue
+            table = array.array("f", [0.0] * nNotes)
+            for note in range(nNotes):
+                n = min(note, maxNote)
+                while (n - root) % 12 not in degrees:
+                    n -= 1
+                table[note] = midiToHz(n)
+            self._quantized[name] = table
+
+        self.setScale("Continuous")
+
+    def setScale(self, name):
+        self._scale = name
+        self._table = self._quantized.get(name)
+
+    def getScale(self):
+        return self._scale
+
+    def hz(self, mm):
+        '''The frequency for this range, in the current scale.'''
+        if mm < 0:
+            mm = 0
+        elif mm > self._maxRange:
+            mm = self._maxRange
+
+        if self._table is not None:
+            return self._table[int(mm) // self._mmPerNote]
+
+        note = mm / self._mmPerNote
+        if note > self._maxNote:
+            note = self._maxNote
+        return synthio.midi_to_hz(note)
+
+
+class LinearMap:
+    '''Map lowIn..highIn to lowOut..highOut, clamped at the ends.'''
+    def __init__(self, lowIn, highIn, lowOut, highOut):
+        self._lowIn = lowIn
+        self._highIn = highIn
+        self._lowOut = lowOut
+        self._highOut = highOut
+        self._slope = (highOut - lowOut) / (highIn - lowIn)
+
+    def map(self, value):
+        if value <= self._lowIn:
+            return self._lowOut
+        if value >= self._highIn:
+            return self._highOut
+        return self._lowOut + (value - self._lowIn) * self._slope
@@ -0,0 +1,167 @@
+"""Smoothing filters for ToF range readings, to take the wobble out of the pitch.
+
+Each filter has filter(mm, nowNS) -> mm and reset(). A RangeFilter chains them:
+first an OutlierGate (so "no target" glitches don't get smoothed into the pitch), then any of
+MedianFilter, ExpSmoothing (like the 'knobfilter' in test/eightiesArp.py) and OneEuroFilter.
+
+Everything is allocated up front; filtering a sample allocates nothing (bar float results).
+See test/bench_rangeFilter.py for what each one costs per sample.
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+import array
+import math
+
+# What a VL53L0X reports when there's nothing in front of it.
+NO_TARGET = 8190
+
+
+def isNoTarget(mm):
+    return mm <= 0 or mm >= NO_TARGET
+
+
+class OutlierGate:
+    '''
+        Hides short runs of "no target" readings (0 or 8190) while a hand is present,
+        by repeating the last good reading - the VL53L0X throws the odd one of these.
+        More than maxHold in a row, and we believe it: the hand has gone.
+    '''
+    def __init__(self, maxHold=2):
+        self._maxHold = maxHold
+        self._held = 0
+        self._last = NO_TARGET
+
+    def filter(self, mm, nowNS):
+        if not isNoTarget(mm):
+            self._held = 0
+            self._last = mm
+            return mm
+        if self._held < self._maxHold and not isNoTarget(self._last):
+            self._held += 1
+            return self._last
+        self._last = mm
+        return mm
+
+    def reset(self):
+        self._held = 0
+        self._last = NO_TARGET
+
+
+class MedianFilter:
+    '''Median of the last n readings; kills single-sample spikes. n should be odd, and small.'''
+    def __init__(self, n=3):
+        self._n = n
+        self._ring = array.array("i", [0] * n)
+        self._sorted = array.array("i", [0] * n)
+        self.reset()
+
+    def filter(self, mm, nowNS):
+        self._ring[self._next] = mm
+        self._next = (self._next + 1) % self._n
+        if self._count < self._n:
+            self._count += 1
+
+        # insertion sort of what we have, into the scratch array
+        s = self._sorted
+        for i in range(self._count):
+            v = self._ring[i]
+            j = i
+            while j > 0 and s[j-1] > v:
+                s[j] = s[j-1]
+                j -= 1
+            s[j] = v
+        return s[self._count // 2]
+
+    def reset(self):
+        self._next = 0
+        self._count = 0
+
+
+class ExpSmoothing:
+    '''Exponential smoothing: keep 'factor' of the old value, and mix in the rest of the new one.'''
+    def __init__(self, factor=0.75):
+        self._factor = factor
+        self.reset()
+
+    def filter(self, mm, nowNS):
+        if self._value is None:
+            self._value = mm
+        else:
+            self._value = self._value * self._factor + (1 - self._factor) * mm
+        return self._value
+
+    def reset(self):
+        self._value = None
+
+
+class OneEuroFilter:
+    '''
+        The "1 Euro filter" (Casiez, Roussel & Vogel, 2012): heavy smoothing when the hand is
+        still (no jitter), light smoothing when it moves (no lag). The cutoff frequency goes up
+        with the speed of the hand: cutoff = minCutoff + beta * speed.
+
+        minCutoff: Hz; lower is smoother when still.
+        beta: how fast the cutoff rises with speed (in mm/s); higher is less laggy when moving.
+    '''
+    def __init__(self, minCutoff=1.0, beta=0.01, dCutoff=1.0):
+        self._minCutoff = minCutoff
+        self._beta = beta
+        self._dCutoff = dCutoff
+        self.reset()
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, mm, nowNS):
+        if self._x is None:
+            self._x = mm
+            self._lastNS = nowNS
+            return mm
+        dt = (nowNS - self._lastNS) / 1000000000
+        if dt <= 0:
+            return self._x
+        self._lastNS = nowNS
+
+        dx = (mm - self._x) / dt
+        a = self._alpha(self._dCutoff, dt)
+        self._dx = a * dx + (1 - a) * self._dx
+
+        cutoff = self._minCutoff + self._beta * abs(self._dx)
+        a = self._alpha(cutoff, dt)
+        self._x = a * mm + (1 - a) * self._x
+        return self._x
+
+    def reset(self):
+        self._x = None
+        self._dx = 0.0
+        self._lastNS = 0
+
+
+class RangeFilter:
+    '''
+        An OutlierGate followed by a chain of smoothing filters.
+        "No target" readings that get through the gate are passed straight out, and reset the
+        smoothing, so when the hand comes back the pitch starts from where it is, not where it was.
+    '''
+    def __init__(self, smoothers=(), maxHold=2):
+        self._gate = OutlierGate(maxHold)
+        self._smoothers = tuple(smoothers)
+
+    def filter(self, mm, nowNS):
+        mm = self._gate.filter(mm, nowNS)
+        if isNoTarget(mm):
+            self.resetSmoothers()
+            return mm
+        for s in self._smoothers:
+            mm = s.filter(mm, nowNS)
+        return mm
+
+    def resetSmoothers(self):
+        for s in self._smoothers:
+            s.reset()
+
+    def reset(self):
+        self._gate.reset()
+        self.resetSmoothers()
@@ -0,0 +1,61 @@
+"""Which sensors does anything need right now? Read only those, and let the rest stand by.
+
+The secondary ToF used to be read whenever a hand was over the pitch sensor - even with the LFO off,
+and nothing using r2. Now each feature says which sensors it reads (declare()), the app says which
+features are on (setActive()), and the loop asks needs() before it reads a sensor.
+
+When a sensor goes from needed to not needed, or back, its onChange() callbacks are called -
+to put it into standby, say, and wake it up again.
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+
+
+class SensorDemand:
+    '''Features, the sensors they read, and which features are on.'''
+    def __init__(self):
+        self._reads = {}        # feature: (sensor, ...)
+        self._active = {}       # feature: bool
+        self._needed = {}       # sensor: bool, worked out when something changes
+        self._listeners = {}    # sensor: [callback(needed)]
+        self._changes = 0
+
+    def declare(self, feature, sensors, active=False) -> None:
+        '''Feature 'feature' reads 'sensors' (names), when it's on.'''
+        self._reads[feature] = tuple(sensors)
+        for s in sensors:
+            if s not in self._needed:
+                self._needed[s] = False
+                self._listeners[s] = []
+        self._active[feature] = False
+        self.setActive(feature, active)
+
+    def onChange(self, sensor, callback) -> None:
+        '''callback(needed) when 'sensor' starts or stops being needed.'''
+        self._listeners[sensor].append(callback)
+
+    def setActive(self, feature, active=True) -> None:
+        if self._active[feature] == active:
+            return
+        self._active[feature] = active
+
+        for sensor in self._reads[feature]:
+            needed = False
+            for f, sensors in self._reads.items():
+                if self._active[f] and sensor in sensors:
+                    needed = True
+                    break
+            if needed != self._needed[sensor]:
+                self._needed[sensor] = needed
+                self._changes += 1
+                for callback in self._listeners[sensor]:
+                    callback(needed)
+
+    def needs(self, sensor) -> bool:
+        '''Does anything that's on read 'sensor'? (Just a lookup.)'''
+        return self._needed[sensor]
+
+    def getStats(self):
+        return {"needed": [s for s, n in self._needed.items() if n],
+                "active": [f for f, a in self._active.items() if a],
+                "changes": self._changes}
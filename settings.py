@@ -0,0 +1,46 @@
+"""Settings that outlive a run, kept in a little JSON file: settings.json, next to the code.
+
+get() reads them (the file's read the first time anybody asks); set() changes one, in memory;
+save() writes them all back.
+
+On the Feather, CircuitPython code can't write to the CIRCUITPY drive unless boot.py has
+remounted it (storage.remount("/", readonly=False)) - and then the computer can't. If we can't
+write the file, save() says so and returns False, and the settings last just this run.
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+import json
+
+SETTINGS_PATH = "settings.json"
+
+_settings = None
+
+
+def _load():
+    global _settings
+    if _settings is None:
+        try:
+            with open(SETTINGS_PATH, "r") as f:
+                _settings = json.load(f)
+        except (OSError, ValueError):
+            _settings = {}
+    return _settings
+
+
+def get(key, default=None):
+    return _load().get(key, default)
+
+
+def set(key, value) -> None:
+    _load()[key] = value
+
+
+def save() -> bool:
+    '''Write the settings out. False if we couldn't (read-only filesystem?).'''
+    try:
+        with open(SETTINGS_PATH, "w") as f:
+            json.dump(_load(), f)
+        return True
+    except OSError as e:
+        print(f"*** Can't save {SETTINGS_PATH}: {e}")
+        return False
@@ -0,0 +1,159 @@
+"""Host-side simulator for the Featheremin.
+
+Lets feathereminMain (and friends) run on a desktop computer with no Feather attached.
+install() puts stand-ins for the CircuitPython built-ins (board, synthio, displayio, ...)
+and the Adafruit drivers we use (adafruit_vl53l0x, adafruit_apds9960, ...) into sys.modules,
+so the real project code imports and runs unchanged.
+
+What you get instead of hardware:
+    - ToF sensors that play back scripted, recorded or synthetic range streams (see streams.py)
+    - an APDS9960 with a gesture event queue
+    - a synthio that renders Note state to PCM with NumPy, which audiobusio writes to a WAV file
+    - a headless ILI9341 framebuffer
+    - an I2C bus that counts transactions, so we can see what the drivers cost
+
+Use it like this (before importing any project modules):
+
+    import sim
+    sim.install(sim.Scenario(pitch=sim.streams.HandSweep(), wavPath="out.wav"))
+    import feathereminMain
+    feathereminMain.main(seconds=5)
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+import gc
+import importlib
+import sys
+import time
+import types
+
+from sim import streams
+
+
+# Multiply all modelled hardware delays (ToF measurements, etc.) by this.
+# 1.0 is real time; smaller makes simulations go faster, but less like the real thing.
+TIME_SCALE = 1.0
+
+# Nominal RP2040 CircuitPython heap, so gc.mem_free() gives plausible numbers.
+HEAP_SIZE = 192 * 1024
+
+# The stand-in modules, and the real names they stand in for.
+_STAND_INS = {
+    "board":                        "sim.board",
+    "busio":                        "sim.busio",
+    "digitalio":                    "sim.digitalio",
+    "microcontroller":              "sim.microcontroller",
+    "supervisor":                   "sim.supervisor",
+    "synthio":                      "sim.synthio",
+    "audiobusio":                   "sim.audiobusio",
+    "audiomixer":                   "sim.audiomixer",
+    "audiocore":                    "sim.audiocore",
+    "displayio":                    "sim.displayio",
+    "terminalio":                   "sim.terminalio",
+    "adafruit_ili9341":             "sim.adafruit_ili9341",
+    "adafruit_vl53l0x":             "sim.adafruit_vl53l0x",
+    "adafruit_apds9960":            "sim.adafruit_apds9960",
+    "adafruit_apds9960.apds9960":   "sim.adafruit_apds9960.apds9960",
+    "adafruit_display_text":        "sim.adafruit_display_text",
+    "adafruit_display_text.label":  "sim.adafruit_display_text.label",
+    "adafruit_wave":                "wave", # the same API as CPython's own
+}
+
+
+class Scenario:
+    '''What the simulated world looks like.
+
+    pitch, secondary: range streams (see streams.py) for the 'A' (pitch) and 'B' ToF sensors.
+    gestures: (seconds, gesture code) pairs; the code is what APDS9960.gesture() returns
+        (1 down, 2 up, 3 left, 4 right).
+    wavPath: if given, everything the synth plays is written here.
+    bAddress: the I2C address the 'B' sensor starts at - 0x29 from power-up,
+        or 0x30 if we pretend a previous run already moved it.
+    zones: range streams for more VL53L0Xs, for a sensor array (see tofArray.py); the first
+        has its XSHUT on board.ZONE_XSHUT_PINS[0], and so on.
+    '''
+    def __init__(self, pitch=None, secondary=None, gestures=(), wavPath=None, bAddress=0x29, zones=()):
+        self.pitch = pitch if pitch is not None else streams.HandSweep()
+        self.secondary = secondary if secondary is not None else streams.Constant(200)
+        self.gestures = gestures
+        self.wavPath = wavPath
+        self.bAddress = bAddress
+        self.zones = zones
+
+
+# The installed scenario, and when it started.
+scenario = None
+_startTime = 0.0
+_trackMemory = False
+
+
+def install(newScenario=None, trackMemory=False):
+    '''Make the stand-ins importable under their real names. Safe to call more than once;
+    the first call wins, so a test script can install its own Scenario before the project does.
+
+    trackMemory: make gc.mem_alloc()/gc.mem_free() report real Python heap use (via tracemalloc).
+        That slows everything down, so it's off unless you need it.
+    '''
+    global scenario, _startTime, _trackMemory
+    if scenario is not None:
+        return
+    scenario = newScenario if newScenario is not None else Scenario()
+    _startTime = time.monotonic()
+
+    # CircuitPython's ulab.numpy is (mostly) a subset of NumPy.
+    import numpy
+    ulab = types.ModuleType("ulab")
+    ulab.numpy = numpy
+    sys.modules["ulab"] = ulab
+    sys.modules["ulab.numpy"] = numpy
+
+    for realName, simName in _STAND_INS.items():
+        sys.modules[realName] = importlib.import_module(simName)
+
+    # CircuitPython's gc has mem_free() and mem_alloc(); CPython's doesn't.
+    _trackMemory = trackMemory
+    if trackMemory:
+        import tracemalloc
+        tracemalloc.start()
+    gc.mem_alloc = _memAlloc
+    gc.mem_free = _memFree
+
+    # Put the simulated hardware on the bus.
+    sys.modules["board"]._populate(scenario)
+
+
+def _memAlloc():
+    if not _trackMemory:
+        return 0
+    import tracemalloc
+    return tracemalloc.get_traced_memory()[0]
+
+def _memFree():
+    return HEAP_SIZE - _memAlloc()
+
+
+def elapsed():
+    '''Seconds since install() - the simulated world's clock.'''
+    return time.monotonic() - _startTime
+
+def sleep(seconds):
+    '''Wait for a modelled hardware delay.'''
+    if seconds > 0:
+        time.sleep(seconds * TIME_SCALE)
+
+
+def pushGesture(code):
+    '''Queue a gesture for the APDS9960, as if a hand had just swiped.'''
+    sys.modules["board"]._apdsChip.queueGesture(code)
+
+def bus():
+    '''The simulated I2C bus the project is using, for its transaction counters.'''
+    return sys.modules["busio"].lastI2C
+
+def screen():
+    '''The simulated ILI9341, if the project made one.'''
+    return sys.modules["adafruit_ili9341"].lastDisplay
+
+def audioOut():
+    '''The simulated I2S output, if the project made one.'''
+    return sys.modules["audiobusio"].lastOutput
@@ -0,0 +1 @@
+"""Stand-in for the adafruit_apds9960 package."""
@@ -0,0 +1,90 @@
+"""Stand-in for adafruit_apds9960.apds9960, plus the simulated gesture sensor chip.
+
+Gestures come from a queue: the scenario's timed list, plus anything pushed with sim.pushGesture().
+A hand is "near" while a gesture is waiting; with the proximity interrupt on, that pulls INT low.
+"""
+import sim
+
+DEFAULT_ADDRESS = 0x39
+
+
+class SimAPDS9960Chip:
+    def __init__(self, timedGestures=(), intPin=None):
+        self.address = DEFAULT_ADDRESS
+        self.enabled = True
+        self.interruptEnabled = False
+        self._timed = sorted(timedGestures)
+        self._queue = []
+        if intPin is not None:
+            intPin._source = self.intLevel
+
+    def intLevel(self):
+        '''The INT pin: open-drain, active low.'''
+        return not (self.interruptEnabled and self.hasGesture())
+
+    def queueGesture(self, code):
+        self._queue.append(code)
+
+    def _due(self):
+        '''Move any timed gestures whose time has come into the queue.'''
+        now = sim.elapsed()
+        while self._timed and self._timed[0][0] <= now:
+            self._queue.append(self._timed.pop(0)[1])
+
+    def hasGesture(self):
+        self._due()
+        return len(self._queue) > 0
+
+    def takeGesture(self):
+        self._due()
+        return self._queue.pop(0) if self._queue else 0
+
+
+class APDS9960:
+    def __init__(self, i2c, *, address=DEFAULT_ADDRESS, reset=True, rotation=0):
+        self._i2c = i2c
+        self._chip = i2c._deviceAt(address)
+        if self._chip is None:
+            raise ValueError(f"No I2C device at address: {hex(address)}")
+        self._address = address
+        self._i2c._transaction(address, 2, count=20)
+        self.enable_proximity = False
+        self.enable_gesture = False
+        self.enable_color = False
+        self.rotation = rotation
+        self._threshold = (0, 0, 0)
+
+    @property
+    def enable_proximity_interrupt(self):
+        return self._chip.interruptEnabled
+
+    @enable_proximity_interrupt.setter
+    def enable_proximity_interrupt(self, value):
+        self._i2c._transaction(self._address, 2, count=2)
+        self._chip.interruptEnabled = value
+
+    @property
+    def proximity_interrupt_threshold(self):
+        return self._threshold
+
+    @proximity_interrupt_threshold.setter
+    def proximity_interrupt_threshold(self, setting):
+        self._i2c._transaction(self._address, 2, count=3)
+        self._threshold = setting
+
+    def clear_interrupt(self):
+        self._i2c._transaction(self._address, 1)
+
+    @property
+    def proximity(self):
+        self._i2c._transaction(self._address, 2)
+        return 255 if self._chip.hasGesture() else 0
+
+    def gesture(self):
+        '''Like the real driver: status, then FIFO level, then (if anything's there) the FIFO itself.'''
+        self._i2c._transaction(self._address, 2, count=3)
+        if not self._chip.hasGesture():
+            return 0
+        # a gesture is a few FIFO datasets of 4 bytes each
+        self._i2c._transaction(self._address, 1 + 4*8, count=4)
+        return self._chip.takeGesture()
@@ -0,0 +1,22 @@
+"""Stand-in for adafruit_display_text.label."""
+from sim import displayio
+
+
+class Label(displayio.Group):
+    def __init__(self, font, *, text="", color=0xFFFFFF, x=0, y=0, scale=1, **kwargs):
+        super().__init__(scale=scale, x=x, y=y)
+        self.font = font
+        self.color = color
+        self._text = text
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, newText):
+        # The real Label rebuilds its glyph tiles, and dirties the area of the old and new text.
+        oldLen = len(self._text)
+        self._text = newText
+        area = max(oldLen, len(newText)) * self.font.width * self.font.height
+        displayio._changed(area)
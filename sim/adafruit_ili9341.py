@@ -0,0 +1,85 @@
+"""Stand-in for adafruit_ili9341: a headless framebuffer.
+
+Refreshing paints the solid-colour TileGrids into 'framebuffer' (a NumPy array of 0xRRGGBB)
+and takes as long as pushing the dirty pixels over SPI would. Text isn't rasterized;
+text() returns what the labels say, in display order.
+"""
+import numpy
+
+from sim import displayio
+import sim
+from sim.adafruit_display_text.label import Label
+
+# the last display made, for sim.screen()
+lastDisplay = None
+
+
+class ILI9341:
+    def __init__(self, bus, *, width=240, height=320, rotation=0, **kwargs):
+        global lastDisplay
+        self._bus = bus
+        self.width = width
+        self.height = height
+        self.rotation = rotation
+        self.auto_refresh = True
+        self.framebuffer = numpy.zeros((height, width), dtype=numpy.uint32)
+        self._root = None
+        self._dirtyPixels = 0
+        self.refreshes = 0
+        self.pixelsPushed = 0
+        lastDisplay = self
+
+    @property
+    def root_group(self):
+        return self._root
+
+    @root_group.setter
+    def root_group(self, group):
+        self.show(group)
+
+    def show(self, group):
+        self._root = group
+        displayio._activeDisplay = self
+        self._dirty(self.width * self.height)
+
+    def _dirty(self, pixels):
+        # text areas are drawn at scale 2 in our layouts
+        self._dirtyPixels += pixels * 4
+        if self.auto_refresh:
+            self.refresh()
+
+    def refresh(self, *, target_frames_per_second=None, minimum_frames_per_second=0):
+        pixels = min(self._dirtyPixels, self.width * self.height)
+        self._dirtyPixels = 0
+        if pixels == 0:
+            return True
+        self.refreshes += 1
+        self.pixelsPushed += pixels
+        sim.sleep(pixels * 16 / self._bus.baudrate)
+        self._paint(self._root, 0, 0)
+        return True
+
+    def _paint(self, group, x, y):
+        if group is None:
+            return
+        for item in group:
+            if isinstance(item, displayio.TileGrid):
+                bx, by = x + item.x, y + item.y
+                self.framebuffer[by:by+item.bitmap.height, bx:bx+item.bitmap.width] = item.pixel_shader[0]
+            elif isinstance(item, displayio.Group) and not isinstance(item, Label):
+                self._paint(item, x + item.x, y + item.y)
+
+    def text(self):
+        '''The text of every label on the screen.'''
+        found = []
+        self._collectText(self._root, found)
+        return found
+
+    def _collectText(self, group, found):
+        if group is None:
+            return
+        for item in group:
+            if isinstance(item, Label):
+                found.append(item.text)
+            elif isinstance(item, displayio.Group):
+                self._collectText(item, found)
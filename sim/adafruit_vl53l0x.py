@@ -0,0 +1,136 @@
+"""Stand-in for the adafruit_vl53l0x driver, plus the simulated sensor chip behind it.
+
+Ranges come from the chip's stream (see streams.py); a measurement takes the timing budget,
+and costs the bus about what the real driver costs it - including the status polling
+while it waits.
+
+In continuous mode, the chip finishes a new measurement every timing budget,
+back to back, and data_ready says whether there's one we haven't read yet.
+do_range_measurement() starts a single one, without waiting; data_ready says when it's done.
+"""
+import sim
+
+DEFAULT_ADDRESS = 0x29
+
+
+class SimVL53L0XChip:
+    '''The sensor itself, sitting on the bus. XSHUT low turns it off and forgets its address.'''
+    def __init__(self, stream, address=DEFAULT_ADDRESS, xshutPin=None):
+        self.stream = stream
+        self.address = address
+        self.enabled = True
+        self.budgetMicros = 33000
+        self.continuousSince = None # when continuous mode started, if it's on
+        self.lastTaken = -1         # which continuous measurement we read last
+        self.singleSince = None     # when a do_range_measurement() started, if one's going
+        if xshutPin is not None:
+            xshutPin._listeners.append(self._xshut)
+
+    def _xshut(self, value):
+        if value and not self.enabled:
+            self.address = DEFAULT_ADDRESS
+            self.continuousSince = None
+            self.singleSince = None
+        self.enabled = value
+
+    def singleDone(self):
+        return self.singleSince is not None and (
+            sim.elapsed() - self.singleSince >= self.budgetMicros / 1000000 * sim.TIME_SCALE)
+
+    def measurementsDone(self):
+        '''How many continuous-mode measurements have finished so far.'''
+        return int((sim.elapsed() - self.continuousSince) / (self.budgetMicros / 1000000 * sim.TIME_SCALE))
+
+    def measure(self):
+        return self.stream.next(sim.elapsed())
+
+
+class VL53L0X:
+    def __init__(self, i2c, address=DEFAULT_ADDRESS, io_timeout_s=0):
+        self._i2c = i2c
+        self._chip = i2c._deviceAt(address)
+        if self._chip is None:
+            raise ValueError(f"No I2C device at address: {hex(address)}")
+        self._address = address
+
+        # the real init sequence: SPAD setup, tuning settings, calibration...
+        self._i2c._transaction(address, 2, count=150)
+        sim.sleep(0.05)
+
+    @property
+    def measurement_timing_budget(self):
+        return self._chip.budgetMicros
+
+    @measurement_timing_budget.setter
+    def measurement_timing_budget(self, budget_us):
+        assert budget_us >= 20000, "Budget must be >= 20000 us"
+        self._i2c._transaction(self._address, 3, count=12)
+        self._chip.budgetMicros = budget_us
+
+    @property
+    def is_continuous_mode(self):
+        return self._chip.continuousSince is not None
+
+    def start_continuous(self):
+        self._i2c._transaction(self._address, 2, count=8)
+        self._chip.continuousSince = sim.elapsed()
+        self._chip.lastTaken = -1
+
+    def stop_continuous(self):
+        self._i2c._transaction(self._address, 2, count=6)
+        self._chip.continuousSince = None
+
+    def do_range_measurement(self):
+        '''Start a single-shot measurement, and don't wait for it.'''
+        self._i2c._transaction(self._address, 2, count=4)
+        self._chip.singleSince = sim.elapsed()
+
+    @property
+    def data_ready(self):
+        self._i2c._transaction(self._address, 3)
+        if self._chip.continuousSince is None:
+            return self._chip.singleDone()
+        return self._chip.measurementsDone() - 1 > self._chip.lastTaken
+
+    def set_address(self, new_address):
+        self._i2c._transaction(self._address, 2)
+        self._chip.address = new_address
+        self._address = new_address
+
+    @property
+    def range(self):
+        return self.read_range()
+
+    def read_range(self):
+        '''A single-shot measurement; or, in continuous mode, the next one to finish.'''
+        budget = self._chip.budgetMicros / 1000000
+
+        if self._chip.continuousSince is not None:
+            chip = self._chip
+            # wait for a measurement we haven't read (polling, like the real driver)
+            while chip.measurementsDone() - 1 <= chip.lastTaken:
+                self._i2c._transaction(self._address, 3)
+            chip.lastTaken = chip.measurementsDone() - 1
+            self._i2c._transaction(self._address, 3)
+            self._i2c._transaction(self._address, 2)
+            return chip.measure()
+
+        # started with do_range_measurement(), and finished? Then just read it.
+        if self._chip.singleDone():
+            self._chip.singleSince = None
+            self._i2c._transaction(self._address, 3)
+            self._i2c._transaction(self._address, 2)
+            return self._chip.measure()
+
+        # start it...
+        self._i2c._transaction(self._address, 2, count=4)
+
+        # ...poll the status register until it's done...
+        polls = max(1, int(budget / self._i2c._transactionSeconds(3)))
+        self._i2c._transaction(self._address, 3, count=polls, wait=False)
+        sim.sleep(budget)
+
+        # ...then read the result and clear the interrupt.
+        self._i2c._transaction(self._address, 3)
+        self._i2c._transaction(self._address, 2)
+        return self._chip.measure()
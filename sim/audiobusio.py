@@ -0,0 +1,81 @@
+"""Stand-in for CircuitPython's 'audiobusio'.
+
+An I2SOut that's playing something pulls audio from it on a background thread, in real time,
+the way the Feather's DMA does, and writes it to the scenario's WAV file (if it has one).
+If the thread falls so far behind that the output buffer would have run dry,
+that's counted as an underrun - the glitch you'd hear on the real thing.
+"""
+import threading
+import time
+import wave
+
+import sim
+
+CHUNK_FRAMES = 256
+
+# the last I2SOut made, for sim.audioOut()
+lastOutput = None
+
+
+class I2SOut:
+    def __init__(self, bit_clock, word_select, data, *, left_justified=False):
+        global lastOutput
+        self._sample = None
+        self._thread = None
+        self._running = False
+        self._wav = None
+        self.underruns = 0
+        self.framesPlayed = 0
+        lastOutput = self
+
+    @property
+    def playing(self):
+        return self._sample is not None
+
+    def play(self, sample, *, loop=False):
+        self.stop()
+        self._sample = sample
+        if sim.scenario.wavPath:
+            self._wav = wave.open(sim.scenario.wavPath, "wb")
+            self._wav.setnchannels(sample.channel_count)
+            self._wav.setsampwidth(2)
+            self._wav.setframerate(sample.sample_rate)
+        self._running = True
+        self._thread = threading.Thread(target=self._pump, daemon=True)
+        self._thread.start()
+
+    def _bufferFrames(self):
+        # a Mixer has a buffer; a Synthesizer played directly just has its own block
+        return getattr(self._sample, "bufferFrames", CHUNK_FRAMES)
+
+    def _pump(self):
+        rate = self._sample.sample_rate
+        t0 = time.monotonic()
+        produced = 0
+        while self._running:
+            played = int((time.monotonic() - t0) / sim.TIME_SCALE * rate)
+            if produced < played:
+                # the buffer ran dry before we refilled it
+                self.underruns += 1
+                produced = played
+            if produced - played < self._bufferFrames():
+                pcm = self._sample._render(CHUNK_FRAMES)
+                produced += CHUNK_FRAMES
+                self.framesPlayed += CHUNK_FRAMES
+                if self._wav is not None:
+                    self._wav.writeframes(pcm.tobytes())
+            else:
+                time.sleep(CHUNK_FRAMES / rate / 2 * sim.TIME_SCALE)
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+        self._sample = None
+
+    def deinit(self):
+        self.stop()
@@ -0,0 +1,46 @@
+"""Stand-in for CircuitPython's 'audiomixer'."""
+import numpy
+
+
+class MixerVoice:
+    def __init__(self):
+        self.level = 1.0
+        self._sample = None
+
+    def play(self, sample, *, loop=False):
+        self._sample = sample
+
+    def stop(self):
+        self._sample = None
+
+    @property
+    def playing(self):
+        return self._sample is not None
+
+
+class Mixer:
+    def __init__(self, *, voice_count=2, buffer_size=1024, channel_count=2,
+                 bits_per_sample=16, samples_signed=True, sample_rate=8000):
+        self.voice = [MixerVoice() for _ in range(voice_count)]
+        self.buffer_size = buffer_size
+        self.channel_count = channel_count
+        self.sample_rate = sample_rate
+
+    @property
+    def bufferFrames(self):
+        '''
+            How many frames of audio can be waiting. Like CircuitPython's, the mixer has two buffers of
+            buffer_size bytes - one playing while the other's filled - so that's two of them.
+        '''
+        return 2 * self.buffer_size // (self.channel_count * 2)
+
+    @property
+    def playing(self):
+        return any(v.playing for v in self.voice)
+
+    def _render(self, nframes):
+        mix = numpy.zeros(nframes * self.channel_count, dtype=numpy.float64)
+        for v in self.voice:
+            if v._sample is not None:
+                mix += v._sample._render(nframes) * v.level
+        return numpy.clip(mix, -32767, 32767).astype(numpy.int16)
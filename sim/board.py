@@ -0,0 +1,79 @@
+"""Stand-in for CircuitPython's 'board': Feather RP2040 pin names, and the buses.
+
+The simulated devices are put on the I2C bus by _populate(), called from sim.install().
+"""
+import sim
+
+
+class Pin:
+    '''
+        A GPIO pin. Things that care (like a VL53L0X's XSHUT input) can listen for changes;
+        a device output (like the APDS9960's INT) can drive it, by setting _source.
+    '''
+    def __init__(self, name):
+        self.name = name
+        self.value = True
+        self._listeners = []
+        self._source = None
+
+    def _read(self):
+        return self._source() if self._source is not None else self.value
+
+    def _set(self, value):
+        self.value = value
+        for listener in self._listeners:
+            listener(value)
+
+    def __repr__(self):
+        return f"board.{self.name}"
+
+
+A0, A1, A2, A3 = Pin("A0"), Pin("A1"), Pin("A2"), Pin("A3")
+D4, D5, D6, D9, D10, D11, D12, D13, D24, D25 = (Pin("D4"), Pin("D5"), Pin("D6"), Pin("D9"),
+    Pin("D10"), Pin("D11"), Pin("D12"), Pin("D13"), Pin("D24"), Pin("D25"))
+SCL, SDA = Pin("SCL"), Pin("SDA")
+SCK, MOSI, MISO = Pin("SCK"), Pin("MOSI"), Pin("MISO")
+NEOPIXEL = Pin("NEOPIXEL")
+
+# XSHUT pins for the scenario's extra 'zone' sensors
+ZONE_XSHUT_PINS = (D6, D12, D13, D24, D25)
+
+_i2c = None
+_spi = None
+_apdsChip = None
+
+
+def STEMMA_I2C():
+    return _i2c
+
+def I2C():
+    return _i2c
+
+def SPI():
+    global _spi
+    if _spi is None:
+        import busio
+        _spi = busio.SPI(SCK, MOSI, MISO)
+    return _spi
+
+
+def _populate(scenario):
+    '''Build the I2C bus and wire up the devices the scenario describes.'''
+    global _i2c, _apdsChip
+    import busio
+    from sim.adafruit_vl53l0x import SimVL53L0XChip
+    from sim.adafruit_apds9960.apds9960 import SimAPDS9960Chip
+
+    _i2c = busio.I2C(SCL, SDA)
+
+    # 'A' has its XSHUT wired to D4; 'B' is always on, and may already have been moved to 0x30.
+    _i2c._attach(SimVL53L0XChip(scenario.pitch, xshutPin=D4))
+    _i2c._attach(SimVL53L0XChip(scenario.secondary, address=scenario.bAddress))
+
+    # any more, each with its own XSHUT
+    for stream, pin in zip(scenario.zones, ZONE_XSHUT_PINS):
+        _i2c._attach(SimVL53L0XChip(stream, xshutPin=pin))
+
+    # the APDS9960's INT is wired to D5
+    _apdsChip = SimAPDS9960Chip(scenario.gestures, intPin=D5)
+    _i2c._attach(_apdsChip)
@@ -0,0 +1,89 @@
+"""Stand-in for CircuitPython's 'busio'.
+
+The I2C bus here doesn't move real bytes; the simulated drivers call _transaction()
+for each transfer the real driver would make, and the bus counts them up,
+along with how long they would have kept the wires busy.
+"""
+import sim
+
+# Devices live on the wires, not on a particular I2C object,
+# so two I2C objects on the same pins see the same devices.
+_wires = {}
+
+# the last I2C object made - the one the project is using - for sim.bus()
+lastI2C = None
+
+
+class I2C:
+    def __init__(self, scl, sda, *, frequency=100000, timeout=255):
+        global lastI2C
+        self.frequency = frequency
+        self._devices = _wires.setdefault((scl.name, sda.name), [])
+        self._locked = False
+        self.resetCounters()
+        lastI2C = self
+
+    def resetCounters(self):
+        self.transactions = 0
+        self.bytesMoved = 0
+        self.busySeconds = 0.0
+        self.perAddress = {}
+
+    def _attach(self, chip):
+        self._devices.append(chip)
+
+    def _deviceAt(self, address):
+        '''The one enabled device at this address, or None. Two at once is a bus fight.'''
+        found = [d for d in self._devices if d.enabled and d.address == address]
+        if len(found) > 1:
+            raise OSError(f"I2C bus conflict: {len(found)} devices at {hex(address)}")
+        return found[0] if found else None
+
+    def _transactionSeconds(self, nbytes):
+        # address byte + data, 9 clocks each (8 bits + ack)
+        return (nbytes + 1) * 9 / self.frequency
+
+    def _transaction(self, address, nbytes, count=1, wait=True):
+        '''Account for 'count' transfers of 'nbytes' each to the device at 'address',
+        and take as long as they would (unless the caller is already waiting, with wait=False).'''
+        seconds = self._transactionSeconds(nbytes) * count
+        self.transactions += count
+        self.bytesMoved += nbytes * count
+        self.busySeconds += seconds
+        self.perAddress[address] = self.perAddress.get(address, 0) + count
+        if wait:
+            sim.sleep(seconds)
+
+    # The real busio.I2C API, for code that uses the bus directly.
+    def try_lock(self):
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self):
+        self._locked = False
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        # nobody there: no ACK
+        if self._deviceAt(address) is None:
+            self._transaction(address, 0)
+            raise OSError(19, "No such device")
+        self._transaction(address, len(buffer[start:end]))
+
+    def scan(self):
+        addrs = sorted(set(d.address for d in self._devices if d.enabled))
+        # a scan pokes every address
+        self._transaction(0, 0, count=0x78 - 0x08)
+        return addrs
+
+    def deinit(self):
+        pass
+
+
+class SPI:
+    def __init__(self, clock, MOSI=None, MISO=None):
+        self.frequency = 24000000
+
+    def deinit(self):
+        pass
@@ -0,0 +1,36 @@
+"""Stand-in for CircuitPython's 'digitalio'."""
+
+
+class Direction:
+    INPUT = "input"
+    OUTPUT = "output"
+
+class Pull:
+    UP = "up"
+    DOWN = "down"
+
+
+class DigitalInOut:
+    def __init__(self, pin):
+        self._pin = pin
+        self.direction = Direction.INPUT
+        self.pull = None
+
+    @property
+    def value(self):
+        return self._pin._read()
+
+    @value.setter
+    def value(self, v):
+        self._pin._set(bool(v))
+
+    def switch_to_output(self, value=False):
+        self.direction = Direction.OUTPUT
+        self.value = value
+
+    def switch_to_input(self, pull=None):
+        self.direction = Direction.INPUT
+        self.pull = pull
+
+    def deinit(self):
+        pass
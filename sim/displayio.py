@@ -0,0 +1,52 @@
+"""Stand-in for CircuitPython's 'displayio' - just enough of it for our display classes.
+
+Nothing is drawn when it changes; instead, changes are reported (as a dirty pixel count)
+to the display showing them, which decides when to 'refresh'. See adafruit_ili9341.py.
+"""
+
+# The display that's showing something; label changes get reported to it.
+_activeDisplay = None
+
+
+def release_displays():
+    global _activeDisplay
+    _activeDisplay = None
+
+def _changed(pixels):
+    if _activeDisplay is not None:
+        _activeDisplay._dirty(pixels)
+
+
+class FourWire:
+    def __init__(self, spi_bus, *, command, chip_select, reset=None, baudrate=24000000):
+        self.spi = spi_bus
+        self.baudrate = baudrate
+
+
+class Group(list):
+    def __init__(self, *, scale=1, x=0, y=0):
+        super().__init__()
+        self.scale = scale
+        self.x = x
+        self.y = y
+        self.hidden = False
+
+
+class Bitmap:
+    def __init__(self, width, height, value_count):
+        self.width = width
+        self.height = height
+        self.value_count = value_count
+
+
+class Palette(list):
+    def __init__(self, color_count):
+        super().__init__([0] * color_count)
+
+
+class TileGrid:
+    def __init__(self, bitmap, *, pixel_shader, x=0, y=0):
+        self.bitmap = bitmap
+        self.pixel_shader = pixel_shader
+        self.x = x
+        self.y = y
@@ -0,0 +1,11 @@
+"""Stand-in for CircuitPython's 'microcontroller'."""
+
+
+class _CPU:
+    frequency = 125000000
+    temperature = 25.0
+
+cpu = _CPU()
+
+# The 4K of non-volatile memory. Not saved anywhere; it lasts as long as the process does.
+nvm = bytearray(4096)
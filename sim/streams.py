@@ -0,0 +1,91 @@
+"""Range streams for the simulated ToF sensors.
+
+Each stream answers one question: what does the sensor read, if it finishes a measurement
+at time t (seconds since the simulation started)? Ranges are in mm, as from VL53L0X.range;
+8190 is what a real VL53L0X reports when nothing is in front of it.
+"""
+import math
+
+NO_TARGET = 8190
+
+
+class Constant:
+    '''Always the same range - a hand held perfectly still (or no hand, with NO_TARGET).'''
+    def __init__(self, mm):
+        self._mm = mm
+
+    def next(self, t):
+        return self._mm
+
+
+class ScriptedRanges:
+    '''One value per measurement, in order; repeats from the start if loop is True,
+    else keeps returning the last one.'''
+    def __init__(self, values, loop=True):
+        self._values = list(values)
+        self._loop = loop
+        self._i = 0
+
+    def next(self, t):
+        v = self._values[self._i]
+        self._i += 1
+        if self._i >= len(self._values):
+            self._i = 0 if self._loop else len(self._values) - 1
+        return v
+
+
+class RecordedRanges:
+    '''A recorded trace, played back against the clock.
+
+    The file has one "seconds,mm" pair per line (as printed by test/record_ranges.py);
+    lines starting with # are ignored. The trace loops when it runs out.
+    '''
+    def __init__(self, path):
+        self._times = []
+        self._values = []
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                t, mm = line.split(",")
+                self._times.append(float(t))
+                self._values.append(int(mm))
+        if not self._values:
+            raise ValueError(f"no samples in {path}")
+        self._length = self._times[-1] if self._times[-1] > 0 else 1.0
+        self._i = 0
+
+    def next(self, t):
+        t = t % self._length
+        if t < self._times[self._i]:
+            self._i = 0
+        while self._i+1 < len(self._times) and self._times[self._i+1] <= t:
+            self._i += 1
+        return self._values[self._i]
+
+
+class HandSweep:
+    '''A synthetic hand: comes in, sweeps smoothly between low and high, then leaves.
+
+    period: seconds for one whole in/sweep/out cycle.
+    presentFraction: how much of each period the hand is there at all.
+    jitter: +/- mm of sensor noise, from a cheap deterministic generator (so runs repeat).
+    '''
+    def __init__(self, period=4.0, low=80, high=900, presentFraction=0.75, jitter=3):
+        self._period = period
+        self._low = low
+        self._high = high
+        self._present = presentFraction
+        self._jitter = jitter
+        self._seed = 12345
+
+    def next(self, t):
+        phase = (t % self._period) / self._period
+        if phase >= self._present:
+            return NO_TARGET
+        x = 0.5 - 0.5*math.cos(2*math.pi * phase / self._present)
+        mm = self._low + x*(self._high - self._low)
+        self._seed = (self._seed * 1103515245 + 12345) & 0x7FFFFFFF
+        mm += (self._seed % (2*self._jitter + 1)) - self._jitter
+        return int(mm)
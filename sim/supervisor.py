@@ -0,0 +1,8 @@
+"""Stand-in for CircuitPython's 'supervisor'."""
+
+
+class _Runtime:
+    autoreload = True
+    serial_connected = True
+
+runtime = _Runtime()
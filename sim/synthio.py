@@ -0,0 +1,312 @@
+"""Stand-in for CircuitPython's 'synthio': renders Note state to PCM with NumPy.
+
+Like the real thing, block inputs (LFOs, and plain numbers) are evaluated once per
+256-sample block, oscillators look up their waveform with no interpolation,
+and the default waveform is a square wave.
+Envelopes are linear segments, which is close enough for measuring timing.
+"""
+
+import math
+
+import numpy
+
+BLOCK_SIZE = 256
+
+# the default waveform: a square wave
+_SQUARE = numpy.array([32767, -32767], dtype=numpy.int16)
+
+# synthio's default LFO waveform is a triangle
+_TRIANGLE = numpy.array([0, 32767, 0, -32767], dtype=numpy.int16)
+
+
+def midi_to_hz(midi_note):
+    return 440.0 * 2 ** ((midi_note - 69) / 12)
+
+def voct_to_hz(ctrl):
+    return midi_to_hz(60 + 12*ctrl)
+
+
+class EnvelopeState:
+    ATTACK = 1
+    DECAY = 2
+    SUSTAIN = 3
+    RELEASE = 4
+
+
+class Envelope:
+    def __init__(self, *, attack_time=0.1, decay_time=0.05, release_time=0.2,
+                 attack_level=1.0, sustain_level=0.8):
+        self.attack_time = attack_time
+        self.decay_time = decay_time
+        self.release_time = release_time
+        self.attack_level = attack_level
+        self.sustain_level = sustain_level
+
+# no envelope given: notes turn instantly on and off
+_INSTANT = Envelope(attack_time=0, decay_time=0, release_time=0, attack_level=1.0, sustain_level=1.0)
+
+
+class LFO:
+    def __init__(self, waveform=None, *, rate=1.0, scale=1.0, offset=0.0, phase_offset=0.0,
+                 once=False, interpolate=True):
+        self.waveform = waveform
+        self.rate = rate
+        self.scale = scale
+        self.offset = offset
+        self.phase_offset = phase_offset
+        self.once = once
+        self.interpolate = interpolate
+        self.phase = 0.0
+        self.value = 0.0
+        self._tickedAt = -1
+        self._tick(0, 0)
+
+    def retrigger(self):
+        self.phase = 0.0
+
+    def _tick(self, blockNumber, dt):
+        '''Advance by dt seconds; only the first call per block does anything.'''
+        if blockNumber == self._tickedAt:
+            return
+        self._tickedAt = blockNumber
+        self.phase += _value(self.rate, blockNumber, dt) * dt
+        if self.once:
+            self.phase = min(self.phase, 1.0)
+        else:
+            self.phase %= 1.0
+        wave = self.waveform if self.waveform is not None else _TRIANGLE
+        n = len(wave)
+        if self.once:
+            # stays at the end once it gets there
+            p = min(self.phase + self.phase_offset, 1.0) * (n - 1)
+        else:
+            p = ((self.phase + self.phase_offset) % 1.0) * n
+        i = int(p)
+        a = int(wave[min(i, n-1)])
+        if self.interpolate:
+            b = int(wave[min(i+1, n-1)] if self.once else wave[(i+1) % n])
+            a = a + (b - a) * (p - i)
+        self.value = (_value(self.offset, blockNumber, dt)
+                      + _value(self.scale, blockNumber, dt) * a / 32768)
+
+
+def _value(blockInput, blockNumber, dt):
+    '''The current value of a BlockInput: a number, or something we have to tick.'''
+    if isinstance(blockInput, (int, float)):
+        return blockInput
+    blockInput._tick(blockNumber, dt)
+    return blockInput.value
+
+
+class Biquad:
+    '''A filter's coefficients (normalized, so a0 is 1). The filter's state is kept per voice.'''
+    def __init__(self, b0, b1, b2, a1, a2):
+        self.b0 = b0
+        self.b1 = b1
+        self.b2 = b2
+        self.a1 = a1
+        self.a2 = a2
+
+    def _process(self, samples, state):
+        '''Filter a block of samples; 'state' is the voice's [x1, x2, y1, y2], updated.'''
+        b0, b1, b2, a1, a2 = self.b0, self.b1, self.b2, self.a1, self.a2
+        x1, x2, y1, y2 = state
+        out = []
+        for x in samples.tolist():
+            y = b0*x + b1*x1 + b2*x2 - a1*y1 - a2*y2
+            out.append(y)
+            x2, x1 = x1, x
+            y2, y1 = y1, y
+        state[:] = [x1, x2, y1, y2]
+        return numpy.array(out)
+
+
+def _biquad(kind, frequency, Q, sampleRate):
+    '''The RBJ "audio EQ cookbook" filters.'''
+    w0 = 2 * math.pi * frequency / sampleRate
+    cosW = math.cos(w0)
+    alpha = math.sin(w0) / (2 * Q)
+    if kind == "lpf":
+        b = ((1 - cosW) / 2, 1 - cosW, (1 - cosW) / 2)
+    elif kind == "hpf":
+        b = ((1 + cosW) / 2, -(1 + cosW), (1 + cosW) / 2)
+    else:
+        b = (alpha, 0, -alpha)
+    a0 = 1 + alpha
+    return Biquad(b[0] / a0, b[1] / a0, b[2] / a0, -2 * cosW / a0, (1 - alpha) / a0)
+
+
+class Note:
+    def __init__(self, frequency, *, panning=0.0, waveform=None, envelope=None,
+                 amplitude=1.0, bend=0.0, filter=None, ring_frequency=0.0, ring_bend=0.0, ring_waveform=None):
+        self.frequency = frequency
+        self.panning = panning
+        self.waveform = waveform
+        self.envelope = envelope
+        self.amplitude = amplitude
+        self.bend = bend
+        self.filter = filter
+        self.ring_frequency = ring_frequency
+        self.ring_bend = ring_bend
+        self.ring_waveform = ring_waveform
+
+
+class _Voice:
+    '''A sounding Note's render state: where its oscillator and envelope are.'''
+    def __init__(self, note):
+        self.note = note
+        self.phase = 0.0
+        self.state = EnvelopeState.ATTACK
+        self.level = 0.0
+        self.filterState = [0.0, 0.0, 0.0, 0.0]
+
+
+class Synthesizer:
+    def __init__(self, *, sample_rate=11025, channel_count=1, waveform=None, envelope=None):
+        self.sample_rate = sample_rate
+        self.channel_count = channel_count
+        self.waveform = waveform
+        self.envelope = envelope
+        self.blocks = []
+        self.max_polyphony = 12
+        self._voices = []
+        self._blockNumber = 0
+        self._pending = numpy.zeros(0, dtype=numpy.float64)
+        self.framesRendered = 0
+
+    # ---- the real API
+
+    @property
+    def pressed(self):
+        return tuple(v.note for v in self._voices if v.state != EnvelopeState.RELEASE)
+
+    def press(self, press=()):
+        for note in _notes(press):
+            v = self._voiceFor(note)
+            if v is None:
+                self._voices.append(_Voice(note))
+            elif v.state == EnvelopeState.RELEASE:
+                v.state = EnvelopeState.ATTACK
+
+    def release(self, release=()):
+        for note in _notes(release):
+            v = self._voiceFor(note)
+            if v is not None:
+                v.state = EnvelopeState.RELEASE
+
+    def release_then_press(self, release=(), press=()):
+        self.release(release)
+        self.press(press)
+
+    def release_all(self):
+        for v in self._voices:
+            v.state = EnvelopeState.RELEASE
+
+    def release_all_then_press(self, press=()):
+        self.release_all()
+        self.press(press)
+
+    def note_info(self, note):
+        v = self._voiceFor(note)
+        if v is None:
+            return (None, 0.0)
+        return (v.state, v.level)
+
+    def low_pass_filter(self, frequency, Q=0.7071067811865475):
+        return _biquad("lpf", frequency, Q, self.sample_rate)
+
+    def high_pass_filter(self, frequency, Q=0.7071067811865475):
+        return _biquad("hpf", frequency, Q, self.sample_rate)
+
+    def band_pass_filter(self, frequency, Q=0.7071067811865475):
+        return _biquad("bpf", frequency, Q, self.sample_rate)
+
+    def deinit(self):
+        self._voices = []
+
+    # ---- rendering, for audiobusio/audiomixer (or a test) to call
+
+    def _voiceFor(self, note):
+        for v in self._voices:
+            if v.note is note:
+                return v
+        return None
+
+    def _render(self, nframes):
+        '''Render nframes frames; returns int16 samples, interleaved if stereo.'''
+        pieces = [self._pending]
+        have = len(self._pending)
+        while have < nframes:
+            block = self._renderBlock()
+            pieces.append(block)
+            have += len(block)
+        mono = numpy.concatenate(pieces)
+        self._pending = mono[nframes:]
+        mono = mono[:nframes]
+        self.framesRendered += nframes
+        pcm = numpy.clip(mono, -32767, 32767).astype(numpy.int16)
+        if self.channel_count == 2:
+            return numpy.repeat(pcm, 2)
+        return pcm
+
+    def _renderBlock(self):
+        n = BLOCK_SIZE
+        dt = n / self.sample_rate
+        self._blockNumber += 1
+        bn = self._blockNumber
+        for b in self.blocks:
+            _value(b, bn, dt)
+
+        mix = numpy.zeros(n, dtype=numpy.float64)
+        t = numpy.arange(n)
+        for v in list(self._voices):
+            note = v.note
+            env = note.envelope or self.envelope or _INSTANT
+            start = v.level
+            end = self._advanceEnvelope(v, env, dt)
+            if start == 0 and end == 0 and v.state == EnvelopeState.RELEASE:
+                self._voices.remove(v)
+                continue
+
+            f = note.frequency * 2 ** _value(note.bend, bn, dt)
+            wave = note.waveform if note.waveform is not None else (
+                self.waveform if self.waveform is not None else _SQUARE)
+            inc = f / self.sample_rate
+            phases = (v.phase + inc * t) % 1.0
+            v.phase = (v.phase + inc * n) % 1.0
+            samples = numpy.asarray(wave, dtype=numpy.float64)[(phases * len(wave)).astype(int) % len(wave)]
+
+            amp = _value(note.amplitude, bn, dt)
+            samples *= amp * numpy.linspace(start, end, n, endpoint=False)
+            if note.filter is not None:
+                samples = note.filter._process(samples, v.filterState)
+            mix += samples
+
+            if v.state == EnvelopeState.RELEASE and end == 0:
+                self._voices.remove(v)
+        return mix
+
+    def _advanceEnvelope(self, v, env, dt):
+        '''Move the voice's envelope along by dt seconds; returns the new level.'''
+        peak = env.attack_level
+        sustain = env.sustain_level * peak
+        if v.state == EnvelopeState.ATTACK:
+            v.level = peak if env.attack_time <= 0 else min(peak, v.level + peak * dt / env.attack_time)
+            if v.level >= peak:
+                v.state = EnvelopeState.DECAY
+        elif v.state == EnvelopeState.DECAY:
+            v.level = sustain if env.decay_time <= 0 else max(sustain, v.level - (peak - sustain) * dt / env.decay_time)
+            if v.level <= sustain:
+                v.state = EnvelopeState.SUSTAIN
+        elif v.state == EnvelopeState.SUSTAIN:
+            v.level = sustain
+        elif v.state == EnvelopeState.RELEASE:
+            v.level = 0.0 if env.release_time <= 0 else max(0.0, v.level - peak * dt / env.release_time)
+        return v.level
+
+
+def _notes(arg):
+    '''press()/release() take a Note, or any iterable of Notes.'''
+    if isinstance(arg, Note):
+        return (arg,)
+    return tuple(arg)
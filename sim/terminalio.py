@@ -0,0 +1,9 @@
+"""Stand-in for CircuitPython's 'terminalio'."""
+
+
+class _Font:
+    # the built-in terminalio font is 6x12
+    width = 6
+    height = 12
+
+FONT = _Font()
@@ -0,0 +1,136 @@
+"""Cooperative tasks for the Featheremin, on asyncio.
+
+Each part of the app - pitch sensing, the secondary sensor, gestures, LFOs, the display - is a
+PeriodicTask: a plain function that gets run every so often, at its own rate. So a slow gesture
+read or display refresh holds the pitch up only until it's done, not until the whole loop
+has come round again.
+
+asyncio has no priorities, so we do a cheap version of them: before a task runs, if a more
+important task is due, it steps aside for a moment and lets that one go first.
+
+The runner keeps each task's run times (in a loopStats.LoopStats, if it's given one) and counts
+missed deadlines - times a task got started more than a whole period late.
+
+On the Feather this needs the 'asyncio' and 'adafruit_ticks' libraries in /lib;
+in the host simulator it's CPython's own asyncio.
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+import asyncio
+import time
+
+import loopStats
+
+
+class PeriodicTask:
+    '''
+        Run step() every periodSeconds (0 means "whenever we can").
+        When two tasks are due at once, the one with the higher priority goes first.
+    '''
+    # how many times a task will step aside for more important ones, before it runs anyway
+    MAX_DEFERS = 3
+
+    def __init__(self, name, periodSeconds, step, priority=0):
+        self.name = name
+        self.priority = priority
+        self._step = step
+        self._periodNS = int(periodSeconds * 1000000000)
+        self._dueNS = 0
+        self.runs = 0
+        self.missed = 0
+        self._busyNS = 0
+        self._worstLateNS = 0
+
+    def isDue(self, nowNS):
+        return nowNS >= self._dueNS
+
+    async def run(self, runner):
+        self._dueNS = time.monotonic_ns()
+        while runner.running:
+            now = time.monotonic_ns()
+            if now < self._dueNS:
+                await asyncio.sleep((self._dueNS - now) / 1000000000)
+                continue
+
+            # Let anything more important that's waiting go first.
+            defers = 0
+            while defers < self.MAX_DEFERS and runner.moreImportantDue(self, now):
+                await asyncio.sleep(0)
+                defers += 1
+                now = time.monotonic_ns()
+
+            late = now - self._dueNS
+            if late > self._worstLateNS:
+                self._worstLateNS = late
+            if self._periodNS > 0 and late > self._periodNS:
+                self.missed += 1
+                self._dueNS = now # start again from here, rather than catch up in a rush
+            self._dueNS += self._periodNS
+
+            self._step()
+
+            end = time.monotonic_ns()
+            self.runs += 1
+            self._busyNS += end - now
+            runner.stats.addSample(self.name, (end - now) // 1000)
+
+            # Always give the others a turn - even if we're due again already.
+            await asyncio.sleep(0)
+
+    def getStats(self, seconds):
+        return {"runs": self.runs, "rateHz": self.runs / seconds if seconds else 0,
+                "missed": self.missed, "worstLateMs": self._worstLateNS / 1000000,
+                "busyPercent": 100 * self._busyNS / 1000000000 / seconds if seconds else 0}
+
+
+class TaskRunner:
+    '''A set of PeriodicTasks, run together until stop() (or for so many seconds).'''
+    def __init__(self, stats=None):
+        self.stats = stats if stats is not None else loopStats.NullStats()
+        self.running = False
+        self._tasks = []
+        self._seconds = 0
+
+    def add(self, name, periodSeconds, step, priority=0):
+        task = PeriodicTask(name, periodSeconds, step, priority)
+        self._tasks.append(task)
+        return task
+
+    def moreImportantDue(self, task, nowNS):
+        for t in self._tasks:
+            if t.priority > task.priority and t.isDue(nowNS):
+                return True
+        return False
+
+    def stop(self):
+        '''The tasks finish what they're doing, and run() returns.'''
+        self.running = False
+
+    def run(self, seconds=None):
+        '''Run the tasks. Forever, unless 'seconds' says how long (or somebody calls stop()).'''
+        startNS = time.monotonic_ns()
+        asyncio.run(self._main(seconds))
+        self._seconds = (time.monotonic_ns() - startNS) / 1000000000
+        self.stats.addInfo("seconds", self._seconds)
+        self.stats.addInfo("tasks", self.getStats())
+
+    async def _main(self, seconds):
+        self.running = True
+        running = [asyncio.create_task(t.run(self)) for t in self._tasks]
+        if seconds is not None:
+            await asyncio.sleep(seconds)
+            self.stop()
+        await asyncio.gather(*running)
+
+    def getStats(self):
+        '''{task name: {"runs", "rateHz", "missed", "worstLateMs", "busyPercent"}}'''
+        result = {}
+        for t in self._tasks:
+            result[t.name] = t.getStats(self._seconds)
+        return result
+
+    def printStats(self):
+        print(f"{'task':>10} {'runs':>7} {'Hz':>8} {'missed':>7} {'worst late':>11} {'busy':>6}")
+        for name, st in self.getStats().items():
+            print(f"{name:>10} {st['runs']:7d} {st['rateHz']:8.1f} {st['missed']:7d} "
+                  f"{st['worstLateMs']:9.1f}ms {st['busyPercent']:5.1f}%")
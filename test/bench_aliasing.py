@@ -0,0 +1,73 @@
+""" Alias energy of the synth's saw and square, plain vs. band-limited (waveforms.WaveBank).
+
+    Desktop only: renders each note for a second with the simulator's synthio (which, like
+    the real one, looks up its waveform with no interpolation), takes the spectrum, and reports
+    how much of the energy is *not* at a harmonic of the note - that's aliasing - in dB.
+    Lower is better.
+
+        python test/bench_aliasing.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import sim
+sim.install()
+
+import numpy
+import synthio
+
+import featherSynth6
+import waveforms
+
+RATE = featherSynth6.SYNTH_RATE
+NOTES = (72, 84, 96, 103, 108, 115, 120)  # MIDI; 120 is as high as the Featheremin goes
+
+
+def render(freq, waveform, seconds=1.0):
+    synth = synthio.Synthesizer(sample_rate=RATE)
+    synth.press(synthio.Note(frequency=freq, waveform=waveform))
+    return synth._render(int(RATE * seconds)).astype(numpy.float64)
+
+
+def aliasDB(samples, freq):
+    '''Energy away from the harmonics of freq (and DC), relative to the total, in dB.'''
+    n = len(samples)
+    power = numpy.abs(numpy.fft.rfft(samples * numpy.hanning(n))) ** 2
+    binHz = RATE / n
+    harmonic = numpy.zeros(len(power), dtype=bool)
+    harmonic[:4] = True # DC
+    k = 1
+    while k * freq < RATE / 2:
+        b = int(round(k * freq / binHz))
+        harmonic[max(0, b-4):b+5] = True
+        k += 1
+    alias = power[~harmonic].sum()
+    total = power[4:].sum()
+    return 10 * numpy.log10(max(alias, 1e-12) / total)
+
+
+def main():
+    banks = {"saw": waveforms.WaveBank("saw", RATE), "square": waveforms.WaveBank("square", RATE)}
+    plain = {"saw": waveforms.saw(), "square": None}  # None: synthio's own square
+
+    print(f"{'':>6} {'':>8}  {'saw':^23}  {'square':^23}")
+    print(f"{'note':>6} {'Hz':>8}  {'plain':>7} {'bandlim':>7} {'gain':>7}  {'plain':>7} {'bandlim':>7} {'gain':>7}   (dB)")
+    gains = {"saw": [], "square": []}
+    for note in NOTES:
+        f = synthio.midi_to_hz(note)
+        cols = []
+        for shape in ("saw", "square"):
+            before = aliasDB(render(f, plain[shape]), f)
+            after = aliasDB(render(f, banks[shape].table(f)), f)
+            gains[shape].append(before - after)
+            cols.append(f"{before:7.1f} {after:7.1f} {before-after:7.1f}")
+        print(f"{note:>6} {f:8.1f}  {cols[0]}  {cols[1]}")
+
+    for shape, g in gains.items():
+        print(f"{shape}: alias energy down {sum(g)/len(g):.1f} dB on average, {min(g):.1f} dB at worst")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+""" Attack latency for each envelope preset: from a hand coming into range to the first sound you'd hear.
+
+    Desktop only: plays a note into the simulator's synthio with each of featherSynth6's ENVELOPES
+    and adds up where the time goes:
+
+        ranging  - the pitch sensor's measurement (its timing budget)
+        code     - FeatherSynth.playFrequency() pressing the note (timed here, on the host - the
+                   Feather is slower; see sensorToSound in bench_mainLoop on the real thing)
+        buffer   - the mixer's buffer, which is already full when the note starts
+        audible  - the envelope, to the first sample over AUDIBLE (-40 dBFS)
+
+    and, for comparison, how long the envelope takes to get to 90% of its peak.
+
+        python test/bench_attack.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import sim
+sim.install()
+
+import time
+
+import board
+import numpy
+
+import featherSynth6
+
+RANGING_MS = 33     # VL53L0X measurement_timing_budget, as set in feathereminHardware
+AUDIBLE = 328       # -40 dBFS
+RENDER_SECONDS = 2.0
+
+
+def measure(synth, name):
+    '''(code ms, audible ms, to-90% ms) for preset 'name'.'''
+    synth.stop()
+    synth._synth._voices = []  # let the last note's release go
+    synth.setEnvelope(name)
+
+    t0 = time.perf_counter()
+    synth.playFrequency(440)
+    codeMS = (time.perf_counter() - t0) * 1000
+
+    raw = synth._synth
+    voice = synth._voices[0]
+    peak = featherSynth6.ENVELOPES[name][3]
+    rate = featherSynth6.SYNTH_RATE
+    blocks = []
+    fullAt = None
+    frames = 0
+    while frames < RENDER_SECONDS * rate:
+        blocks.append(raw._render(sim.synthio.BLOCK_SIZE))
+        frames += sim.synthio.BLOCK_SIZE
+        if fullAt is None and raw.note_info(voice)[1] >= 0.9 * peak:
+            fullAt = frames
+    pcm = numpy.abs(numpy.concatenate(blocks).astype(numpy.int32))
+    loud = numpy.nonzero(pcm > AUDIBLE)[0]
+    audibleMS = 1000 * loud[0] / rate if len(loud) else float("nan")
+    fullMS = 1000 * fullAt / rate if fullAt is not None else float("nan")
+    return codeMS, audibleMS, fullMS
+
+
+def main():
+    synth = featherSynth6.FeatherSynth(False, board.D9, board.D10, board.D11)
+    synth._audio.deinit()   # we'll do the rendering ourselves
+    synth.setWaveformSine()
+    bufferMS = synth.getOutputLatency() * 1000
+
+    print(f"{'preset':>8} {'ranging':>8} {'code':>6} {'buffer':>7} {'audible':>8} {'total':>7}   {'to 90%':>7}   (ms)")
+    for name in featherSynth6.ENVELOPE_NAMES:
+        codeMS, audibleMS, fullMS = measure(synth, name)
+        total = RANGING_MS + codeMS + bufferMS + audibleMS
+        print(f"{name:>8} {RANGING_MS:8.1f} {codeMS:6.2f} {bufferMS:7.1f} {audibleMS:8.1f} {total:7.1f}   {fullMS:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Cost of one drone update: the old two-Note drone (with its print for out-of-range pitches)
+# vs. droneEngine.DroneEngine, at each voice count.
+#
+# Run it on the Feather (from main.py), or on a desktop, where the simulator stands in for synthio.
+#
+import sys
+sys.path.insert(0, ".")     # so it runs from the project root on a desktop, too
+
+import featherBackend
+
+import time
+import synthio
+
+import droneEngine
+
+N_UPDATES = 2000
+OOB_EVERY = 10  # one update in this many is out of range, like a reading that's gone wrong
+
+
+class LegacyDrone:
+    '''What FeatherSynth.drone() used to do.'''
+    def __init__(self, synth):
+        self._synth = synth
+        self._drone1 = synthio.Note(1000, amplitude=1, bend=1)
+        self._drone2 = synthio.Note(1100, amplitude=1, bend=1)
+        synth.release_all_then_press((self._drone1, self._drone2))
+
+    def drone(self, f1, f2):
+        if f1 < 0 or f1 > 32767 or f2 < 0 or f2 > 32767:
+            print(f"*** drone freq OOB: {f1}, {f2}")
+            return
+        self._drone1.frequency = f1
+        self._drone2.frequency = f2
+
+
+def pitches():
+    '''(f, beat) for each update: a sweep, with the odd wild one.'''
+    result = []
+    for i in range(N_UPDATES):
+        f = 1000 + (i % 200) * 95
+        if i % OOB_EVERY == 0:
+            f = 40000
+        result.append((f, 50 + i % 100))
+    return result
+
+
+def timeIt(update, updates):
+    t0 = time.monotonic_ns()
+    for f, beat in updates:
+        update(f, beat)
+    return (time.monotonic_ns() - t0) / len(updates) / 1000
+
+
+synth = synthio.Synthesizer(sample_rate=22050)
+updates = pitches()
+
+legacy = LegacyDrone(synth)
+legacyUs = timeIt(lambda f, beat: legacy.drone(f, f - beat), updates)
+synth.release_all()
+
+engine = droneEngine.DroneEngine(synth)
+results = []
+for name in droneEngine.PRESET_NAMES:
+    engine.setPreset(name)
+    engine.start(1000)
+    results.append((name, engine.getVoiceCount(), timeIt(engine.update, updates)))
+    engine.stop()
+
+print()
+print(f"{'legacy (2 voices)':>20}: {legacyUs:7.1f} us/update   (prints every {OOB_EVERY}th)")
+for name, voices, us in results:
+    print(f"{name + f' ({voices} voices)':>20}: {us:7.1f} us/update   ({us/voices:.1f} us/voice)")
+print(f"clamped: {engine.getStats()['clamped']}")
+
+print("bench_drone done!")
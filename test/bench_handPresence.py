@@ -0,0 +1,81 @@
+# Presses and releases: the plain "0 < r < 1000" test vs. handPresence.HandPresence, on range traces.
+#
+# Each trace is run through both; every flip of the plain test would have been a synth press or
+# release (and a redraw). Reports how many of those the hysteresis and dwell times took away.
+#
+# Traces are recordings from test/record_ranges.py ("seconds,mm" lines) named on the command line -
+#   python test/bench_handPresence.py myHand.csv
+# - or, with none, some made-up ones. Runs on the Feather (from main.py) or on a desktop.
+#
+import sys
+sys.path.insert(0, ".")  # so it runs from the project root on a desktop, too
+
+import handPresence
+
+SAMPLE_S = 0.033  # one reading per 33 ms timing budget
+
+
+def noise(seed):
+    return (seed * 1103515245 + 12345) & 0x7FFFFFFF
+
+
+def hover(n=600, mm=990, jitter=20):
+    '''A hand held right at the edge of the range.'''
+    trace, seed = [], 3
+    for i in range(n):
+        seed = noise(seed)
+        trace.append((i * SAMPLE_S, mm + seed % (2*jitter + 1) - jitter))
+    return trace
+
+
+def comeAndGo(n=600, jitter=15):
+    '''In from far away, play a while, back out; twice. With the odd dropout to 0.'''
+    trace, seed = [], 5
+    for i in range(n):
+        phase = (i % (n // 2)) / (n // 2)
+        if phase < 0.2:
+            mm = 1200 - phase / 0.2 * 900
+        elif phase < 0.8:
+            mm = 300
+        else:
+            mm = 300 + (phase - 0.8) / 0.2 * 900
+        seed = noise(seed)
+        mm += seed % (2*jitter + 1) - jitter
+        if seed % 50 == 0:
+            mm = 0
+        trace.append((i * SAMPLE_S, int(mm)))
+    return trace
+
+
+def load(path):
+    trace = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line[0] == "#":
+                continue
+            t, mm = line.split(",")
+            trace.append((float(t), int(float(mm))))
+    return trace
+
+
+def run(name, trace):
+    presence = handPresence.HandPresence()
+    for t, mm in trace:
+        presence.update(mm, int(t * 1000000000))
+    st = presence.getStats()
+    print(f"{name:>24}: {len(trace):6d} readings, {st['naive']:5d} plain flips, {st['events']:4d} events, "
+          f"{st['removed']:5d} removed")
+    return st
+
+
+if len(sys.argv) > 1 and sys.argv[1] != "":
+    traces = [(path, load(path)) for path in sys.argv[1:]]
+else:
+    traces = [("hover at the edge", hover()), ("come and go", comeAndGo())]
+
+total = 0
+for name, trace in traces:
+    total += run(name, trace)["removed"]
+print(f"Redundant presses/releases removed: {total}")
+print("bench_handPresence done!")
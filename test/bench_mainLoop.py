@@ -0,0 +1,139 @@
+""" Latency benchmark for feathereminMain.main(), run in the host simulator.
+
+    Runs the real app, with synthetic sensor data, for N seconds and reports p50/p95/p99 run times
+    per task (pitch, secondary, lfo, gesture, display), plus sensor-to-sound latency,
+    in microseconds; and each task's rate and missed deadlines. Results go to a JSON file
+    so runs from different commits can be compared:
+
+        python test/bench_mainLoop.py --out before.json
+        (change things)
+        python test/bench_mainLoop.py --out after.json --compare before.json
+
+    --modes runs it once per LFO mode (with no menu gestures), with and without sensor demand
+    (feathereminMain.SENSOR_DEMAND), and reports what reading only the needed sensors gains in each.
+
+    Times are modelled on the real hardware's (the ToF timing budget, SPI and I2C transfer times),
+    but the Python runs at desktop speed - so look at the shape, and the differences, more than
+    the absolute numbers.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import sim
+from sim import streams
+
+
+def gitCommit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(summary, oldPath):
+    with open(oldPath) as f:
+        old = json.load(f)
+    print(f"\nvs. {oldPath} ({old['info'].get('commit', '?')}):")
+    print(f"{'stage':>16} {'p50':>16} {'p95':>16} {'p99':>16}   (us, old -> new)")
+    for name, st in summary.items():
+        o = old["stages"].get(name)
+        if o is None:
+            print(f"{name:>16}   (new)")
+            continue
+        cols = [f"{o[p]:>7d}->{st[p]:<7d}" for p in ("p50", "p95", "p99")]
+        print(f"{name:>16} {cols[0]:>16} {cols[1]:>16} {cols[2]:>16}")
+
+
+def runModes(seconds):
+    '''Each LFO mode, with sensor demand off and on, each in a fresh simulator.'''
+    import feathereminMain
+    rows = []
+    for mode in feathereminMain.LFO_MODES:
+        results = []
+        for demand in (False, True):
+            out = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"_modes_{mode}_{demand}.json")
+            cmd = [sys.executable, __file__, "--seconds", str(seconds), "--lfo", mode, "--out", out]
+            if not demand:
+                cmd.append("--no-demand")
+            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+            with open(out) as f:
+                results.append(json.load(f))
+            os.remove(out)
+        rows.append((mode, results))
+
+    print(f"\n{'mode':>8} {'pitch Hz':>17} {'secondary Hz':>17} {'bus %':>15} {'tofB reads':>15}   (all sensors -> on demand)")
+    for mode, (off, on) in rows:
+        cols = []
+        for get in (lambda r: r["info"]["pitchHz"],
+                    lambda r: r["extra"]["tasks"]["secondary"]["rateHz"],
+                    lambda r: r["extra"]["i2cBus"]["utilization"],
+                    lambda r: r["extra"]["i2cBus"]["perDevice"].get("tofB", [0])[0]):
+            cols.append(f"{get(off):7.1f}->{get(on):<7.1f}")
+        print(f"{mode:>8} {cols[0]:>17} {cols[1]:>17} {cols[2]:>15} {cols[3]:>15}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Featheremin main loop.")
+    parser.add_argument("--seconds", type=float, default=4.0)
+    parser.add_argument("--out", default="bench_mainLoop.json")
+    parser.add_argument("--compare", default=None, help="an earlier --out file")
+    parser.add_argument("--pitch", default=None, help="recorded ranges for the pitch sensor")
+    parser.add_argument("--lfo", default=None, help="start in this LFO mode, and make no menu gestures")
+    parser.add_argument("--no-demand", action="store_true", help="read every sensor, needed or not")
+    parser.add_argument("--apds-int", action="store_true",
+                        help="as if the APDS9960's INT were wired to D5 (it is, in the simulator)")
+    parser.add_argument("--modes", action="store_true", help="compare sensor demand on and off in each LFO mode")
+    args = parser.parse_args()
+
+    if args.modes:
+        runModes(args.seconds)
+        return
+
+    pitch = streams.RecordedRanges(args.pitch) if args.pitch else streams.HandSweep(period=3.0)
+    # some menu activity too: next item, then change its option, a few times
+    gestures = [(1.0, 4), (2.0, 1), (3.0, 4), (4.0, 4), (5.0, 2), (6.0, 4)]
+    if args.lfo:
+        gestures = []
+    sim.install(sim.Scenario(pitch=pitch, secondary=streams.Constant(200), gestures=gestures))
+
+    import feathereminMain
+    import loopStats
+
+    if args.no_demand:
+        feathereminMain.SENSOR_DEMAND = False
+    if args.apds_int:
+        import board
+        feathereminMain.APDS_INT_IN = board.D5
+    menu = [(feathereminMain.MENU_LFO, args.lfo)] if args.lfo else ()
+
+    stats = loopStats.LoopStats()
+    runner = feathereminMain.main(seconds=args.seconds, stats=stats, menu=menu)
+    sim.audioOut().deinit()
+    stats.addInfo("i2c", {hex(a): n for a, n in sorted(sim.bus().perAddress.items())})
+
+    print(f"\n{args.seconds} seconds:")
+    stats.printTable()
+    print()
+    runner.printStats()
+    seconds = stats.getInfo()["seconds"]
+    pitchHz = stats.count("sensorToSound") / seconds
+    print(f"Pitch updates: {pitchHz:.1f} Hz")
+    for key, value in stats.getInfo().items():
+        if key != "tasks":
+            print(f"{key}: {value}")
+
+    stats.save(args.out, info={"commit": gitCommit(), "backend": "sim", "seconds": args.seconds,
+                               "pitchHz": pitchHz})
+    print(f"Saved to {args.out}")
+
+    if args.compare:
+        compare(stats.summary(), args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Per-sample cost of turning a range into a frequency: the old arithmetic vs. pitchMap.
+# (Continuous is midi_to_hz() either way now - the interpolated table was slower - so that's
+# a check that the PitchMap wrapper costs next to nothing; the quantized scales are tables.)
+#
+# Run it on the Feather (from main.py), or on a desktop (where synthio is the simulator's).
+#
+import sys
+sys.path.insert(0, ".")  # so it runs from the project root on a desktop, too
+
+import featherBackend
+
+import synthio
+import time
+
+import pitchMap
+
+N_SAMPLES = 5000
+
+
+# What feathereminMain used to do for each reading.
+def oldWay(r1, chromatic):
+    midiNote = r1 / 5
+    if midiNote > 120:
+        midiNote = 120
+    if chromatic:
+        midiNote = int(midiNote)
+    return synthio.midi_to_hz(midiNote)
+
+
+def bench(name, func, ranges):
+    t0 = time.monotonic_ns()
+    for r in ranges:
+        func(r)
+    t1 = time.monotonic_ns()
+    usPer = (t1-t0) / len(ranges) / 1000
+    print(f"{name:>24}: {usPer:6.2f} us/sample")
+    return usPer
+
+
+ranges = [(i * 7.3) % 1000 for i in range(N_SAMPLES)]
+pm = pitchMap.PitchMap(mmPerNote=5, maxNote=120, maxRange=1000)
+
+# Check they agree, first.
+worst = 0
+pm.setScale("Chromatic")
+for r in ranges:
+    worst = max(worst, abs(pm.hz(r) / oldWay(r, True) - 1))
+print(f"Chromatic table vs midi_to_hz: worst error {worst*100:.3f}%")
+
+old = bench("old continuous", lambda r: oldWay(r, False), ranges)
+pm.setScale("Continuous")
+new = bench("PitchMap continuous", pm.hz, ranges)
+print(f"  saves {old-new:.2f} us/sample")
+
+old = bench("old chromatic", lambda r: oldWay(r, True), ranges)
+pm.setScale("Chromatic")
+new = bench("table chromatic", pm.hz, ranges)
+print(f"  saves {old-new:.2f} us/sample")
+
+pm.setScale("Pentatonic")
+bench("table pentatonic", pm.hz, ranges)
+
+print("bench_pitchMap done!")
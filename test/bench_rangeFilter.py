@@ -0,0 +1,61 @@
+# Per-sample cost of the range filters in rangeFilter.py.
+#
+# Runs each filter chain over the same noisy hand sweep and reports microseconds per sample,
+# and how much jitter is left (mean absolute step between outputs while the hand is still).
+# Needs no hardware: run it on the Feather (from main.py) or on a desktop.
+#
+import sys
+sys.path.insert(0, ".")  # so it runs from the project root on a desktop, too
+
+import time
+
+import rangeFilter as rf
+
+N_SAMPLES = 2000
+SAMPLE_NS = 33000000  # one reading per 33 ms timing budget
+
+
+def makeSamples():
+    '''A hand that holds still, sweeps, holds still; with jitter, and the odd dropout.'''
+    samples = []
+    seed = 1
+    for i in range(N_SAMPLES):
+        phase = i / N_SAMPLES
+        if phase < 0.3:
+            mm = 300
+        elif phase < 0.6:
+            mm = 300 + (phase - 0.3) / 0.3 * 400
+        else:
+            mm = 700
+        seed = (seed * 1103515245 + 12345) & 0x7FFFFFFF
+        mm += (seed % 13) - 6
+        if seed % 97 == 0:
+            mm = 0 if seed % 2 else rf.NO_TARGET
+        samples.append(int(mm))
+    return samples
+
+
+def bench(name, filt, samples):
+    out = [0.0] * len(samples)
+    t0 = time.monotonic_ns()
+    now = 0
+    for i in range(len(samples)):
+        now += SAMPLE_NS
+        out[i] = filt.filter(samples[i], now)
+    t1 = time.monotonic_ns()
+
+    # jitter while still: the first 30% of the run
+    still = int(N_SAMPLES * 0.3)
+    jitter = sum(abs(out[i] - out[i-1]) for i in range(still//2, still)) / (still - still//2)
+    print(f"{name:>16}: {(t1-t0)/len(samples)/1000:7.1f} us/sample; jitter {jitter:5.2f} mm/sample")
+
+
+samples = makeSamples()
+bench("Off (gate only)", rf.RangeFilter(), samples)
+bench("Median 3", rf.RangeFilter((rf.MedianFilter(3),)), samples)
+bench("Median 5", rf.RangeFilter((rf.MedianFilter(5),)), samples)
+bench("Exp 0.75", rf.RangeFilter((rf.ExpSmoothing(0.75),)), samples)
+bench("1-Euro", rf.RangeFilter((rf.OneEuroFilter(),)), samples)
+bench("Median3 + 1-Euro", rf.RangeFilter((rf.MedianFilter(3), rf.OneEuroFilter())), samples)
+
+print("bench_rangeFilter done!")
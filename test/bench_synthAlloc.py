@@ -0,0 +1,101 @@
+# Allocation-counting benchmark for FeatherSynth.play().
+#
+# Sweeps the pitch the way a hand does, many times, and counts how many bytes
+# of heap each call to play() costs - first with the old "new Notes every time" approach,
+# then with the persistent voice pool in featherSynth6.
+# In the steady state (voices already pressed) the pool should cost nothing.
+#
+# On a desktop it runs in the simulator, with gc.mem_alloc() backed by tracemalloc:
+#     python test/bench_synthAlloc.py
+# There, 'kept' is the heap still in use after the calls, and 'churn' is the most that was
+# in use at once on the way (garbage included); the pool must keep nothing per call. Checked, not
+# just printed.
+# (The simulated audio output is stopped first: its rendering thread allocates too.)
+#
+# On the Feather (from main.py), GC is off for the calls, so every allocation stays counted.
+# A float result is itself a heap object there, so the pool can show a few bytes per call
+# from the pitch arithmetic; that's reported, not checked.
+#
+import sys
+sys.path.insert(0, ".")  # so it runs from the project root on a desktop, too
+
+if sys.implementation.name != "circuitpython":
+    import sim
+    sim.install(trackMemory=True)
+
+import featherBackend
+
+import board
+import gc
+import synthio
+import time
+
+import featherSynth6 as fsynth
+
+AUDIO_OUT_I2S_BIT  = board.D9
+AUDIO_OUT_I2S_WORD = board.D10
+AUDIO_OUT_I2S_DATA = board.D11
+
+N_ITERATIONS = 1000
+
+
+# What play() used to do, for comparison.
+def legacyPlay(synth, midi_note_value):
+    notes = []
+    for i in range(synth._numOscs):
+        f = synthio.midi_to_hz(midi_note_value) * (1 + i*fsynth.FAT_DETUNE)
+        notes.append(synthio.Note(frequency=f,
+                     waveform=synth._waveform, amplitude=synth._trem_current, bend=synth._vib_current))
+    synth._synth.release_all_then_press(notes)
+
+
+def countAllocs(name, playFunc, synth):
+    '''Call playFunc N_ITERATIONS times with GC off; returns the heap bytes still in use after.'''
+
+    # One call to get into the steady state (voices pressed).
+    playFunc(synth, 60)
+
+    # Precompute the notes, so the loop itself doesn't allocate.
+    notes = [60 + (i % 24) for i in range(N_ITERATIONS)]
+
+    gc.collect()
+    gc.disable()
+    if featherBackend.NAME == "sim":
+        import tracemalloc
+        tracemalloc.reset_peak()
+    before = gc.mem_alloc()
+    t0 = time.monotonic_ns()
+    for n in notes:
+        playFunc(synth, n)
+    t1 = time.monotonic_ns()
+    after = gc.mem_alloc()
+    churn = ""
+    if featherBackend.NAME == "sim":
+        churn = f", churn {tracemalloc.get_traced_memory()[1] - before} bytes"
+    gc.enable()
+
+    used = after - before
+    print(f"{name:>8}: kept {used} bytes in {N_ITERATIONS} calls = {used/N_ITERATIONS:.1f} bytes/call{churn}; "
+          f"{(t1-t0)/N_ITERATIONS/1000:.1f} us/call")
+
+    synth.stop()
+    return used
+
+
+synth = fsynth.FeatherSynth(
+    True, i2s_bit_clock=AUDIO_OUT_I2S_BIT, i2s_word_select=AUDIO_OUT_I2S_WORD, i2s_data=AUDIO_OUT_I2S_DATA)
+synth.setVolume(0.1)
+if featherBackend.NAME == "sim":
+    sim.audioOut().stop()
+
+for numOscs in range(1, fsynth.MAX_OSCS+1):
+    print(f"numOscs = {numOscs}")
+    synth.setNumOscs(numOscs)
+    countAllocs("legacy", legacyPlay, synth)
+    pooled = countAllocs("pooled", fsynth.FeatherSynth.play, synth)
+    if featherBackend.NAME == "sim":
+        # Nothing per call. (A few bytes, once, are fine - the last frequency's float replacing the
+        # one before, the timer's ints - but even one float a call kept would be 24K here.)
+        assert pooled < N_ITERATIONS, f"play() keeps {pooled/N_ITERATIONS:.1f} bytes a call, with {numOscs} oscillators"
+
+print("bench_synthAlloc done!")
@@ -0,0 +1,87 @@
+""" How a tofArray.ToFArray's update rate holds up as sensors are added, PARALLEL vs. ROUND_ROBIN.
+
+    Desktop only: each run is a fresh simulator with 'count' VL53L0Xs (the Featheremin's two,
+    plus simulated "zone" sensors with their own XSHUT pins), brought up by ToFArray, then polled
+    every couple of ms for a few seconds. Reports readings per second per sensor, and in all,
+    and what a poll() costs.
+
+        python test/bench_tofArray.py
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+MAX_COUNT = 7 # A, B and the simulator's five zone pins
+POLL_SECONDS = 0.002
+
+
+def runOne(count, mode, seconds):
+    import sim
+    from sim import streams
+    zones = [streams.Constant(100 + 50*i) for i in range(count - 2)]
+    sim.install(sim.Scenario(zones=zones))
+
+    import time
+
+    import board
+    import busio
+    import tofArray
+
+    i2c = busio.I2C(board.SCL, board.SDA, frequency=400000)
+    pins = [board.D4, None] + list(board.ZONE_XSHUT_PINS[:count-2])
+    array = tofArray.ToFArray(i2c, pins)
+    if not array.allFound():
+        raise RuntimeError(f"only found {array.getStats()['found']} of {count}")
+
+    array.start(mode)
+    pollNS = 0
+    polls = 0
+    t0 = time.monotonic()
+    while time.monotonic() - t0 < seconds:
+        p0 = time.monotonic_ns()
+        array.poll()
+        pollNS += time.monotonic_ns() - p0
+        polls += 1
+        time.sleep(POLL_SECONDS)
+    elapsed = time.monotonic() - t0
+    stats = array.getStats()
+    return {"count": count, "mode": mode, "readingsHz": stats["newReadings"] / elapsed,
+            "perSensorHz": _perSensorHz(array, mode, stats, elapsed),
+            "pollUs": pollNS / polls / 1000}
+
+
+def _perSensorHz(array, mode, stats, elapsed):
+    if mode == "parallel":
+        # a poll() can bring in several sensors' readings at once, so count each sensor's own
+        samples = stats["samples"].values()
+        return sum(samples) / elapsed / len(samples)
+    # one sensor per new reading, in turn
+    return stats["newReadings"] / elapsed / len(array.getSensors())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ToFArray update rates against sensor count.")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--count", type=int, default=None, help="(internal) just this many sensors")
+    parser.add_argument("--mode", default=None, help="(internal) just this mode")
+    args = parser.parse_args()
+
+    if args.count is not None:
+        print(json.dumps(runOne(args.count, args.mode, args.seconds)))
+        return
+
+    print(f"{'sensors':>7} {'mode':>11} {'Hz/sensor':>10} {'updates Hz':>11} {'us/poll':>8}")
+    for count in range(2, MAX_COUNT + 1):
+        for mode in ("parallel", "roundRobin"):
+            out = subprocess.run([sys.executable, __file__, "--count", str(count), "--mode", mode,
+                                  "--seconds", str(args.seconds)], check=True, capture_output=True, text=True).stdout
+            r = json.loads(out.strip().splitlines()[-1])
+            print(f"{count:7d} {mode:>11} {r['perSensorHz']:10.1f} {r['readingsHz']:11.1f} {r['pollUs']:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
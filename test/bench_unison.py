@@ -0,0 +1,45 @@
+# Unison ("fatness"): what a pitch update costs as the number of oscillators goes up,
+# and where the sound's pitch centre ends up - the old upward-only detune vs. the symmetric one.
+#
+# Run it on the Feather (from main.py), or on a desktop, where the simulator stands in.
+#
+import sys
+sys.path.insert(0, ".")     # so it runs from the project root on a desktop, too
+
+import featherBackend
+
+import board
+import math
+import time
+
+import featherSynth6 as fsynth
+
+N_UPDATES = 2000
+
+
+def centreCents(ratios):
+    '''The average pitch of the oscillators, in cents from the note.'''
+    return sum(1200 * math.log(r) / math.log(2) for r in ratios) / len(ratios)
+
+
+synth = fsynth.FeatherSynth(False, board.D9, board.D10, board.D11)
+synth.setVolume(0.1)
+synth.setWaveformSaw()
+
+freqs = [220 + (i % 200) for i in range(N_UPDATES)]
+
+print(f"{'oscs':>4} {'us/update':>10} {'us/osc':>7} {'old centre':>11} {'new centre':>11}")
+for numOscs in range(1, fsynth.MAX_OSCS+1):
+    synth.setNumOscs(numOscs)
+    synth.playFrequency(220)
+    t0 = time.monotonic_ns()
+    for f in freqs:
+        synth.playFrequency(f)
+    us = (time.monotonic_ns() - t0) / N_UPDATES / 1000
+    synth.stop()
+
+    old = [1 + i*fsynth.FAT_DETUNE for i in range(numOscs)]
+    print(f"{numOscs:4d} {us:10.1f} {us/numOscs:7.2f} {centreCents(old):+10.1f}c {centreCents(fsynth.detuneRatios(numOscs)):+10.1f}c")
+
+synth.deinit()
+print("bench_unison done!")
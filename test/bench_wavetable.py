@@ -0,0 +1,96 @@
+# Cost of one wavetable scan step: fallingForeverObj's way (seek and read the WAV, mix two waves)
+# vs. wavetable.Wavetable's (copy a precomputed frame).
+#
+# Run it on the Feather (from main.py; needs wav/BRAIDS02.WAV), or on a desktop,
+# where it makes up a wavetable file (in the temp directory) if there isn't one.
+#
+import sys
+sys.path.insert(0, ".")     # so it runs from the project root on a desktop, too
+sys.path.insert(0, "test")  # for fallingForeverObj
+
+import featherBackend
+
+import gc
+import time
+
+import fallingForeverObj
+import wavetable
+
+WAV_PATH = "wav/BRAIDS02.WAV"
+N_STEPS = 2000
+
+
+def makeTestWavetable(path, numWaves=64, waveLen=256):
+    '''Desktop only: sine morphing to saw, numWaves waves of it.'''
+    import math
+    import os
+    import struct
+    import wave
+    samples = []
+    for w in range(numWaves):
+        t = w / (numWaves - 1)
+        for i in range(waveLen):
+            ph = i / waveLen
+            samples.append(int(30000 * ((1-t) * math.sin(2*math.pi*ph) + t * (1 - 2*ph))))
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(44100)
+        f.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+    print(f"Made a test wavetable: {path}")
+
+
+def scan(step, numWaves):
+    '''N_STEPS scan steps, bouncing back and forth, like fallingForeverObj's test().'''
+    i, di = 0.0, 0.07
+    t0 = time.monotonic_ns()
+    for _ in range(N_STEPS):
+        # (turn before the last wave: fallingForeverObj reads one past where it is)
+        if i + di <= 0 or i + di >= numWaves - 1:
+            di = -di
+        i += di
+        step(i)
+    return (time.monotonic_ns() - t0) / N_STEPS / 1000
+
+
+def allocPerStep(step, numWaves):
+    '''Bytes allocated per scan step (where we can tell).'''
+    if featherBackend.ON_DEVICE:
+        gc.collect()
+        before = gc.mem_alloc()
+        scan(step, numWaves)
+        return (gc.mem_alloc() - before) / N_STEPS
+    import tracemalloc
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    scan(step, numWaves)
+    peak = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return peak
+
+
+if not featherBackend.ON_DEVICE:
+    import os
+    import tempfile
+    if not os.path.exists(WAV_PATH):
+        WAV_PATH = os.path.join(tempfile.gettempdir(), "bench_wavetable.wav")
+        makeTestWavetable(WAV_PATH)
+
+old = fallingForeverObj.Wavetable(WAV_PATH)
+numWaves = old.num_waves
+
+t0 = time.monotonic_ns()
+new = wavetable.Wavetable(WAV_PATH, frames=64)
+print(f"Loading {numWaves} waves, 64 frames: {(time.monotonic_ns()-t0)/1000000:.1f} ms, {new.getMemoryUse()} bytes")
+
+oldUs = scan(old.set_wave_pos, numWaves)
+newUs = scan(lambda i: new.setPosition(i / (numWaves-1)), numWaves)
+print(f"{'file + lerp':>16}: {oldUs:8.1f} us/step")
+print(f"{'precomputed':>16}: {newUs:8.1f} us/step   ({oldUs/max(newUs, 0.001):.0f}x faster)")
+
+what = "bytes/step" if featherBackend.ON_DEVICE else "bytes peak (host)"
+print(f"{'file + lerp':>16}: {allocPerStep(old.set_wave_pos, numWaves):8.0f} {what}")
+print(f"{'precomputed':>16}: {allocPerStep(lambda i: new.setPosition(i / (numWaves-1)), numWaves):8.0f} {what}")
+
+print("bench_wavetable done!")
@@ -3,8 +3,8 @@
 # a port of "derpnote2" in https://github.com/todbot/mozzi_experiments
 #
 import board, time, audiopwmio, synthio, random
-import ulab.numpy as np
 import audiobusio, audiomixer
+import waveforms
 
 print("derping....")
 
@@ -36,10 +36,10 @@ def read_waveform(filename, n=0, start=0):
         return memoryview(w.readframes(n)).cast('h')
 
 SAMPLE_SIZE = 256
-wave_saw = np.linspace(20000, -20000, num=SAMPLE_SIZE, dtype=np.int16)  # 20k gives us more headroom somehow
-wave_noise = np.array([random.randint(-32767, 32767) for i in range(SAMPLE_SIZE)], dtype=np.int16)
-wave_rampdown = np.linspace(32767, -32767, num=3, dtype=np.int16)  # for pitch LFO
-wave_rampup = np.linspace(-32767, 32767, num=3, dtype=np.int16)  # for pitch LFO
+wave_saw = waveforms.saw(SAMPLE_SIZE, 20000)  # 20k gives us more headroom somehow
+wave_noise = waveforms.noise(SAMPLE_SIZE, 32767)
+wave_rampdown = waveforms.saw(3, 32767)  # for pitch LFO
+wave_rampup = waveforms.rampUp(3, 32767)  # for pitch LFO
 #wave_akwf_g0001 = read_waveform("AKWF_granular_0001.wav")
 my_wave = wave_saw
 
@@ -25,7 +25,6 @@
 import time, random
 import board, analogio, keypad
 import audiopwmio, audiomixer, synthio
-import ulab.numpy as np
 import neopixel, rainbowio  # circup install neopixel
 from arpy import Arpy
 
@@ -33,6 +32,8 @@ from arpy import Arpy
 import audiobusio
 import adafruit_vl53l0x as vl53l0x
 import cran_vlx
+import voiceFilter
+import waveforms
 
 
 RANGE_THRESH = 500
@@ -70,8 +71,11 @@ audio.play(mixer)
 mixer.voice[0].play(synth)
 mixer.voice[0].level = 0.8
 
+# the filters for every cutoff, made now, rather than a new one for every note
+lpf_table = voiceFilter.CutoffTable(synth, "Low pass", lpf_resonance, 28000)
+
 # our oscillator waveform, a 512 sample downward saw wave going from +/-30k
-wave_saw = np.linspace(30000, -30000, num=512, dtype=np.int16)  # max is +/-32k but gives us headroom
+wave_saw = waveforms.saw(512, 30000)  # max is +/-32k but gives us headroom
 amp_env = synthio.Envelope(attack_level=1, sustain_level=1, release_time=0.5)
 
 voices=[]  # holds our currently sounding voices ('Notes' in synthio speak)
@@ -82,10 +86,9 @@ def note_on(n):
     led.fill(rainbowio.colorwheel( n % 12 * 20  ))
     fo = synthio.midi_to_hz(n)
     voices.clear()  # delete any old voices
+    lpf = lpf_table.filterFor( fo * 8 )  # a kind of key tracking
     for i in range(num_voices):
         f = fo * (1 + i*0.007)
-        lpf_f = fo * 8  # a kind of key tracking
-        lpf = synth.low_pass_filter( lpf_f, lpf_resonance )
         voices.append( synthio.Note( frequency=f, filter=lpf, envelope=amp_env, waveform=wave_saw) )
     synth.press(voices)
 
@@ -0,0 +1,35 @@
+# Record what the two ToF sensors see, for playing back in the host simulator.
+#
+# Prints "seconds,mm" lines for each sensor to the serial console;
+# copy them into two files and use them with
+#   python feathereminSim.py --pitch a.csv --secondary b.csv
+#
+import time
+
+import feathereminHardware
+import feathereminMain as fm
+
+SECONDS = 20
+
+hw = feathereminHardware.FeatereminHardware(
+        fm.TFT_DISPLAY_CS, fm.TFT_DISPLAY_DC, fm.TFT_DISPLAY_RESET,
+        fm.AUDIO_OUT_I2S_BIT, fm.AUDIO_OUT_I2S_WORD, fm.AUDIO_OUT_I2S_DATA,
+        fm.L0X_A_RESET_OUT)
+tof_A, tof_B, _, _, _ = hw.getHardwareItems()
+
+samplesA = []
+samplesB = []
+print(f"Recording for {SECONDS} seconds - wave your hands!")
+t0 = time.monotonic()
+while time.monotonic() - t0 < SECONDS:
+    samplesA.append((time.monotonic() - t0, tof_A.range))
+    samplesB.append((time.monotonic() - t0, tof_B.range))
+
+for name, samples in (("A", samplesA), ("B", samplesB)):
+    print(f"# sensor {name}")
+    for t, mm in samples:
+        print(f"{t:.3f},{mm}")
+
+print("record_ranges done!")
+while True:
+    pass
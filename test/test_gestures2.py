@@ -41,5 +41,6 @@ i = 0 # this shows that we can keep processing after looking for selections
 while True:
     i += 1
     item, option = gm.getItemAndOption()
+    display.update()
     if item is not None:
         print(f"Got a gesture @ {i}; Do something with {item} / {option}")
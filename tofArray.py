@@ -0,0 +1,209 @@
+"""Any number of VL53L0X time-of-flight sensors on one I2C bus.
+
+Every VL53L0X powers up at address 0x29, so to have more than one on a bus, all but one have to
+be moved somewhere else - one at a time, with the others held off by their XSHUT pins. That used
+to be spelled out by hand, for exactly two sensors, in feathereminHardware (and again in
+test/cran_vlx.py and test/test_range_and_sound.py). A ToFArray takes a list of XSHUT pins - one per
+sensor, or None for the one (at most) that hasn't got one wired - and brings them all up in one go:
+
+    - every sensor with an XSHUT is switched off;
+    - the one without is found - at its new address if a previous run already moved it
+      (only a power cycle puts it back), or at 0x29 - and moved;
+    - then each of the others is switched on, alone at 0x29, and moved, in turn.
+      The last one can stay at 0x29: there's nobody left for it to clash with.
+
+Addresses are handed out from firstAddress up. A sensor that doesn't turn up is None in
+getSensors(), and its range is always NO_TARGET; the others carry on.
+
+Reading them, once start()ed:
+    PARALLEL: every sensor ranges continuously, all at once; poll() picks up whatever's ready.
+        Each sensor updates every timing budget, however many there are.
+    ROUND_ROBIN: one sensor measures at a time (a single shot each), in turn - for sensors close
+        enough to see each other's light. Each updates every N timing budgets.
+'ranges' is the latest from all of them, in order; nearest() says which is closest.
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+import time
+
+import digitalio
+
+import adafruit_vl53l0x
+
+import tofReader
+
+DEFAULT_ADDRESS = 0x29
+FIRST_ADDRESS = 0x30
+
+PARALLEL = "parallel"
+ROUND_ROBIN = "roundRobin"
+
+NO_TARGET = tofReader.NO_TARGET
+
+
+class ToFArray:
+    '''
+        The VL53L0Xs whose XSHUT pins are 'xshutPins' (None for the one that hasn't got one), on 'i2c'.
+        names: for the messages and stats; "0", "1", ... if not given.
+        present: the addresses known to answer right now (see bootCache.py), if we know. Then the
+            one without an XSHUT is only looked for at its new address if something's there.
+    '''
+    def __init__(self, i2c, xshutPins, names=None, budget=33000, firstAddress=FIRST_ADDRESS, present=None):
+        n = len(xshutPins)
+        self._names = list(names) if names is not None else [str(i) for i in range(n)]
+        self._sensors = [None] * n
+        self._xshuts = [None] * n
+        self.ranges = [NO_TARGET] * n
+
+        # Who goes where: the one without an XSHUT first, then the rest; the last one up stays put.
+        free = [i for i in range(n) if xshutPins[i] is None]
+        if len(free) > 1:
+            raise ValueError("Only one VL53L0X can do without an XSHUT pin")
+        switched = [i for i in range(n) if xshutPins[i] is not None]
+        order = free + switched
+        self._addresses = [DEFAULT_ADDRESS] * n
+        address = firstAddress
+        for i in order[:-1] if switched else order:
+            self._addresses[i] = address
+            address += 1
+
+        # Everybody with an XSHUT, off.
+        for i in switched:
+            pin = digitalio.DigitalInOut(xshutPins[i])
+            pin.direction = digitalio.Direction.OUTPUT
+            pin.value = False
+            self._xshuts[i] = pin
+
+        # The one that's always on: moved already, or still at the default?
+        self._bringUpMS = {}
+        for i in free:
+            t0 = time.monotonic_ns()
+            moved = None
+            if present is None or self._addresses[i] in present:
+                try:
+                    moved = adafruit_vl53l0x.VL53L0X(i2c, address=self._addresses[i])
+                    print(f"Found '{self._names[i]}' VL53L0X at {hex(self._addresses[i])}; OK")
+                except Exception:
+                    pass
+            self._sensors[i] = moved if moved is not None else self._bringUp(i2c, i)
+            self._bringUpMS[self._names[i]] = (time.monotonic_ns() - t0) / 1000000
+
+        # The rest, one at a time.
+        for i in switched:
+            t0 = time.monotonic_ns()
+            self._xshuts[i].value = True
+            self._sensors[i] = self._bringUp(i2c, i)
+            self._bringUpMS[self._names[i]] = (time.monotonic_ns() - t0) / 1000000
+
+        for s in self._sensors:
+            if s is not None:
+                s.measurement_timing_budget = budget
+
+        self._mode = None
+        self._readers = []
+        self._turn = 0
+        self._polls = 0
+        self._newReadings = 0
+
+    def _bringUp(self, i2c, i):
+        '''Sensor i, alone at the default address: moved to its own one. None if it's not there.'''
+        try:
+            sensor = adafruit_vl53l0x.VL53L0X(i2c)
+            if self._addresses[i] != DEFAULT_ADDRESS:
+                sensor.set_address(self._addresses[i])
+            print(f"'{self._names[i]}' VL53L0X init OK, at {hex(self._addresses[i])}")
+            return sensor
+        except Exception as e:
+            print(f"**** No '{self._names[i]}' VL53L0X? ({e})")
+            return None
+
+    def getSensors(self):
+        '''The VL53L0X objects, in the order their pins were given; None for any that didn't turn up.'''
+        return self._sensors
+
+    def getAddresses(self):
+        return self._addresses
+
+    def allFound(self):
+        return None not in self._sensors
+
+    def getBringUpMS(self):
+        '''How long each sensor took to find and move, in ms, by name.'''
+        return self._bringUpMS
+
+    # ---- reading
+
+    def start(self, mode=PARALLEL, policies=None) -> None:
+        '''
+            Start ranging. policies: a tofBudget policy per sensor, for PARALLEL (None for the default).
+        '''
+        self._mode = mode
+        self._readers = []
+        if mode == PARALLEL:
+            for i, s in enumerate(self._sensors):
+                if s is not None:
+                    policy = policies[i] if policies is not None else None
+                    self._readers.append((i, tofReader.ToFReader(s, self._names[i], policy)))
+        elif mode == ROUND_ROBIN:
+            self._turn = self._nextTurn(-1)
+            if self._turn >= 0:
+                self._sensors[self._turn].do_range_measurement()
+        else:
+            raise ValueError(f"No ToFArray mode {mode}")
+
+    def _nextTurn(self, i):
+        n = len(self._sensors)
+        for k in range(1, n + 1):
+            j = (i + k) % n
+            if self._sensors[j] is not None:
+                return j
+        return -1
+
+    def poll(self) -> bool:
+        '''Pick up any new readings. Returns True if there were any.'''
+        self._polls += 1
+        fresh = False
+        if self._mode == PARALLEL:
+            for i, reader in self._readers:
+                if reader.poll():
+                    self.ranges[i] = reader.range
+                    fresh = True
+        elif self._mode == ROUND_ROBIN and self._turn >= 0:
+            sensor = self._sensors[self._turn]
+            if sensor.data_ready:
+                self.ranges[self._turn] = sensor.read_range()
+                self._turn = self._nextTurn(self._turn)
+                self._sensors[self._turn].do_range_measurement()
+                fresh = True
+        if fresh:
+            self._newReadings += 1
+        return fresh
+
+    def nearest(self):
+        '''(index, mm) of the closest thing any sensor sees; (-1, NO_TARGET) if none of them do.'''
+        best, bestRange = -1, NO_TARGET
+        for i, r in enumerate(self.ranges):
+            if 0 < r < bestRange:
+                best, bestRange = i, r
+        return best, bestRange
+
+    def stop(self) -> None:
+        for i, reader in self._readers:
+            reader.stop()
+        self._readers = []
+        self._mode = None
+
+    def deinit(self) -> None:
+        '''Let go of the XSHUT pins. (The breakouts pull XSHUT up, so the sensors stay on.)'''
+        for pin in self._xshuts:
+            if pin is not None:
+                pin.deinit()
+
+    def getStats(self):
+        stats = {"mode": self._mode, "sensors": len(self._sensors),
+                 "found": len(self._sensors) - self._sensors.count(None),
+                 "polls": self._polls, "newReadings": self._newReadings}
+        if self._mode == PARALLEL:
+            stats["rateHz"] = {self._names[i]: round(r.getUpdateRate(), 1) for i, r in self._readers}
+            stats["samples"] = {self._names[i]: r.samples for i, r in self._readers}
+        return stats
@@ -0,0 +1,83 @@
+"""Timing-budget policies for the VL53L0X ToF sensors.
+
+The timing budget is the VL53L0X's speed/accuracy trade-off: 20 ms gets us 50 readings a second
+but noisier ones; longer budgets are steadier but slower. What we want depends on the hand:
+while it's moving fast, we want readings often; when it's holding still, we want them accurate.
+
+A policy is fed each new reading and says what budget the sensor should use now.
+ToFReader does the switching (see tofReader.py).
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+
+NO_TARGET = 8190
+
+
+class FixedBudget:
+    '''Always the same budget.'''
+    def __init__(self, budgetMicros=33000):
+        self._budget = budgetMicros
+
+    def update(self, rangeMM, nowNS) -> int:
+        return self._budget
+
+    def getSpeed(self):
+        return 0
+
+
+class AdaptiveBudget:
+    '''
+        Short budget while the hand moves fast, long budget while it's still.
+
+        Hand speed (mm/s) is estimated from successive readings, smoothed a little.
+        We switch to fastBudget as soon as the speed goes over fastSpeed, but only go back
+        to slowBudget once it has stayed under slowSpeed for holdSeconds - so we don't
+        flip-flop (each switch costs a stop/start of the sensor).
+    '''
+    def __init__(self, fastBudget=20000, slowBudget=50000, fastSpeed=300, slowSpeed=100,
+                 holdSeconds=0.3, smoothing=0.5):
+        self._fastBudget = fastBudget
+        self._slowBudget = slowBudget
+        self._fastSpeed = fastSpeed
+        self._slowSpeed = slowSpeed
+        self._holdNS = int(holdSeconds * 1000000000)
+        self._smoothing = smoothing
+
+        self._budget = slowBudget
+        self._speed = 0
+        self._lastRange = None
+        self._lastNS = 0
+        self._stillSinceNS = None
+
+    def update(self, rangeMM, nowNS) -> int:
+        '''Take a new reading (and when it came, from time.monotonic_ns()); return the budget to use.'''
+
+        # No hand: nothing to be fast for.
+        if rangeMM <= 0 or rangeMM >= NO_TARGET:
+            self._lastRange = None
+            self._speed = 0
+            self._budget = self._slowBudget
+            return self._budget
+
+        if self._lastRange is not None and nowNS > self._lastNS:
+            speed = abs(rangeMM - self._lastRange) * 1000000000 / (nowNS - self._lastNS)
+            self._speed = self._smoothing*self._speed + (1-self._smoothing)*speed
+        self._lastRange = rangeMM
+        self._lastNS = nowNS
+
+        if self._speed > self._fastSpeed:
+            self._budget = self._fastBudget
+            self._stillSinceNS = None
+        elif self._speed < self._slowSpeed:
+            if self._stillSinceNS is None:
+                self._stillSinceNS = nowNS
+            elif nowNS - self._stillSinceNS >= self._holdNS:
+                self._budget = self._slowBudget
+        else:
+            self._stillSinceNS = None
+
+        return self._budget
+
+    def getSpeed(self):
+        '''The current (smoothed) hand speed estimate, in mm/s.'''
+        return self._speed
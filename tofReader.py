@@ -0,0 +1,118 @@
+"""Non-blocking reads from a VL53L0X time-of-flight sensor.
+
+A VL53L0X's 'range' property does a single-shot measurement, which blocks for the whole
+timing budget (33 ms by default). Two of those in a row cap the main loop at about 15 Hz.
+
+Instead, a ToFReader puts its sensor in back-to-back continuous mode, so both sensors
+measure at the same time, all the time; poll() only picks up a new reading if one is ready
+(one short I2C read to find out), and otherwise returns right away.
+
+A reader nobody needs can be put on standby(): the sensor stops ranging, and poll() doesn't
+touch the bus; resume() starts it again.
+
+A reader can also have a timing-budget policy (see tofBudget.py), which it asks after each
+new reading; if the policy wants a different budget, the reader switches the sensor to it.
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+import time
+
+import tofBudget
+
+# What a VL53L0X reports when there's nothing in front of it; also our "no reading yet".
+NO_TARGET = tofBudget.NO_TARGET
+
+
+class ToFReader:
+    '''
+        Wrap a VL53L0X in continuous mode.
+
+        Call poll() as often as you like; 'range' is always the latest reading,
+        and poll() says whether it's a new one.
+    '''
+    # how often getUpdateRate()'s number is refreshed
+    RATE_WINDOW_NS = 1000000000
+
+    def __init__(self, sensor, name="ToF", policy=None):
+        self._sensor = sensor
+        self._name = name
+        self._policy = policy if policy is not None else tofBudget.FixedBudget(sensor.measurement_timing_budget)
+        self.range = NO_TARGET
+        self.samples = 0
+
+        self._budget = sensor.measurement_timing_budget
+        self._budgetChanges = 0
+        self._rate = 0
+        self._windowStartNS = time.monotonic_ns()
+        self._windowSamples = 0
+        self._standby = False
+        self._standbys = 0
+
+        self._sensor.start_continuous()
+
+    def poll(self) -> bool:
+        '''Pick up a new reading if the sensor has one. Returns True if it did.'''
+        if self._standby or not self._sensor.data_ready:
+            return False
+        self.range = self._sensor.range # ready, so this doesn't wait
+        self.samples += 1
+
+        now = time.monotonic_ns()
+        self._windowSamples += 1
+        if now - self._windowStartNS >= self.RATE_WINDOW_NS:
+            self._rate = self._windowSamples * 1000000000 / (now - self._windowStartNS)
+            self._windowStartNS = now
+            self._windowSamples = 0
+
+        budget = self._policy.update(self.range, now)
+        if budget != self._budget:
+            self.setBudget(budget)
+        return True
+
+    def setBudget(self, budgetMicros) -> None:
+        '''Change the timing budget. The sensor has to stop ranging to do that, so this costs a bit.'''
+        self._sensor.stop_continuous()
+        self._sensor.measurement_timing_budget = budgetMicros
+        self._sensor.start_continuous()
+        self._budget = budgetMicros
+        self._budgetChanges += 1
+
+    def standby(self) -> None:
+        '''Stop ranging until resume(). 'range' goes back to NO_TARGET.'''
+        if self._standby:
+            return
+        self._sensor.stop_continuous()
+        self._standby = True
+        self._standbys += 1
+        self.range = NO_TARGET
+
+    def resume(self) -> None:
+        if not self._standby:
+            return
+        self._sensor.start_continuous()
+        self._standby = False
+
+    def isStandby(self):
+        return self._standby
+
+    # ---- instrumentation, for tuning the policy
+
+    def getBudget(self):
+        '''The timing budget in use now, in microseconds.'''
+        return self._budget
+
+    def getUpdateRate(self):
+        '''New readings per second, measured over the last second or so.'''
+        return self._rate
+
+    def getStats(self):
+        return {"name": self._name, "budget": self._budget, "rateHz": self._rate,
+                "samples": self.samples, "budgetChanges": self._budgetChanges, "standbys": self._standbys,
+                "speed": self._policy.getSpeed()}
+
+    def getSensor(self):
+        return self._sensor
+
+    def stop(self) -> None:
+        '''Take the sensor out of continuous mode (so it can do single-shot reads again).'''
+        self._sensor.stop_continuous()
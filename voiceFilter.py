@@ -0,0 +1,74 @@
+"""A resonant filter for synthio voices, with every cutoff worked out ahead of time.
+
+synthio's filters are Biquads - a set of coefficients, made by synth.low_pass_filter() and friends,
+that can't be changed once made. test/eightiesArp.py made a new one for every note; sweeping a filter
+from a sensor that way would make a new one on every reading.
+
+A CutoffTable makes the Biquads for one filter type and resonance at every step of cutoff, from
+LOWEST_CUTOFF up, STEPS_PER_OCTAVE to the octave, once. Sweeping the filter is then just picking
+one out of the list - no new objects - and the Notes only need telling when the step changes.
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+import math
+
+FILTER_TYPES = ["Off", "Low pass", "High pass", "Band pass"]
+RESONANCES = ["0.7", "1.5", "3", "6"] # Q; 0.7 is no resonant peak at all
+
+LOWEST_CUTOFF = 50  # Hz
+STEPS_PER_OCTAVE = 6
+OCTAVES = 8         # so up to 12.8 kHz, or just under Nyquist, whichever is lower
+
+LN_2 = math.log(2)
+
+
+class CutoffTable:
+    '''
+        The Biquads for filter type 'kind' (one of FILTER_TYPES, not "Off") with Q 'resonance',
+        at every cutoff step. Everything's made here.
+    '''
+    def __init__(self, synth, kind, resonance, sampleRate):
+        if kind == "Low pass":
+            make = synth.low_pass_filter
+        elif kind == "High pass":
+            make = synth.high_pass_filter
+        elif kind == "Band pass":
+            make = synth.band_pass_filter
+        else:
+            raise ValueError(f"No filter type {kind}")
+        self.kind = kind
+        self.resonance = resonance
+
+        self._cutoffs = []
+        self._filters = []
+        top = sampleRate * 0.45
+        for i in range(OCTAVES * STEPS_PER_OCTAVE + 1):
+            hz = LOWEST_CUTOFF * 2 ** (i / STEPS_PER_OCTAVE)
+            if hz > top:
+                break
+            self._cutoffs.append(hz)
+            self._filters.append(make(hz, resonance))
+
+    def __len__(self):
+        return len(self._filters)
+
+    def index(self, hz):
+        '''The step nearest to cutoff 'hz', kept in the table.'''
+        if hz <= LOWEST_CUTOFF:
+            return 0
+        return self.clamp(int(math.log(hz / LOWEST_CUTOFF) / LN_2 * STEPS_PER_OCTAVE + 0.5))
+
+    def clamp(self, i):
+        if i < 0:
+            return 0
+        last = len(self._filters) - 1
+        return last if i > last else i
+
+    def filterAt(self, i):
+        return self._filters[self.clamp(i)]
+
+    def filterFor(self, hz):
+        return self._filters[self.index(hz)]
+
+    def cutoffAt(self, i):
+        return self._cutoffs[self.clamp(i)]
@@ -0,0 +1,210 @@
+"""Waveform tables for synthio Notes and LFOs, made when first asked for, and shared.
+
+featherSynth5, featherSynth6 and some of the test scripts each used to build their own 512-sample
+sine and saw at startup, whether they got used or not - and the LFOs used the full 512-sample sine
+(an LFO interpolates between samples, so it's happy with far fewer).
+
+Now anybody who wants one calls sine(), saw() and so on. The first call builds the table; after that,
+everybody asking for the same thing gets the same array. Don't write into them!
+
+    sine(), saw(), rampUp(), square(), triangle(), noise() - the plain, "ideal" shapes
+    lfoSine() - a small sine, for LFOs
+    any of sine/saw/rampUp/square/triangle with harmonics=N - band-limited: summed from the first
+        N harmonics, so it doesn't alias so badly when played high
+    WaveBank - a band-limited table per octave ("mip-mapped"), to pick from by pitch
+
+report() / printReport() say what's been built, and how much memory each table takes.
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+import random
+
+import ulab.numpy as numpy
+
+SAMPLE_SIZE   = 512
+LFO_SIZE      =  64
+SAMPLE_VOLUME = 32000
+
+# What's been built: {(shape, size, volume, harmonics): array}
+_tables = {}
+
+
+def get(shape, size=SAMPLE_SIZE, volume=SAMPLE_VOLUME, harmonics=None):
+    '''The table for 'shape' ("sine", "saw", "rampUp", "square", "triangle" or "noise"), built if need be.'''
+    key = (shape, size, volume, harmonics)
+    table = _tables.get(key)
+    if table is None:
+        if harmonics is None:
+            table = _BUILDERS[shape](size, volume)
+        else:
+            table = _additive(shape, size, volume, harmonics)
+        _tables[key] = table
+    return table
+
+
+def sine(size=SAMPLE_SIZE, volume=SAMPLE_VOLUME):
+    return get("sine", size, volume)
+
+def lfoSine(size=LFO_SIZE):
+    return get("sine", size, SAMPLE_VOLUME)
+
+def saw(size=SAMPLE_SIZE, volume=SAMPLE_VOLUME, harmonics=None):
+    '''From +volume down to -volume - what we've always called "saw".'''
+    return get("saw", size, volume, harmonics)
+
+def rampUp(size=SAMPLE_SIZE, volume=SAMPLE_VOLUME, harmonics=None):
+    '''From -volume up to +volume.'''
+    return get("rampUp", size, volume, harmonics)
+
+def square(size=SAMPLE_SIZE, volume=SAMPLE_VOLUME, harmonics=None):
+    return get("square", size, volume, harmonics)
+
+def triangle(size=SAMPLE_SIZE, volume=SAMPLE_VOLUME, harmonics=None):
+    return get("triangle", size, volume, harmonics)
+
+def noise(size=SAMPLE_SIZE, volume=SAMPLE_VOLUME):
+    return get("noise", size, volume)
+
+
+# ---- the builders
+
+def _sine(size, volume):
+    return numpy.array(numpy.sin(numpy.linspace(0, 2*numpy.pi, size, endpoint=False)) * volume, dtype=numpy.int16)
+
+def _saw(size, volume):
+    return numpy.linspace(volume, -volume, num=size, dtype=numpy.int16)
+
+def _rampUp(size, volume):
+    return numpy.linspace(-volume, volume, num=size, dtype=numpy.int16)
+
+def _square(size, volume):
+    table = numpy.zeros(size, dtype=numpy.int16)
+    for i in range(size):
+        table[i] = volume if i < size // 2 else -volume
+    return table
+
+def _triangle(size, volume):
+    table = numpy.zeros(size, dtype=numpy.int16)
+    for i in range(size):
+        ph = i / size
+        v = 4 * ph if ph < 0.25 else (2 - 4 * ph if ph < 0.75 else 4 * ph - 4)
+        table[i] = int(v * volume)
+    return table
+
+def _noise(size, volume):
+    return numpy.array([random.randint(-volume, volume) for i in range(size)], dtype=numpy.int16)
+
+_BUILDERS = {"sine": _sine, "saw": _saw, "rampUp": _rampUp, "square": _square,
+             "triangle": _triangle, "noise": _noise}
+
+
+def _additive(shape, size, volume, harmonics):
+    return _additiveSet(shape, size, volume, (harmonics,))[harmonics]
+
+def _additiveSet(shape, size, volume, harmonicsList):
+    '''
+        'shape' from its Fourier series, up to harmonic number N (and no further - that's the point),
+        scaled to +/- volume, for each N in harmonicsList: {N: table}.
+        One pass through the harmonics, taking a copy of the sum at each N we want.
+    '''
+    if shape not in ("sine", "saw", "rampUp", "square", "triangle"):
+        raise ValueError(f"No band-limited {shape}")
+    wanted = sorted(set(harmonicsList))
+    result = {}
+    phase = numpy.linspace(0, 2*numpy.pi, size, endpoint=False)
+    acc = numpy.zeros(size)
+    for k in range(1, wanted[-1] + 1):
+        if shape == "sine":
+            if k == 1:
+                acc += numpy.sin(phase)
+        elif shape in ("saw", "rampUp"):
+            acc += numpy.sin(phase * k) / k
+        elif shape == "square":
+            if k % 2:
+                acc += numpy.sin(phase * k) / k
+        elif shape == "triangle":
+            if k % 2:
+                acc += numpy.sin(phase * k) * (1 if (k // 2) % 2 == 0 else -1) / (k * k)
+        if k in wanted:
+            peak = max(numpy.max(acc), -numpy.min(acc))
+            sign = -1 if shape == "rampUp" else 1
+            result[k] = numpy.array(acc * (sign * volume / peak), dtype=numpy.int16)
+    return result
+
+
+class WaveBank:
+    '''
+        Band-limited versions of one shape, one per octave: each has just the harmonics that stay
+        under the Nyquist frequency at the top of its octave, so none of them fold back down
+        as aliases. (The top octaves end up as plain sines.)
+
+        Everything is built when the bank is made - so make it before it's played, not while. (That's
+        a few KB and a while of summing sines, so FeatherSynth makes each only when its shape is first picked.)
+        table(f) picks the one for frequency f; it's quick when f is in the same octave as last time,
+        which it mostly is.
+    '''
+    LOWEST = 16.352 # Hz, C0; octave i goes up to LOWEST * 2**(i+1)
+
+    def __init__(self, shape, sampleRate, size=SAMPLE_SIZE, volume=SAMPLE_VOLUME, octaves=10):
+        nyquist = sampleRate / 2
+        self._tops = []
+        harmonics = []
+        for i in range(octaves):
+            top = self.LOWEST * 2 ** (i + 1)
+            self._tops.append(top)
+            harmonics.append(max(1, min(size // 2 - 1, int(nyquist / top))))
+
+        # build what's not already in the registry, and share it from there
+        missing = [h for h in harmonics if (shape, size, volume, h) not in _tables]
+        if missing:
+            for h, table in _additiveSet(shape, size, volume, missing).items():
+                _tables[(shape, size, volume, h)] = table
+        self._tables = [_tables[(shape, size, volume, h)] for h in harmonics]
+        self._harmonics = harmonics
+
+        self._select(0)
+
+    def _select(self, i):
+        self._low = self._tops[i-1] if i > 0 else 0
+        self._high = self._tops[i] if i < len(self._tops) - 1 else 1000000
+        self._current = self._tables[i]
+
+    def table(self, f):
+        '''The table to play frequency f with.'''
+        if self._low <= f < self._high:
+            return self._current
+        i = 0
+        last = len(self._tops) - 1
+        while i < last and f >= self._tops[i]:
+            i += 1
+        self._select(i)
+        return self._current
+
+    def getHarmonics(self):
+        '''How many harmonics each octave's table has, lowest octave first.'''
+        return self._harmonics
+
+    def getMemoryUse(self):
+        '''Bytes in this bank's tables. (The top octaves share one table - it's only counted once.)'''
+        unique = {id(t): t for t in self._tables}
+        return sum(len(t) * 2 for t in unique.values())
+
+
+# ---- what it's all costing us
+
+def report():
+    '''[(description, bytes)] for every table built so far, and the total bytes.'''
+    rows = []
+    total = 0
+    for (shape, size, volume, harmonics), table in _tables.items():
+        nbytes = len(table) * 2
+        name = f"{shape}[{size}]" if harmonics is None else f"{shape}[{size}] {harmonics} harmonics"
+        rows.append((name, nbytes))
+        total += nbytes
+    return rows, total
+
+def printReport():
+    rows, total = report()
+    for name, nbytes in rows:
+        print(f"  {name:>32}: {nbytes:6d} bytes")
+    print(f"  {'total':>32}: {total:6d} bytes in {len(rows)} tables")
@@ -0,0 +1,80 @@
+"""Wavetable oscillator support for FeatherSynth.
+
+A wavetable file (like the ones from waveeditonline.com) is a 16-bit mono WAV holding a run of
+single-cycle waves, waveLen samples each. Scanning through it - and morphing between neighbouring
+waves as you go - makes the sound change shape as it plays.
+
+test/fallingForeverObj.py does that by seeking in the WAV file and re-reading two waves, and then
+mixing them, every scan step. A Wavetable reads the file once, works out 'frames' evenly-spaced
+morphs from one end of the table to the other, up front, and keeps those; moving the scan position
+just copies the nearest one into 'waveform' (the buffer the Notes play), in place.
+No file I/O, and no new objects, while playing.
+
+Memory is frames * waveLen * 2 bytes: 64 frames of 256 samples is 32K.
+See test/bench_wavetable.py for what a scan step costs, both ways.
+
+Reading the file needs the adafruit_wave library. It's only imported when a Wavetable is made, so
+without it the synth still works - just with no wavetable (the constructor raises ImportError).
+
+For the Featheremin project - https://github.com/RobCranfill/featheremin
+"""
+import ulab.numpy as numpy
+
+
+class Wavetable:
+    '''
+        A WAV wavetable, in RAM, with 'frames' morph steps from the first wave to the last.
+
+        Give the Notes 'waveform'; then setPosition() changes what they play.
+    '''
+    def __init__(self, filepath, waveLen=256, frames=64):
+        import adafruit_wave
+        w = adafruit_wave.open(filepath)
+        if w.getsampwidth() != 2 or w.getnchannels() != 1:
+            raise ValueError("unsupported WAV format")
+        self.waveLen = waveLen
+        self.numWaves = w.getnframes() // waveLen
+        if self.numWaves < 1:
+            raise ValueError("WAV is shorter than one wave")
+        raw = numpy.frombuffer(w.readframes(self.numWaves * waveLen), dtype=numpy.int16)
+        w.close()
+
+        # The morphs: frame i is at wave position i * (numWaves-1) / (frames-1).
+        self._frames = []
+        for i in range(frames):
+            pos = i * (self.numWaves - 1) / max(1, frames - 1)
+            a = int(pos)
+            b = min(a + 1, self.numWaves - 1)
+            t = pos - a
+            waveA = raw[a*waveLen:(a+1)*waveLen]
+            waveB = raw[b*waveLen:(b+1)*waveLen]
+            self._frames.append(numpy.array(waveA * (1-t) + waveB * t, dtype=numpy.int16))
+        raw = None
+
+        self.waveform = numpy.zeros(waveLen, dtype=numpy.int16)
+        self._frame = -1
+        self.setPosition(0)
+
+    def getFrameCount(self):
+        return len(self._frames)
+
+    def getPosition(self):
+        '''Where we are, 0 to 1 (to the nearest frame).'''
+        return self._frame / max(1, len(self._frames) - 1)
+
+    def setPosition(self, pos) -> None:
+        '''Scan to 'pos', from 0 (the first wave) to 1 (the last). Only copies if the frame changes.'''
+        n = len(self._frames)
+        i = int(pos * (n - 1) + 0.5)
+        if i < 0:
+            i = 0
+        elif i >= n:
+            i = n - 1
+        if i == self._frame:
+            return
+        self._frame = i
+        self.waveform[:] = self._frames[i]
+
+    def getMemoryUse(self):
+        '''Bytes of sample data we're holding on to.'''
+        return (len(self._frames) + 1) * self.waveLen * 2